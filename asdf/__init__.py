@@ -3,6 +3,11 @@ asdf: Python library for reading and writing Advanced Scientific
 Data Format (ASDF) files
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
+from ._version import version as __version__
+
 __all__ = [
     "AsdfFile",
     "ExternalArrayReference",
@@ -20,13 +25,60 @@ __all__ = [
     "open",
 ]
 
+if TYPE_CHECKING:
+    from ._asdf import AsdfFile
+    from ._asdf import open_asdf as open
+    from ._convenience import info
+    from ._dump import dump, dumps, load, loads
+    from .config import config_context, get_config
+    from .exceptions import ValidationError
+    from .tags.core import IntegerType, Stream
+    from .tags.core.external_reference import ExternalArrayReference
 
-from ._asdf import AsdfFile
-from ._asdf import open_asdf as open
-from ._convenience import info
-from ._dump import dump, dumps, load, loads
-from ._version import version as __version__
-from .config import config_context, get_config
-from .exceptions import ValidationError
-from .tags.core import IntegerType, Stream
-from .tags.core.external_reference import ExternalArrayReference
+
+# The public API is imported on first use to keep ``import asdf``
+# fast for programs (and plugins) that don't read or write files.
+# Map of attribute name to (module, attribute in module).
+_LAZY_ATTRIBUTES = {
+    "AsdfFile": ("._asdf", "AsdfFile"),
+    "open": ("._asdf", "open_asdf"),
+    "info": ("._convenience", "info"),
+    "dump": ("._dump", "dump"),
+    "dumps": ("._dump", "dumps"),
+    "load": ("._dump", "load"),
+    "loads": ("._dump", "loads"),
+    "config_context": (".config", "config_context"),
+    "get_config": (".config", "get_config"),
+    "ValidationError": (".exceptions", "ValidationError"),
+    "IntegerType": (".tags.core", "IntegerType"),
+    "Stream": (".tags.core", "Stream"),
+    "ExternalArrayReference": (".tags.core.external_reference", "ExternalArrayReference"),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    elif not name.startswith("__"):
+        # Submodules (like asdf.schema) used to be available as attributes
+        # after ``import asdf`` since the public API imported them.
+        try:
+            value = importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as err:
+            if err.name != f"{__name__}.{name}":
+                raise
+            value = None
+    else:
+        value = None
+
+    if value is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
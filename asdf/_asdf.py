@@ -1,19 +1,23 @@
 from __future__ import annotations
 
+import collections
 import copy
 import datetime
 import io
+import math
 import os
+import threading
 import time
 import warnings
 import weakref
 from typing import TYPE_CHECKING
 
+import numpy as np
 from packaging.version import Version
 
 from . import _compression as mcompression
 from . import _display as display
-from . import _io, constants, generic_io, lazy_nodes, reference, schema, treeutil, util, versioning, yamlutil
+from . import _io, constants, generic_io, lazy_nodes, reference, schema, tagged, treeutil, util, versioning, yamlutil
 from . import _node_info as node_info
 from ._block.manager import Manager as BlockManager
 from ._helpers import validate_version
@@ -24,8 +28,8 @@ from .exceptions import (
     AsdfWarning,
 )
 from .extension import Extension, ExtensionProxy, _serialization_context, get_cached_extension_manager
-from .search import AsdfSearchResult
-from .tags.core import AsdfObject, ExtensionMetadata, HistoryEntry, Software
+from .tags.core import AsdfObject, ExtensionMetadata, HistoryEntry, NDArrayType, Software
+from .tags.core.ndarray import _asarray_same_kind
 from .util import NOT_SET
 
 if TYPE_CHECKING:
@@ -35,6 +39,8 @@ if TYPE_CHECKING:
 
     from asdf.extension import ExtensionManager, SerializationContext
     from asdf.generic_io import GenericFile
+    from asdf.search import AsdfSearchResult
+    from asdf.tags.core.stream import StreamWriter
     from asdf.typing import (
         ArrayStorage,
         AsdfVersionLike,
@@ -134,16 +140,27 @@ class AsdfFile:
         # Context of a call to treeutil.walk_and_modify, needed in the AsdfFile
         # in case walk_and_modify is re-entered by extension code (via
         # custom_tree_to_tagged_tree or tagged_tree_to_custom_tree).
-        self._tree_modification_context = treeutil._TreeModificationContext()
+        # One context is kept per thread (see _tree_modification_context).
+        self._tree_modification_contexts = threading.local()
 
         # A cache of tagged objects and their converted custom objects used when
         # a file is read with "lazy_tree=True". Used by lazy_nodes.
-        self._tagged_object_cache = lazy_nodes._TaggedObjectCache()
+        self._tagged_object_cache = lazy_nodes._TaggedObjectCache(get_config().lazy_tree_memory_budget)
+
+        # An index of the tree used by search (see _discard_search_index)
+        self._search_index = None
 
         self._fd: GenericFile | None = None
         self._mode: FileMode | None = None
         self._closed = False
-        self._external_asdf_by_uri = {}
+        # External files opened by open_external, in least recently used
+        # order (limited by the external_file_cache_size config option)
+        self._external_asdf_by_uri = collections.OrderedDict()
+        self._external_asdf_cache_size = get_config().external_file_cache_size
+        self._external_asdf_lock = threading.Lock()
+        # Locks that make sure only one thread opens each external file,
+        # these are only kept while a thread is opening the file
+        self._external_asdf_opening_locks = weakref.WeakValueDictionary()
         self._blocks = BlockManager(uri=uri, lazy_load=lazy_load, memmap=memmap)
         if tree is None:
             # Bypassing the tree property here, to avoid validating
@@ -483,8 +500,15 @@ class AsdfFile:
         self._blocks.close()
 
     def copy(self) -> AsdfFile:
+        tree = self._tree
+        if isinstance(getattr(tree, "data", None), lazy_nodes._AsdfNode):
+            # a (deep) copy of a lazy tree refers to this file, convert the
+            # tree so the copy doesn't depend on this instance
+            tree = AsdfObject(treeutil.walk_and_modify(tree.data, lambda n: n))
+        else:
+            tree = copy.deepcopy(tree)
         return self.__class__(
-            copy.deepcopy(self._tree),
+            tree,
             self._blocks._uri,
             self._user_extensions,
         )
@@ -525,7 +549,10 @@ class AsdfFile:
         """
         Open an external ASDF file, from the given (possibly relative)
         URI.  There is a cache (internal to this ASDF file) that ensures
-        each external ASDF file is loaded only once.
+        each external ASDF file is loaded only once.  The number of files
+        kept open in the cache can be limited with the
+        ``external_file_cache_size`` config option, the least recently
+        used file is closed when another file is opened.
 
         Parameters
         ----------
@@ -547,12 +574,42 @@ class AsdfFile:
         if resolved_uri == "" or resolved_uri == self.uri:
             return self
 
-        asdffile = self._external_asdf_by_uri.get(resolved_uri)
-        if asdffile is None:
+        # Files can be opened from several threads (see resolve_references),
+        # only one thread opens a given file.
+        with self._external_asdf_lock:
+            opening_lock = self._external_asdf_opening_locks.get(resolved_uri)
+            if opening_lock is None:
+                opening_lock = self._external_asdf_opening_locks[resolved_uri] = threading.Lock()
+
+        with opening_lock:
+            with self._external_asdf_lock:
+                asdffile = self._external_asdf_by_uri.get(resolved_uri)
+                if asdffile is not None:
+                    self._external_asdf_by_uri.move_to_end(resolved_uri)
+                    return asdffile
+
             asdffile = open_asdf(resolved_uri, mode="r", **kwargs)
-            self._external_asdf_by_uri[resolved_uri] = asdffile
+
+            evicted = []
+            with self._external_asdf_lock:
+                self._external_asdf_by_uri[resolved_uri] = asdffile
+                if self._external_asdf_cache_size is not None:
+                    while len(self._external_asdf_by_uri) > self._external_asdf_cache_size:
+                        evicted.append(self._external_asdf_by_uri.popitem(last=False)[1])
+
+        for external in evicted:
+            external.close()
         return asdffile
 
+    @property
+    def _tree_modification_context(self) -> treeutil._TreeModificationContext:
+        # Lazy trees can be converted from several threads (see materialize)
+        # so each thread gets its own context.
+        contexts = self._tree_modification_contexts
+        if not hasattr(contexts, "context"):
+            contexts.context = treeutil._TreeModificationContext()
+        return contexts.context
+
     @property
     def tree(self) -> AsdfObject:
         """
@@ -577,9 +634,11 @@ class AsdfFile:
 
     def __setitem__(self, key: TreeKey, value: Any) -> None:
         self.tree[key] = value
+        self._search_index = None
 
     def __delitem__(self, key: TreeKey) -> None:
         del self.tree[key]
+        self._search_index = None
 
     def __contains__(self, item: TreeKey) -> bool:
         return item in self.tree
@@ -777,14 +836,26 @@ class AsdfFile:
                 after the tree has been converted to tagged objects.
                 """
                 self._update_extension_history(tree, serialization_context)
-                if "history" in tree:
-                    tagged_tree["history"] = yamlutil.custom_tree_to_tagged_tree(
-                        tree["history"],
+                if "history" not in tree:
+                    tagged_tree.pop("history", None)
+                    return
+
+                history = tree["history"]
+                tagged_history = tagged_tree.get("history")
+                if isinstance(tagged_history, dict) and "extensions" in history:
+                    # The history entries were already converted with the
+                    # rest of the tree, only the extension metadata changed.
+                    tagged_history["extensions"] = yamlutil.custom_tree_to_tagged_tree(
+                        history["extensions"],
                         self,
                         _serialization_context=serialization_context,
                     )
                 else:
-                    tagged_tree.pop("history", None)
+                    tagged_tree["history"] = yamlutil.custom_tree_to_tagged_tree(
+                        history,
+                        self,
+                        _serialization_context=serialization_context,
+                    )
 
             yamlutil.dump_tree(
                 tree,
@@ -802,15 +873,40 @@ class AsdfFile:
         self, fd: GenericFile, pad_blocks: float | bool, include_block_index: bool, write_checksums: bool
     ) -> None:
         with self._blocks.write_context(fd):
-            # prep a tree for a writing
+            # prep a tree for a writing, this is a shallow copy as
+            # conversion to a tagged tree will not modify the tree
             tree = copy.copy(self._tree)
             tree["asdf_library"] = _io.get_asdf_library_info()
             if "history" in self._tree:
-                tree["history"] = copy.deepcopy(self._tree["history"])
+                tree["history"] = _copy_history_for_write(self._tree["history"])
 
             self._write_tree(tree, fd, pad_blocks)
             self._blocks.write(pad_blocks, include_block_index, write_checksums)
 
+    def _get_update_fd(self) -> GenericFile:
+        """
+        Get the associated file, checking that it can be updated in place.
+        """
+        fd = self._fd
+
+        if fd is None:
+            msg = "Can not update, since there is no associated file"
+            raise ValueError(msg)
+
+        if not fd.writable():
+            msg = (
+                "Can not update, since associated file is read-only. Make "
+                "sure that the AsdfFile was opened with mode='rw' and the "
+                "underlying file handle is writable."
+            )
+            raise OSError(msg)
+
+        if not fd.seekable():
+            msg = "Can not update, since associated file is not seekable"
+            raise OSError(msg)
+
+        return fd
+
     def update(
         self,
         all_array_storage: ArrayStorage | NotSet = NOT_SET,
@@ -885,23 +981,7 @@ class AsdfFile:
             if compression_kwargs is not NOT_SET:
                 config.all_array_compression_kwargs = compression_kwargs
 
-            fd = self._fd
-
-            if fd is None:
-                msg = "Can not update, since there is no associated file"
-                raise ValueError(msg)
-
-            if not fd.writable():
-                msg = (
-                    "Can not update, since associated file is read-only. Make "
-                    "sure that the AsdfFile was opened with mode='rw' and the "
-                    "underlying file handle is writable."
-                )
-                raise OSError(msg)
-
-            if not fd.seekable():
-                msg = "Can not update, since associated file is not seekable"
-                raise OSError(msg)
+            fd = self._get_update_fd()
 
             if version is not None:
                 self.version = version
@@ -952,6 +1032,176 @@ class AsdfFile:
             if fd.can_memmap():
                 fd.close_memmap()
 
+    def append_rows(self, path_in_tree: str | Sequence[TreeKey], rows: Any, pad_blocks: bool | float = True) -> None:
+        """
+        Append rows to an array in the file on disk.
+
+        If the array fills an (uncompressed) internal block and the rows
+        fit in the space allocated for the block (see ``pad_blocks`` of
+        `write_to` and `update`), or the block is the last block in the
+        file, the rows are written in place.  Only the block header and
+        the shape of the array in the tree are updated so the time taken
+        depends on the number of appended bytes (and the size of the
+        tree), not the size of the array.  The checksum of the block is
+        removed.  Other changes to the tree are also written, unless they
+        include array data (like new arrays or loaded arrays that might
+        have been modified) in which case the file is rewritten.
+
+        Otherwise (or if the tree doesn't fit before the first block)
+        the rows are concatenated to the array and the file is
+        rewritten with `update`.
+
+        Parameters
+        ----------
+        path_in_tree : str or sequence
+            Path of the array in the tree.  Either a dot-separated string
+            (like ``"a.b.0"``) or a sequence of keys and list indices
+            (like ``("a", "b", 0)``).
+
+        rows : array-like
+            A single row or a batch of rows.  Rows are converted to
+            the data type of the array if the conversion is of the
+            same kind.  Integers (like Python ints) are appended to
+            any integer array if the values fit.
+
+        pad_blocks : float or bool, optional
+            Padding used if the file is rewritten, see `update`.
+            Defaults to `True` to leave room to append more rows.
+        """
+        fd = self._get_update_fd()
+
+        parent, key, node = _get_node_at_path(self.tree, path_in_tree)
+        if parent is None:
+            msg = "Can not append rows to the root of the tree"
+            raise ValueError(msg)
+
+        if isinstance(node, NDArrayType):
+            shape, dtype = node._shape, node._dtype
+        elif isinstance(node, np.ndarray):
+            shape, dtype = node.shape, node.dtype
+        else:
+            msg = f"Expected an array at {path_in_tree}, got {type(node).__name__}"
+            raise TypeError(msg)
+        if shape is None:
+            shape = np.shape(node)
+        shape = tuple(shape)
+        if not len(shape) or "*" in shape:
+            msg = f"Can not append rows to an array with shape {shape}"
+            raise ValueError(msg)
+        rows = _asarray_same_kind(rows, dtype)
+        if rows.shape == shape[1:]:
+            rows = rows[np.newaxis]
+        if rows.shape[1:] != shape[1:]:
+            msg = f"Expected rows with shape {shape[1:]}, got {rows.shape}"
+            raise ValueError(msg)
+
+        new_shape = [int(shape[0]) + len(rows), *shape[1:]]
+        if (
+            isinstance(node, NDArrayType)
+            and isinstance(node._source, int)
+            and node._mask is None
+            and node._offset == 0
+            and node._strides is None
+            and self._append_rows_in_place(fd, node, shape, new_shape, rows)
+        ):
+            return
+
+        parent[key] = np.concatenate([np.asarray(node), rows])
+        self.update(pad_blocks=pad_blocks)
+
+    def _append_rows_in_place(
+        self, fd: GenericFile, node: NDArrayType, shape: tuple, new_shape: list, rows: Any
+    ) -> bool:
+        """
+        Append rows to the block of an array (see `append_rows`) and
+        update the shape of the array in the tree without rewriting
+        the rest of the file.  Returns `False` if this isn't possible.
+        """
+        index = node._source
+        blk = self._blocks.blocks[index]
+        header = blk.header
+        if header["used_size"] != math.prod(shape) * node._dtype.itemsize or header["data_size"] != header["used_size"]:
+            # the array doesn't fill the block
+            return False
+
+        # read the tree as written (without converting it) to reuse the
+        # ndarray nodes for the arrays in the tree, so the current tree
+        # (with any other changes) can be written without loading arrays
+        tree_size = self._blocks.blocks[0].offset - len(constants.BLOCK_MAGIC)
+        fd.seek(0)
+        tree_fd = generic_io.get_file(io.BytesIO(fd.read(tree_size)), mode="r")
+        _, _, written_tree, _ = _io.open_asdf(tree_fd)
+        array_nodes = {
+            _ndarray_key(
+                tagged_node["source"], tagged_node.get("offset"), tagged_node.get("strides"), tagged_node["shape"]
+            ): tagged_node
+            for tagged_node in treeutil.iter_tree(written_tree)
+            if isinstance(tagged_node, tagged.TaggedDict)
+            and tagged_node._tag.startswith(constants.STSCI_SCHEMA_TAG_BASE + "/core/ndarray-")
+            and "source" in tagged_node
+        }
+
+        # arrays that can't be written without their data (new or loaded
+        # arrays that might have been modified)
+        unwritten = []
+        sources = set()
+
+        def to_array_node(obj):
+            if isinstance(obj, NDArrayType):
+                array_node = array_nodes.get(_ndarray_key(obj._source, obj._offset, obj._strides, obj._shape))
+                if array_node is None or (
+                    obj._array is not None and not isinstance(util.get_array_base(obj._array), np.memmap)
+                ):
+                    unwritten.append(obj)
+                    return obj
+                for array in (obj, obj._mask):
+                    if isinstance(array, NDArrayType) and isinstance(array._source, int):
+                        sources.add(array._source if array._source >= 0 else len(self._blocks.blocks) - 1)
+                array_node = tagged.TaggedDict(dict(array_node), array_node._tag)
+                if obj is node:
+                    array_node["shape"] = list(new_shape)
+                return array_node
+            if isinstance(obj, np.ndarray):
+                unwritten.append(obj)
+            return obj
+
+        tree = treeutil.walk_and_modify(self.tree, to_array_node)
+        if unwritten or sources != set(range(len(self._blocks.blocks))):
+            return False
+
+        with self._blocks.write_context(fd):
+            tagged_tree = yamlutil.custom_tree_to_tagged_tree(tree, self)
+            if (
+                len(self._blocks._write_blocks)
+                or self._blocks._external_write_blocks
+                or self._blocks._streamed_write_block
+            ):
+                # a custom object holds array data
+                return False
+
+        tree_file = AsdfFile(version=self.version)
+        tree_file.tree = tagged_tree
+        if "history" in tagged_tree:
+            # the extension metadata is updated when writing so the history
+            # needs to be converted
+            tree_file.tree["history"] = yamlutil.tagged_tree_to_custom_tree(tagged_tree["history"], tree_file)
+        new_tree_fd = io.BytesIO()
+        tree_file.write_to(new_tree_fd, include_block_index=False)
+        new_tree = new_tree_fd.getvalue()
+        if len(new_tree) > tree_size:
+            return False
+
+        if not self._blocks._append_block_data(index, np.ascontiguousarray(rows).reshape(-1).view(np.uint8).data):
+            return False
+
+        fd.seek(0)
+        fd.write(new_tree)
+        fd.clear(tree_size - len(new_tree))
+        fd.flush()
+        node._shape = new_shape
+        node._array = None
+        return True
+
     def write_to(
         self,
         fd: FileLike,
@@ -1048,6 +1298,73 @@ class AsdfFile:
                 if previous_version is not None:
                     self.version = previous_version
 
+    def open_stream_writer(
+        self,
+        fd: FileLike,
+        path_in_tree: str | Sequence[TreeKey],
+        flush_size: int | None = None,
+        fsync: str = "never",
+        **kwargs: Any,
+    ) -> StreamWriter:
+        """
+        Write the ASDF file to the given file-like object and return a
+        `asdf.tags.core.StreamWriter` to append rows to the
+        `asdf.tags.core.Stream` in the tree.
+
+        Parameters
+        ----------
+        fd : string or file-like object
+            May be a string path to a file, or a Python file-like
+            object.  If a string path, the file is closed when the
+            writer is closed.  If not a string path, it is the
+            caller's responsibility to close the object.
+
+        path_in_tree : str or sequence
+            Path of the `asdf.tags.core.Stream` in the tree.  Either a
+            dot-separated string (like ``"a.b.0"``) or a sequence of keys
+            and list indices (like ``("a", "b", 0)``).
+
+        flush_size : int, optional
+            Number of bytes of rows to buffer before writing them to the
+            file.  Defaults to 8 MiB.
+
+        fsync : str, optional
+            When to call ``os.fsync`` for the file, one of ``never``
+            (the default), ``flush`` (after each write of buffered rows)
+            or ``close`` (when the writer is closed).
+
+        **kwargs
+            Passed on to `write_to`.
+
+        Returns
+        -------
+        writer : asdf.tags.core.StreamWriter
+        """
+        from .tags.core.stream import DEFAULT_FLUSH_SIZE, Stream, StreamWriter
+
+        _, _, node = _get_node_at_path(self.tree, path_in_tree)
+        if not isinstance(node, Stream):
+            msg = f"Expected a Stream at {path_in_tree}, got {type(node).__name__}"
+            raise TypeError(msg)
+
+        close = isinstance(fd, (str, os.PathLike))
+        if close:
+            # not written atomically so the rows can be read while writing
+            fd = generic_io.get_file(open(fd, "wb"), mode="w", close=True)
+        else:
+            fd = generic_io.get_file(fd, mode="w")
+        try:
+            writer = StreamWriter(
+                fd, node, DEFAULT_FLUSH_SIZE if flush_size is None else flush_size, fsync, close=close
+            )
+            self.write_to(fd, **kwargs)
+        except Exception:
+            if close:
+                fd.close()
+            raise
+        fd.flush()
+        return writer
+
     def find_references(self) -> None:
         """
         Finds all external "JSON References" in the tree and converts
@@ -1056,14 +1373,81 @@ class AsdfFile:
         # Set directly to self._tree, since it doesn't need to be re-validated.
         self._tree = reference.find_references(self._tree, self)
 
-    def resolve_references(self) -> None:
+    def resolve_references(self, workers: int | None = None) -> None:
         """
         Finds all external "JSON References" in the tree, loads the
         external content, and places it directly in the tree.  Saving
         a ASDF file after this operation means it will have no
         external references, and will be completely self-contained.
+
+        The external files are opened concurrently using a pool of
+        threads.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Maximum number of threads to use.  Defaults to the default
+            of `concurrent.futures.ThreadPoolExecutor`.
+        """
+        self._tree = reference.resolve_references(self._tree, self, workers=workers)
+
+    def materialize(self, paths: Sequence[str | Sequence[TreeKey]] | None = None, workers: int | None = None) -> None:
         """
-        self._tree = reference.resolve_references(self._tree, self)
+        Convert the nodes of a lazy tree (see ``lazy_tree`` in
+        `asdf.open`) that haven't been accessed yet.
+
+        Independent tagged nodes are converted concurrently using a pool
+        of threads, so the converters involved must be thread-safe.  Nodes
+        that appear at several places in the tree are converted once.
+        For trees that are not lazy this does nothing.
+
+        Parameters
+        ----------
+        paths : list, optional
+            Paths of the subtrees to convert.  Each path is either a
+            dot-separated string (like ``"a.b.0"``) or a sequence of keys
+            and list indices (like ``("a", "b", 0)``).  By default the
+            whole tree is converted.
+
+        workers : int, optional
+            Maximum number of threads to use.  Defaults to the default
+            of `concurrent.futures.ThreadPoolExecutor`.
+        """
+        if paths is None:
+            paths = [()]
+
+        nodes = []
+        for path in paths:
+            _, _, node = _get_node_at_path(self.tree, path)
+            if isinstance(node, AsdfObject):
+                node = node.data
+            if isinstance(node, lazy_nodes._AsdfNode):
+                nodes.append(node)
+
+        if nodes:
+            lazy_nodes._materialize(nodes, workers=workers)
+
+    def prefetch_external_blocks(self, workers: int | None = None) -> None:
+        """
+        Load the data of the arrays in the tree that are stored in
+        external blocks (see :ref:`exploded`).  The external files are
+        read concurrently using a pool of threads.  Only arrays that
+        have not been loaded yet are affected (see ``lazy_load`` in
+        `asdf.open`) and lazy trees are converted.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Maximum number of threads to use.  Defaults to the default
+            of `concurrent.futures.ThreadPoolExecutor`.
+        """
+        sources = {
+            node._source
+            for node in treeutil.iter_tree(self.tree)
+            if isinstance(node, NDArrayType) and isinstance(node._source, str)
+        }
+        if sources:
+            self._blocks._prefetch_external(sorted(sources), workers=workers)
 
     def fill_defaults(self) -> None:
         """
@@ -1189,6 +1573,8 @@ class AsdfFile:
         preserve_list : bool
             If True, then lists are preserved. Otherwise, they are turned into dicts.
         """
+        from .search import AsdfSearchResult
+
         if isinstance(path, AsdfSearchResult):
             return path.schema_info(
                 key,
@@ -1272,6 +1658,7 @@ class AsdfFile:
         type_: str | type | NotSet = NOT_SET,
         value: str | Any | NotSet = NOT_SET,
         filter_: FilterFn | None = None,
+        use_index: bool = False,
     ) -> AsdfSearchResult:
         """
         Search this file's tree.
@@ -1309,20 +1696,88 @@ class AsdfFile:
             and returns True to retain the node, or False to remove it from
             the search results.
 
+        use_index : bool, optional
+            If True, build (on first use) an index of the tree by key
+            and type and use it to find the nodes selected by ``key``
+            and ``type_`` without walking the tree.  The index is
+            discarded when the tree is modified through this
+            `AsdfFile` (by assigning or deleting top-level keys, by
+            `asdf.search.AsdfSearchResult.replace` or, for lazy trees,
+            by modifying any lazy node).  Other in-place modifications
+            of nested containers are not detected.
+
         Returns
         -------
         asdf.search.AsdfSearchResult
             the result of the search
         """
+        from .search import AsdfSearchResult, _SearchIndex
+
         result = AsdfSearchResult(["root"], self.tree)
+        result._on_replace = self._discard_search_index
+        if use_index:
+            if self._search_index is None or self._search_index.node is not self.tree:
+                self._search_index = _SearchIndex(["root"], self.tree)
+            result._use_index(self._search_index)
         return result.search(key=key, type_=type_, value=value, filter_=filter_)
 
+    def _discard_search_index(self):
+        """
+        Discard the index used by `AsdfFile.search` after the tree
+        was modified.
+        """
+        self._search_index = None
+
     # This function is called from within yamlutil methods to create
     # a context when one isn't explicitly passed in.
     def _create_serialization_context(self, operation=_serialization_context.BlockAccess.NONE):
         return _serialization_context.create(self, operation)
 
 
+def _get_node_at_path(tree: Any, path_in_tree: str | Sequence[TreeKey]) -> tuple[Any, Any, Any]:
+    """
+    Look up the node at ``path_in_tree``, either a dot-separated string
+    (like ``"a.b.0"``) or a sequence of keys and list indices.
+
+    Returns the parent of the node (`None` for the root of the tree),
+    the key of the node in the parent and the node.
+    """
+    if isinstance(path_in_tree, str):
+        path_in_tree = path_in_tree.split(".")
+    parent, key, node = None, None, tree
+    for key in path_in_tree:
+        if isinstance(node, (list, lazy_nodes.AsdfListNode)):
+            key = int(key)
+        parent, node = node, node[key]
+    return parent, key, node
+
+
+def _ndarray_key(source: Any, offset: int | None, strides: Any, shape: Any) -> tuple:
+    """
+    Key that identifies an array (from the values of its ndarray node)
+    in the blocks of a file.
+    """
+    return (source, offset or 0, None if strides is None else tuple(strides), tuple(shape))
+
+
+def _copy_history_for_write(history: Any) -> Any:
+    """
+    Copy the parts of a tree's history that will be modified by
+    `AsdfFile._update_extension_history` during writing.
+
+    History entries are not modified (and can be numerous) so rather
+    than deep-copying the history, only the mapping and the list of
+    extension metadata are copied.
+    """
+    if not isinstance(history, (dict, lazy_nodes.AsdfDictNode)):
+        # the old list format history is replaced (not modified)
+        return history
+    history = copy.copy(history)
+    if isinstance(history.get("extensions"), (list, lazy_nodes.AsdfListNode)):
+        history["extensions"] = list(history["extensions"])
+    return history
+
+
 def open_asdf(
     fd: FileLike,
     uri: str | None = None,
@@ -8,12 +8,15 @@ the block manager to have a reference to the `AsdfFile`
 (that references the block manager).
 """
 
+import collections
 import os
-import urllib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from asdf import generic_io, util
+from asdf.config import _use_config, get_config
 
 
 class UseInternalType:
@@ -24,42 +27,166 @@ UseInternal = UseInternalType()
 
 
 class ExternalBlockCache:
-    def __init__(self):
-        self.clear()
+    """
+    Cache of the files (and the data) of external blocks.
+
+    External files are opened (lazily loaded and memory mapped if
+    requested) when one of their blocks is first used and kept open
+    so that the size of a block, or a range of its data, can be read
+    without loading all of the data.
+
+    Parameters
+    ----------
+    max_open_files : int or None
+        Maximum number of external files kept open.  The least recently
+        used file is closed when another file is opened.  Data already
+        loaded (or memory mapped) from a closed file remains valid.
+        If `None` external files are kept open until the cache is cleared.
+
+    memory_budget : int or None
+        Approximate number of bytes of loaded external block data held
+        by the cache (memory mapped data is not counted).  The least
+        recently used data is dropped from the cache when the budget
+        is exceeded (and read again when needed).  If `None` all data
+        is held until the cache is cleared.
+    """
+
+    def __init__(self, max_open_files=None, memory_budget=None):
+        self._max_open_files = max_open_files
+        self._memory_budget = memory_budget
+        self._lock = threading.Lock()
+        self._opening_locks = {}
+        self._files = collections.OrderedDict()
+        self._cache = collections.OrderedDict()
+        self._cache_nbytes = 0
+
+    @property
+    def evicting(self):
+        """
+        `True` if loaded data can be dropped from the cache.
+        """
+        return self._memory_budget is not None
+
+    def _resolve_uri(self, base_uri, uri):
+        resolved_uri = generic_io.resolve_uri(base_uri, uri)
+        # if the uri only has a trailing "#" fragment, strip it
+        # this deals with python 3.14 changes where in prior versions
+        # urljoin removed this type of fragment
+        if resolved_uri.endswith("#"):
+            resolved_uri = resolved_uri[:-1]
+        if resolved_uri == "" or resolved_uri == base_uri:
+            return UseInternal
+        return resolved_uri
+
+    def get_block(self, base_uri, uri, memmap=False, validate_checksums=False):
+        """
+        Get the (lazily loaded) block of an external file, opening
+        the file if needed.
+
+        Returns
+        -------
+        block : ReadBlock or UseInternal
+            The first block of the external file or `UseInternal` if
+            the uri refers to the file at ``base_uri``.
+        """
+        key = util.get_base_uri(uri)
+        with self._lock:
+            if key in self._files:
+                self._files.move_to_end(key)
+                return self._files[key]._blocks.blocks[0]
+            opening_lock = self._opening_locks.setdefault(key, threading.Lock())
+
+        resolved_uri = self._resolve_uri(base_uri, uri)
+        if resolved_uri is UseInternal:
+            return UseInternal
+
+        # only one thread opens a given file
+        with opening_lock:
+            with self._lock:
+                af = self._files.get(key)
+            if af is None:
+                from asdf import open as asdf_open
+
+                af = asdf_open(resolved_uri, "r", lazy_load=True, memmap=memmap, validate_checksums=validate_checksums)
+                evicted = []
+                with self._lock:
+                    self._files[key] = af
+                    if self._max_open_files is not None:
+                        while len(self._files) > self._max_open_files:
+                            evicted.append(self._files.popitem(last=False)[1])
+                for evicted_af in evicted:
+                    evicted_af.close()
+        return af._blocks.blocks[0]
 
     def load(self, base_uri, uri, memmap=False, validate_checksums=False):
+        """
+        Load the data of the block of an external file.
+
+        Returns
+        -------
+        data : ndarray or UseInternal
+            The data of the first block of the external file or
+            `UseInternal` if the uri refers to the file at ``base_uri``.
+        """
         key = util.get_base_uri(uri)
-        if key not in self._cache:
-            resolved_uri = generic_io.resolve_uri(base_uri, uri)
-            # if the uri only has a trailing "#" fragment, strip it
-            # this deals with python 3.14 changes where in prior versions
-            # urljoin removed this type of fragment
-            if resolved_uri.endswith("#"):
-                resolved_uri = resolved_uri[:-1]
-            if resolved_uri == "" or resolved_uri == base_uri:
-                return UseInternal
-
-            from asdf import open as asdf_open
-
-            with asdf_open(
-                resolved_uri, "r", lazy_load=False, memmap=False, validate_checksums=validate_checksums
-            ) as af:
-                blk = af._blocks.blocks[0]
-                if memmap and blk.header["compression"] == b"\0\0\0\0":
-                    parsed_url = util._patched_urllib_parse.urlparse(resolved_uri)
-                    if parsed_url.scheme == "file":
-                        # deal with leading slash for windows file://
-                        filename = urllib.request.url2pathname(parsed_url.path)
-                        arr = np.memmap(filename, np.uint8, "r", blk.data_offset, blk.cached_data.nbytes)
-                    else:
-                        arr = blk.cached_data
-                else:
-                    arr = blk.cached_data
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        blk = self.get_block(base_uri, uri, memmap, validate_checksums)
+        if blk is UseInternal:
+            return UseInternal
+        arr = blk.data
+
+        with self._lock:
+            if key in self._cache:
+                # loaded by another thread
+                return self._cache[key]
             self._cache[key] = arr
-        return self._cache[key]
+            if self._memory_budget is not None:
+                self._cache_nbytes += _loaded_nbytes(arr)
+                # never drop the data that was just loaded
+                while self._cache_nbytes > self._memory_budget and len(self._cache) > 1:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_nbytes -= _loaded_nbytes(evicted)
+        return arr
+
+    def prefetch(self, base_uri, uris, memmap=False, validate_checksums=False, workers=None):
+        """
+        Load the data of the blocks of several external files
+        concurrently using a pool of ``workers`` threads.
+        """
+        config = get_config()
+
+        def _load(uri):
+            # threads don't share config contexts, use the caller's config
+            with _use_config(config):
+                self.load(base_uri, uri, memmap, validate_checksums)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results to raise any errors
+            list(executor.map(_load, uris))
 
     def clear(self):
-        self._cache = {}
+        with self._lock:
+            files = list(self._files.values())
+            self._files = collections.OrderedDict()
+            self._opening_locks = {}
+            self._cache = collections.OrderedDict()
+            self._cache_nbytes = 0
+        for af in files:
+            af.close()
+
+
+def _loaded_nbytes(arr):
+    """
+    Number of bytes of memory used by data loaded from a block,
+    memory mapped data is not counted.
+    """
+    if isinstance(util.get_array_base(arr), np.memmap):
+        return 0
+    return arr.nbytes
 
 
 def relative_uri_for_index(uri, index):
@@ -1,7 +1,11 @@
 import collections
 import contextlib
 import copy
+import os
 
+import numpy as np
+
+from asdf import _compression as mcompression
 from asdf import config, constants, generic_io, util
 
 from . import external, reader, store, writer
@@ -286,7 +290,10 @@ class Manager:
         self.options = OptionsStore(read_blocks)
 
         self._blocks = read_blocks
-        self._external_block_cache = external.ExternalBlockCache()
+        cfg = config.get_config()
+        self._external_block_cache = external.ExternalBlockCache(
+            cfg.external_file_cache_size, cfg.external_block_memory_budget
+        )
         self._data_callbacks = store.Store()
 
         self._write_blocks = WriteBlocks()
@@ -357,6 +364,15 @@ class Manager:
             return self.blocks[0].data
         return value
 
+    def _get_external_block(self, uri):
+        value = self._external_block_cache.get_block(self._uri, uri, self._memmap, self._validate_checksums)
+        if value is external.UseInternal:
+            return self.blocks[0]
+        return value
+
+    def _prefetch_external(self, uris, workers=None):
+        self._external_block_cache.prefetch(self._uri, uris, self._memmap, self._validate_checksums, workers)
+
     def _clear_write(self):
         self._write_blocks = WriteBlocks()
         self._external_write_blocks = []
@@ -616,6 +632,11 @@ class Manager:
         if self._write_fd is None:
             msg = "update called outside of valid write_context"
             raise OSError(msg)
+
+        if self._can_keep_blocks(new_tree_size, write_checksums):
+            self._update_tree_only(new_tree_size, write_checksums)
+            return
+
         # find where to start writing blocks (either end of new tree or end of last 'free' block)
         last_block = None
         for blk in self.blocks[::-1]:
@@ -655,6 +676,10 @@ class Manager:
                 self._write_fd.seek(src)
                 bs = self._write_fd.read(min(n_bytes, block_size))
                 self._write_fd.seek(dst)
+                if not bs:
+                    # the padding of the last block was skipped (not written)
+                    self._write_fd.clear(n_bytes)
+                    break
                 self._write_fd.write(bs)
                 n = len(bs)
                 n_bytes -= n
@@ -664,6 +689,16 @@ class Manager:
             # update offset to point at correct locations
             offsets = [o - (new_block_start - new_tree_size) for o in offsets]
 
+            # the padding of the blocks was skipped (not written) so the moved
+            # padding might contain parts of the old file (like a block index)
+            for offset, header in zip(offsets, headers):
+                if header["flags"] & constants.BLOCK_FLAG_STREAMED:
+                    continue
+                data_offset = offset + len(constants.BLOCK_MAGIC) + 2 + bio.BLOCK_HEADER.size
+                self._write_fd.seek(data_offset + header["used_size"])
+                self._write_fd.clear(header["allocated_size"] - header["used_size"])
+            self._write_fd.seek(new_block_end - (new_block_start - new_tree_size))
+
             # write index if no streamed block
             if include_block_index and self._streamed_write_block is None:
                 bio.write_block_index(self._write_fd, offsets)
@@ -697,3 +732,168 @@ class Manager:
 
             # update read blocks to reflect new state
             self.blocks = new_read_blocks
+
+    def _write_block_matches_read_block(self, write_block, read_block, streamed, write_checksums):
+        """
+        Check if a ``WriteBlock`` would produce the same ASDF block that
+        is already in the file as ``read_block``.
+
+        Data that was never loaded can't have been modified. Loaded data must
+        be the (unmodified) data for the block which is confirmed by comparing
+        against the checksum in the block header. Memmapped data is already
+        in the file so only the checksum (if present) needs to be checked.
+        """
+        header = read_block.header
+        if bool(header["flags"] & constants.BLOCK_FLAG_STREAMED) != streamed:
+            return False
+        if not streamed and mcompression.to_compression_header(write_block.compression) != header["compression"]:
+            return False
+        has_checksum = any(b != 0 for b in header["checksum"])
+        if has_checksum != (write_checksums and not streamed):
+            return False
+
+        data = write_block._data
+        if isinstance(data, DataCallback):
+            if data._read_blocks_ref() is not self.blocks or self.blocks[data._index] is not read_block:
+                return False
+            if read_block._cached_data is None and callable(read_block._data):
+                # the block data was never read
+                return True
+            data = read_block.cached_data
+        elif data is not read_block._cached_data:
+            return False
+
+        memmapped = isinstance(data, np.memmap) and read_block.memmap
+        if not memmapped and (not has_checksum or header["compression"] != b"\0\0\0\0"):
+            # there is no way to check if in-memory data was modified
+            return False
+        if not has_checksum:
+            return True
+        return bio.calculate_block_checksum(write_block.data_bytes) == header["checksum"]
+
+    def _can_keep_blocks(self, new_tree_size, write_checksums):
+        """
+        Check if an update can leave all internal blocks in place.
+
+        This is possible if the new tree fits before the first block
+        and the blocks set up during the current `write_context` match
+        (in order, compression and content) the blocks read from the file.
+        """
+        write_blocks = list(self._write_blocks)
+        if self._streamed_write_block is not None:
+            write_blocks.append(self._streamed_write_block)
+        if not len(write_blocks) or len(write_blocks) != len(self.blocks):
+            return False
+        if self.blocks[0].offset - len(constants.BLOCK_MAGIC) < new_tree_size:
+            return False
+        for write_block, read_block in zip(write_blocks, self.blocks):
+            streamed = write_block is self._streamed_write_block
+            if not self._write_block_matches_read_block(write_block, read_block, streamed, write_checksums):
+                return False
+        return True
+
+    def _update_tree_only(self, new_tree_size, write_checksums):
+        """
+        Perform an update-in-place that leaves the internal blocks
+        untouched (see `_can_keep_blocks`). The space between the end of
+        the new tree and the first block is cleared and the file position
+        is left at the end of the file.
+        """
+        if len(self._external_write_blocks):
+            self._write_external_blocks(write_checksums=write_checksums)
+
+        self._write_fd.seek(new_tree_size)
+        self._write_fd.clear(self.blocks[0].offset - len(constants.BLOCK_MAGIC) - new_tree_size)
+
+        # replace the read blocks (in place so that data callbacks remain
+        # valid) with lazy blocks as any current memmap will be closed
+        for index, blk in enumerate(self.blocks):
+            self.blocks[index] = reader.ReadBlock(
+                blk.offset, self._write_fd, self._memmap, True, False, header=blk.header
+            )
+
+        self._write_fd.seek(0, os.SEEK_END)
+
+    def _append_block_data(self, index, data):
+        """
+        Append bytes to the data of an (uncompressed, not streamed)
+        internal block in place.
+
+        The bytes are written to the space allocated for the block (see
+        ``pad_blocks``) or, for the last block in the file, to the end of
+        the file (moving the block index).  Only the size fields of the
+        block header are updated.  The block checksum is cleared as
+        computing it would require reading the existing data.
+
+        Parameters
+        ----------
+        index : int
+            Index of the block.
+
+        data : bytes-like
+            Bytes to append.
+
+        Returns
+        -------
+        appended : bool
+            `False` (and the file is left untouched) if the block
+            can't be extended in place.
+        """
+        blk = self.blocks[index]
+        header = blk.header
+        if header["flags"] & constants.BLOCK_FLAG_STREAMED or mcompression.validate(header["compression"]):
+            return False
+        fd = blk._fd()
+        if fd is None or fd.is_closed():
+            msg = "Attempt to append to block of closed file"
+            raise OSError(msg)
+
+        nbytes = len(data)
+        used_size = header["used_size"] + nbytes
+        allocated_size = header["allocated_size"]
+        is_last = index == len(self.blocks) - 1
+        if used_size > allocated_size and not is_last:
+            return False
+
+        with reader._get_fd_lock(fd):
+            end = blk.data_offset + allocated_size
+            if used_size > allocated_size:
+                # the block index (if any) follows the last block
+                fd.seek(end)
+                has_index = fd.read(len(constants.INDEX_HEADER)) == constants.INDEX_HEADER
+                allocated_size = used_size
+
+            fd.seek(blk.data_offset + header["used_size"])
+            fd.write(data)
+
+            new_header = dict(
+                header,
+                allocated_size=allocated_size,
+                used_size=used_size,
+                data_size=used_size,
+                checksum=b"\0" * 16,
+            )
+            # skip the 2 byte header size
+            fd.seek(blk.offset + 2)
+            bio.BLOCK_HEADER.update(
+                fd,
+                **{key: new_header[key] for key in ("allocated_size", "used_size", "data_size", "checksum")},
+            )
+
+            if allocated_size != header["allocated_size"]:
+                fd.seek(blk.data_offset + allocated_size)
+                if has_index:
+                    offsets = [b.offset - len(constants.BLOCK_MAGIC) for b in self.blocks]
+                    bio.write_block_index(fd, offsets)
+                fd.truncate()
+                if fd.can_memmap():
+                    # a memmap doesn't cover the end of the grown file
+                    fd.close_memmap()
+            fd.flush()
+
+        # replace the block (in place so that data callbacks remain valid) as
+        # any read data is outdated and a memmap might not cover the new data
+        self.blocks[index] = reader.ReadBlock(
+            blk.offset, fd, self._memmap, True, False, header=new_header, data_offset=blk.data_offset
+        )
+        return True
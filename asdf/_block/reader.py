@@ -1,12 +1,29 @@
+import os
+import threading
 import warnings
 import weakref
 
+import numpy as np
+
+from asdf import _compression as mcompression
 from asdf import constants
 from asdf.exceptions import AsdfBlockIndexWarning, AsdfWarning, DelimiterNotFoundError
 
 from . import io as bio
 from .exceptions import BlockIndexError
 
+# Reading a block seeks the file, blocks from the same file are read under
+# a shared lock so that they can be loaded from several threads.
+_fd_locks = weakref.WeakKeyDictionary()
+_fd_locks_lock = threading.Lock()
+
+
+def _get_fd_lock(fd):
+    with _fd_locks_lock:
+        if fd not in _fd_locks:
+            _fd_locks[fd] = threading.RLock()
+        return _fd_locks[fd]
+
 
 class ReadBlock:
     """
@@ -48,11 +65,14 @@ class ReadBlock:
         if fd is None or fd.is_closed():
             msg = "Attempt to load block from closed file"
             raise OSError(msg)
-        position = fd.tell()
-        _, self._header, self.data_offset, self._data = bio.read_block(
-            fd, self.validate_checksum, offset=self.offset, memmap=self.memmap, lazy_load=self.lazy_load
-        )
-        fd.seek(position)
+        with _get_fd_lock(fd):
+            if self.loaded:
+                return
+            position = fd.tell()
+            _, self._header, self.data_offset, self._data = bio.read_block(
+                fd, self.validate_checksum, offset=self.offset, memmap=self.memmap, lazy_load=self.lazy_load
+            )
+            fd.seek(position)
 
     @property
     def data(self):
@@ -67,12 +87,143 @@ class ReadBlock:
         if not self.loaded:
             self.load()
         if callable(self._data):
-            data = self._data()
+            fd = self._fd()
+            if fd is None:
+                data = self._data()
+            else:
+                with _get_fd_lock(fd):
+                    data = self._data()
         else:
             data = self._data
 
         return data
 
+    @property
+    def data_size(self):
+        """
+        Get the size (in bytes) of the (uncompressed) block data
+        without reading the data.
+
+        A streamed block has a ``data_size`` of 0 in the block
+        header, for these blocks the size is computed from the
+        size of the file.
+
+        Returns
+        -------
+        data_size : int
+        """
+        header = self.header
+        if not header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            return header["data_size"]
+        if not callable(self._data):
+            return self._data.size
+        fd = self._fd()
+        if fd is None or fd.is_closed():
+            msg = "Attempt to read block size from closed file"
+            raise OSError(msg)
+        with _get_fd_lock(fd):
+            position = fd.tell()
+            fd.seek(0, os.SEEK_END)
+            end = fd.tell()
+            fd.seek(position)
+        return end - self.data_offset
+
+    def read_range(self, start, size):
+        """
+        Read part of the block data without reading the whole block.
+
+        Only the data of uncompressed, lazy loaded (and not memory
+        mapped) blocks from read-only files is read this way. The
+        returned array does not share memory with the block data
+        so it is marked read-only.
+
+        Parameters
+        ----------
+        start : int
+            Offset (in bytes) of the range within the block data.
+
+        size : int
+            Number of bytes to read.
+
+        Returns
+        -------
+        data : ndarray or None
+            A one-dimensional read-only ndarray of dtype uint8 or `None`
+            if the data for this block can't be partially read.
+        """
+        if self._cached_data is not None or self.validate_checksum:
+            return None
+        fd = self._fd()
+        if fd is None or fd.is_closed():
+            msg = "ASDF file has already been closed. Can not get the data."
+            raise OSError(msg)
+        # reads the header of a lazy loaded block
+        header = self.header
+        if not callable(self._data):
+            return None
+        if fd.writable() or not fd.seekable() or (self.memmap and fd.can_memmap()):
+            return None
+        if mcompression.validate(header["compression"]):
+            return None
+        with _get_fd_lock(fd):
+            position = fd.tell()
+            fd.seek(self.data_offset + start)
+            data = fd.read_into_array(size)
+            fd.seek(position)
+        data.flags.writeable = False
+        return data
+
+    def refresh(self):
+        """
+        Extend the data of a streamed block to include data appended to
+        the file since the data was read.
+
+        Memory mapped data is mapped again (arrays of other blocks
+        of the file keep using the previous memory map) and read data
+        is extended by reading only the appended bytes.  Blocks that
+        are not streamed, or whose data hasn't been read, are
+        not changed.
+
+        Returns
+        -------
+        refreshed : bool
+            `True` if the data of the block was extended.
+        """
+        header = self.header
+        if not header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            return False
+        if self._cached_data is not None:
+            data = self._cached_data
+        elif not callable(self._data):
+            data = self._data
+        else:
+            # the size of unread data is always computed from the file size
+            return False
+        fd = self._fd()
+        if fd is None or fd.is_closed():
+            msg = "Attempt to refresh block from closed file"
+            raise OSError(msg)
+        with _get_fd_lock(fd):
+            position = fd.tell()
+            fd.seek(0, os.SEEK_END)
+            size = fd.tell() - self.data_offset
+            if size <= data.size:
+                fd.seek(position)
+                return False
+            if isinstance(data, np.memmap) and fd.can_memmap():
+                # a memory map can't be extended, map the file again
+                fd.close_memmap()
+                new_data = fd.memmap_array(self.data_offset, size)
+            else:
+                fd.seek(self.data_offset + data.size)
+                new_data = np.concatenate([data, fd.read_into_array(size - data.size)])
+            fd.seek(position)
+        if self._cached_data is not None:
+            self._cached_data = new_data
+        if not callable(self._data):
+            self._data = new_data
+        return True
+
     @property
     def cached_data(self):
         """
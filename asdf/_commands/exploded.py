@@ -1,17 +1,42 @@
 """
 Contains commands for dealing with exploded and imploded forms.
+
+The blocks are copied between files without decoding them (so
+compressed blocks stay compressed and checksums are preserved) and
+only the ``source`` of the ndarrays in the tree is changed.  Files
+with blocks that aren't used by an ndarray (for example blocks
+used by a custom converter) are converted through `asdf.AsdfFile`.
 """
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import asdf
-from asdf import AsdfFile
+from asdf import AsdfFile, constants, generic_io, tagged, treeutil, yamlutil
+from asdf._block import external, reader
+from asdf._block import io as bio
+from asdf.config import _use_config, get_config
 
 from .main import Command
 
 __all__ = ["explode", "implode"]
 
 
+# Size of the chunks used to copy block bytes between files
+_COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _add_common_arguments(parser):
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=None,
+        help="""Maximum number of threads used to copy blocks.""",
+    )
+
+
 class Implode(Command):
     @classmethod
     def setup_arguments(cls, subparsers):
@@ -40,6 +65,7 @@ class Implode(Command):
             help="""Resolve all references and store them directly in
             the output file.""",
         )
+        _add_common_arguments(parser)
 
         parser.set_defaults(func=cls.run)
 
@@ -47,10 +73,134 @@ class Implode(Command):
 
     @classmethod
     def run(cls, args):
-        return implode(args.filename[0], args.output, args.resolve_references)
+        return implode(
+            args.filename[0],
+            args.output,
+            args.resolve_references,
+            workers=args.workers,
+            verbose=args.verbose,
+        )
+
+
+def _is_ndarray(node):
+    return isinstance(node, tagged.TaggedDict) and node._tag.startswith(
+        constants.STSCI_SCHEMA_TAG_BASE + "/core/ndarray-"
+    )
+
+
+def _ndarray_sources(tree):
+    """
+    Return the ``source`` of every ndarray in a raw (tagged) tree.
+    """
+    return [node["source"] for node in treeutil.iter_tree(tree) if _is_ndarray(node) and "source" in node]
+
+
+def _replace_sources(tree, new_sources):
+    """
+    Replace the ``source`` of the ndarrays in a raw (tagged) tree
+    using the ``new_sources`` mapping of old to new source.
+    """
+    for node in treeutil.iter_tree(tree):
+        if _is_ndarray(node) and node.get("source") in new_sources:
+            node["source"] = new_sources[node["source"]]
+
+
+def _block_span(fd, blk):
+    """
+    Return the offset and size (in bytes, including the block magic
+    and header) of a block read from ``fd``.
+    """
+    header = blk.header
+    start = blk.offset - len(constants.BLOCK_MAGIC)
+    if header["flags"] & constants.BLOCK_FLAG_STREAMED:
+        with reader._get_fd_lock(fd):
+            fd.seek(0, os.SEEK_END)
+            end = fd.tell()
+    else:
+        end = blk.data_offset + header["allocated_size"]
+    return start, end - start
+
+
+def _copy_range(src, dst, offset, size):
+    """
+    Copy ``size`` bytes starting at ``offset`` in file ``src`` to the
+    current position of file ``dst`` in chunks.
+    """
+    src.seek(offset)
+    while size:
+        chunk = src.read(min(size, _COPY_CHUNK_SIZE))
+        if not chunk:
+            msg = "Unexpected end of file while copying block"
+            raise OSError(msg)
+        dst.write(chunk)
+        size -= len(chunk)
+
+
+def _copy_block(span, dst):
+    """
+    Copy the bytes of a block (see `_block_span`) from the file
+    at ``span[0]`` to the current position of ``dst``.  Files are
+    opened by each call so blocks can be copied concurrently.
+    """
+    uri, offset, size = span
+    with generic_io.get_file(uri, mode="r") as src:
+        _copy_range(src, dst, offset, size)
+
+
+def _make_tree_file(ff, tree):
+    """
+    Make an `asdf.AsdfFile` (with the version of ``ff``) to write a
+    raw (tagged) tree read from ``ff``.
+    """
+    af = AsdfFile(version=ff.version)
+    af.tree = tree
+    if "history" in tree:
+        # the extension metadata is updated when writing so the history
+        # needs to be converted
+        af.tree["history"] = yamlutil.tagged_tree_to_custom_tree(tree["history"], af)
+    return af
+
+
+class _Progress:
+    """
+    Report the progress and throughput of copying blocks.
+    """
+
+    def __init__(self, verb, total, verbose):
+        self._verb = verb
+        self._total = total
+        self._verbose = verbose
+        self._count = 0
+        self._nbytes = 0
+        self._start = time.perf_counter()
+
+    def update(self, nbytes):
+        self._count += 1
+        self._nbytes += nbytes
+        if self._verbose:
+            print(f"{self._verb} block {self._count}/{self._total} ({nbytes} bytes)")
+
+    def finish(self):
+        if not self._verbose:
+            return
+        elapsed = time.perf_counter() - self._start
+        rate = self._nbytes / elapsed / 1e6 if elapsed > 0 else float("inf")
+        print(f"{self._verb} {self._count} blocks ({self._nbytes} bytes) in {elapsed:.2f} s ({rate:.1f} MB/s)")
+
+
+def _implode_by_conversion(input_, output, resolve_references):
+    with asdf.open(input_) as ff:
+        ff2 = AsdfFile(ff)
+        if resolve_references:
+            ff2.resolve_references()
+        ff2.write_to(output, all_array_storage="internal")
+
 
+def _is_streamed(blk):
+    return bool(blk.header["flags"] & constants.BLOCK_FLAG_STREAMED)
 
-def implode(input_, output=None, resolve_references=False):
+
+def implode(input_, output=None, resolve_references=False, workers=None, verbose=False):
     """
     Implode a given ASDF file, which may reference external data, back
     into a single ASDF file.
@@ -61,19 +211,77 @@ def implode(input_, output=None, resolve_references=False):
         The input file.
 
     output : str of file-like object
-        The output file.
+        The output file.  A path is written to a temporary file
+        that replaces ``output`` once it is complete.
 
     resolve_references : bool, optional
         If `True` resolve all external references before saving.
+
+    workers : int, optional
+        Maximum number of threads used to read the external files.
+
+    verbose : bool, optional
+        If `True` print the progress and throughput of copying blocks.
     """
     if output is None:
         base, _ = os.path.splitext(input_)
         output = base + "_all" + ".asdf"
-    with asdf.open(input_) as ff:
-        ff2 = AsdfFile(ff)
-        if resolve_references:
-            ff2.resolve_references()
-        ff2.write_to(output, all_array_storage="internal")
+    if resolve_references:
+        # resolving references requires converting the tree
+        _implode_by_conversion(input_, output, resolve_references)
+        return
+
+    with asdf.open(input_, _force_raw_types=True, lazy_load=True) as ff:
+        tree = ff.tree
+        blocks = ff._blocks.blocks
+        sources = _ndarray_sources(tree)
+        externals = list(dict.fromkeys(source for source in sources if isinstance(source, str)))
+        if (
+            ff.uri is None
+            or {source for source in sources if isinstance(source, int)} != set(range(len(blocks)))
+            or any(_is_streamed(blk) for blk in blocks)
+        ):
+            _implode_by_conversion(input_, output, resolve_references)
+            return
+
+        def external_span(source):
+            uri = generic_io.resolve_uri(ff.uri, source)
+            with asdf.open(uri, _force_raw_types=True, lazy_load=True) as ext_ff:
+                blk = ext_ff._blocks.blocks[0]
+                return None if _is_streamed(blk) else (uri, *_block_span(ext_ff._fd, blk))
+
+        config = get_config()
+
+        def _external_span(source):
+            # threads don't share config contexts, use the caller's config
+            with _use_config(config):
+                return external_span(source)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            external_spans = list(executor.map(_external_span, externals))
+        if None in external_spans:
+            # a streamed block can't be followed by other blocks
+            _implode_by_conversion(input_, output, resolve_references)
+            return
+        spans = [(ff.uri, *_block_span(ff._fd, blk)) for blk in blocks] + external_spans
+
+        # external blocks are appended after the internal blocks
+        _replace_sources(tree, {source: len(blocks) + index for index, source in enumerate(externals)})
+        tree_ff = _make_tree_file(ff, tree)
+
+    progress = _Progress("Copied", len(spans), verbose)
+    # paths are written to a temporary file that is renamed on success
+    # (and removed on failure) see `asdf._extern.atomicfile`
+    with generic_io.get_file(output, mode="w") as fd:
+        tree_ff.write_to(fd, include_block_index=False)
+        offsets = []
+        for span in spans:
+            offsets.append(fd.tell())
+            _copy_block(span, fd)
+            progress.update(span[2])
+        if offsets:
+            bio.write_block_index(fd, offsets)
+    progress.finish()
 
 
 class Explode(Command):
@@ -97,6 +305,7 @@ class Explode(Command):
             will be the name of the input file with "_exploded"
             appended.""",
         )
+        _add_common_arguments(parser)
 
         parser.set_defaults(func=cls.run)
 
@@ -104,10 +313,10 @@ class Explode(Command):
 
     @classmethod
     def run(cls, args):
-        return explode(args.filename[0], args.output)
+        return explode(args.filename[0], args.output, workers=args.workers, verbose=args.verbose)
 
 
-def explode(input_, output=None):
+def explode(input_, output=None, workers=None, verbose=False):
     """
     Explode a given ASDF file so each data block is in a separate
     file.
@@ -119,9 +328,57 @@ def explode(input_, output=None):
 
     output : str of file-like object
         The output file.
+
+    workers : int, optional
+        Maximum number of threads used to write the external files.
+
+    verbose : bool, optional
+        If `True` print the progress and throughput of copying blocks.
     """
     if output is None:
         base, _ = os.path.splitext(input_)
         output = base + "_exploded" + ".asdf"
-    with asdf.open(input_) as ff:
-        ff.write_to(output, all_array_storage="external")
+
+    with asdf.open(input_, _force_raw_types=True, lazy_load=True) as ff:
+        tree = ff.tree
+        blocks = ff._blocks.blocks
+        sources = _ndarray_sources(tree)
+        streamed_sources = {}
+        if blocks and _is_streamed(blocks[-1]):
+            # the streamed block is always the last block
+            streamed_sources = {-1: len(blocks) - 1}
+            sources = [streamed_sources.get(source, source) for source in sources]
+        if (
+            ff.uri is None
+            or any(isinstance(source, str) for source in sources)
+            or set(sources) != set(range(len(blocks)))
+        ):
+            # blocks not used by an ndarray are written by their converters
+            with asdf.open(input_) as ff:
+                ff.write_to(output, all_array_storage="external")
+            return
+        spans = [(ff.uri, *_block_span(ff._fd, blk)) for blk in blocks]
+        tree_ff = _make_tree_file(ff, tree)
+
+    with generic_io.get_file(output, mode="w") as fd:
+        if fd.uri is None:
+            msg = "Can't write external blocks, since URI of main file is unknown."
+            raise ValueError(msg)
+        uris = [external.relative_uri_for_index(fd.uri, index) for index in range(len(spans))]
+        new_sources = dict(enumerate(uris))
+        new_sources.update((source, uris[index]) for source, index in streamed_sources.items())
+        _replace_sources(tree_ff.tree, new_sources)
+        tree_ff.write_to(fd, include_block_index=False)
+        external_uris = [generic_io.resolve_uri(fd.uri, uri) for uri in uris]
+
+    def write_external(index):
+        with generic_io.get_file(external_uris[index], mode="w") as ext_fd:
+            AsdfFile().write_to(ext_fd, include_block_index=False)
+            _copy_block(spans[index], ext_fd)
+        return spans[index][2]
+
+    progress = _Progress("Wrote", len(spans), verbose)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for nbytes in executor.map(write_external, range(len(spans))):
+            progress.update(nbytes)
+    progress.finish()
@@ -171,12 +171,17 @@ class NDArrayConverter(Converter):
             elif isinstance(source, str):
                 # external
                 def data_callback(_attr=None, _ref=weakref.ref(ctx._blocks)):
-                    if _attr not in (None, "cached_data", "data"):
+                    if _attr not in (None, "cached_data", "data", "data_size", "read_range", "evicting"):
                         raise AttributeError(f"_attr {_attr} is not supported")
                     blks = _ref()
                     if blks is None:
                         msg = "Failed to resolve reference to AsdfFile to read external block"
                         raise OSError(msg)
+                    if _attr == "evicting":
+                        return blks._external_block_cache.evicting
+                    if _attr in ("data_size", "read_range"):
+                        # read from the (open) external file without loading the data
+                        return getattr(blks._get_external_block(source), _attr)
                     array = blks._load_external(source)
                     blks._set_array_storage(array, "external")
                     return array
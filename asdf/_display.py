@@ -10,7 +10,7 @@ return what it thinks is suitable for display.
 
 import sys
 
-from ._node_info import create_tree
+from ._node_info import _RowBudget, create_tree
 
 __all__ = [
     "DEFAULT_MAX_COLS",
@@ -62,12 +62,15 @@ def render_tree(
     """
     Render a tree as text with indents showing depth.
     """
+    # Without filters only the displayed nodes need to be read from the
+    # tree. Filtering needs the whole tree to find the matching nodes.
     info = create_tree(
         key="title",
         node=node,
         identifier=identifier,
-        filters=[] if filters is None else filters,
+        filters=filters,
         extension_manager=extension_manager,
+        max_rows=None if filters else max_rows,
     )
     if info is None:
         return []
@@ -129,74 +132,20 @@ class _TreeRenderer:
         Select nodes to display, respecting max_rows.  Nodes at lower
         depths will be prioritized.
         """
-        if isinstance(self._max_rows, tuple):
-            self._mark_visible_tuple(root_info)
-        else:
-            self._mark_visible_int(root_info)
-
-    def _mark_visible_int(self, root_info):
-        """
-        Select nodes to display, obeying max_rows as an overall limit on
-        the number of lines returned.
-        """
-        if self._max_rows is None:
-            return
-
-        if self._max_rows < 2:
+        budget = _RowBudget(self._max_rows)
+        if not budget.root_visible:
             root_info.visible = False
             return
 
-        current_infos = [root_info]
-        # Reserve one row for the root node, and another for the
-        # "Some nodes not shown." message.
-        rows_left = self._max_rows - 2
-        while True:
-            next_infos = []
-
-            for info in current_infos:
-                if rows_left >= len(info.children):
-                    rows_left -= len(info.children)
-                    next_infos.extend(info.children)
-                elif rows_left > 1:
-                    for child in info.children[rows_left - 1 :]:
-                        child.visible = False
-                    next_infos.extend(info.children[0 : rows_left - 1])
-                    rows_left = 0
-                else:
-                    for child in info.children:
-                        child.visible = False
-
-            if len(next_infos) == 0:
-                break
-
-            current_infos = next_infos
-
-    def _mark_visible_tuple(self, root_info):
-        """
-        Select nodes to display, obeying the per-node max_rows value for
-        each tree depth.
-        """
-        max_rows = (None, *self._max_rows)
-
         current_infos = [root_info]
         while True:
             next_infos = []
 
             for info in current_infos:
-                if info.depth + 1 < len(max_rows):
-                    rows_left = max_rows[info.depth + 1]
-                    if rows_left is None or rows_left >= len(info.children):
-                        next_infos.extend(info.children)
-                    elif rows_left > 1:
-                        for child in info.children[rows_left - 1 :]:
-                            child.visible = False
-                        next_infos.extend(info.children[0 : rows_left - 1])
-                    else:
-                        for child in info.children:
-                            child.visible = False
-                else:
-                    for child in info.children:
-                        child.visible = False
+                num_visible = budget.allot(info.depth, info.num_children)
+                for child in info.children[num_visible:]:
+                    child.visible = False
+                next_infos.extend(info.children[:num_visible])
 
             if len(next_infos) == 0:
                 break
@@ -220,10 +169,10 @@ class _TreeRenderer:
 
         lines.append(self._render_node(info, active_depths, is_tail))
 
-        elided = len(info.visible_children) < len(info.children)
+        elided = len(info.visible_children) < info.num_children
 
         for i, child in enumerate(info.visible_children):
-            if i == len(info.children) - 1:
+            if i == info.num_children - 1:
                 child_is_tail = True
                 child_active_depths = active_depths
             else:
@@ -235,8 +184,8 @@ class _TreeRenderer:
             elided = elided or child_elided
 
         num_visible_children = len(info.visible_children)
-        if num_visible_children > 0 and num_visible_children != len(info.children):
-            hidden_count = len(info.children) - num_visible_children
+        if num_visible_children > 0 and num_visible_children != info.num_children:
+            hidden_count = info.num_children - num_visible_children
             prefix = self._make_prefix(info.depth + 1, active_depths, True)
             message = self.format_faint(self.format_italic(str(hidden_count) + " not shown"))
             lines.append(f"{prefix}{message}")
@@ -256,7 +205,7 @@ class _TreeRenderer:
         if info.info is not None:
             line = line + self.format_faint(self.format_italic(" # " + info.info))
         visible_children = info.visible_children
-        if len(visible_children) == 0 and len(info.children) > 0:
+        if len(visible_children) == 0 and info.num_children > 0:
             line = line + self.format_italic(" ...")
 
         if info.recursive:
@@ -271,7 +220,7 @@ class _TreeRenderer:
     def _render_node_value(self, info):
         rendered_type = type(info.node).__name__
 
-        if not info.children and self._show_values:
+        if not info.num_children and self._show_values:
             try:
                 s = f"{info.node}"
             except Exception:
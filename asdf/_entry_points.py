@@ -1,8 +1,16 @@
+import functools
+import hashlib
+import json
+import os
 import sys
+import tempfile
+import threading
 import warnings
 
+from ._version import version as asdf_package_version
 from .exceptions import AsdfWarning
 from .extension import ExtensionProxy
+from .extension._extension import _DeferredExtensionProxy, _get_extension_index
 from .resource import ResourceMappingProxy
 
 # The standard library importlib.metadata returns duplicate entrypoints
@@ -24,14 +32,27 @@ def get_resource_mappings():
     return _list_entry_points(RESOURCE_MAPPINGS_GROUP, ResourceMappingProxy)
 
 
-def get_extensions():
-    extensions = _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy)
-    return extensions
+def get_extensions(cache_dir=None):
+    """
+    Get the extensions registered via entry points.
 
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory containing an index of the extensions provided by
+        each entry point.  Entry points with an up-to-date index are
+        not loaded, instead their extensions are loaded on first use.
+
+    Returns
+    -------
+    list of asdf.extension.ExtensionProxy
+    """
+    if cache_dir is None:
+        return _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy)
+    return _list_indexed_extensions(cache_dir)
 
-def _list_entry_points(group, proxy_class):
-    results = []
 
+def _sorted_entry_points(group):
     points = entry_points(group=group)
 
     # The order of plugins may be significant, since in the case of
@@ -43,35 +64,204 @@ def _list_entry_points(group, proxy_class):
     asdf_entry_points = [e for e in points if e.dist.name == "asdf"]
     other_entry_points = sorted((e for e in points if e.dist.name != "asdf"), key=lambda e: e.dist.name)
 
-    for entry_point in other_entry_points + asdf_entry_points:
-        package_name = entry_point.dist.name
-        package_version = entry_point.dist.version
+    return other_entry_points + asdf_entry_points
+
+
+def _handle_error(group, entry_point, e):
+    warnings.warn(
+        f"{group} plugin from package {entry_point.dist.name}=={entry_point.dist.version} failed to load:\n\n"
+        f"{e.__class__.__name__}: {e}",
+        AsdfWarning,
+    )
+
 
-        def _handle_error(e):
-            warnings.warn(
-                f"{group} plugin from package {package_name}=={package_version} failed to load:\n\n"
-                f"{e.__class__.__name__}: {e}",
-                AsdfWarning,
+def _load_entry_point(group, entry_point):
+    """
+    Load an entry point and return the list of elements it provides,
+    or `None` (after issuing a warning) if it failed to load.
+    """
+    # Catch errors loading entry points and warn instead of raising
+    try:
+        with warnings.catch_warnings():
+            elements = entry_point.load()()
+
+    except Exception as e:
+        _handle_error(group, entry_point, e)
+        return None
+
+    # Process the elements returned by the entry point
+    if not isinstance(elements, list):
+        elements = [elements]
+
+    return elements
+
+
+def _wrap_elements(group, entry_point, elements, proxy_class):
+    """
+    Wrap the elements provided by an entry point in ``proxy_class``
+    returning a list of ``(position, proxy)`` for elements that were
+    successfully wrapped.
+    """
+    results = []
+    for position, element in enumerate(elements):
+        # Catch errors instantiating the proxy class and warn instead of raising
+        try:
+            results.append(
+                (
+                    position,
+                    proxy_class(element, package_name=entry_point.dist.name, package_version=entry_point.dist.version),
+                ),
             )
+        except Exception as e:
+            _handle_error(group, entry_point, e)
+    return results
+
+
+def _list_entry_points(group, proxy_class):
+    results = []
+
+    for entry_point in _sorted_entry_points(group):
+        elements = _load_entry_point(group, entry_point)
+        if elements is None:
+            continue
+        results.extend(proxy for _, proxy in _wrap_elements(group, entry_point, elements, proxy_class))
+
+    return results
+
 
-        # Catch errors loading entry points and warn instead of raising
+def _get_distribution_mtime(dist):
+    """
+    Return the modification time (in ns) of the metadata of a
+    distribution, which changes when the distribution is reinstalled,
+    or `None` for editable installs (where the installed files can
+    change without reinstalling) or if the metadata can't be found.
+    """
+    try:
+        direct_url = json.loads(dist.read_text("direct_url.json") or "{}")
+    except ValueError:
+        direct_url = {}
+    if not isinstance(direct_url, dict) or direct_url.get("dir_info", {}).get("editable", False):
+        return None
+
+    path = getattr(dist, "_path", None)
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_extension_index_path(cache_dir, entry_point):
+    """
+    Return the path of the index for an entry point or `None` if
+    the entry point should not be indexed.
+    """
+    # The package version and the modification time of the package metadata
+    # are part of the path so that upgrades (and reinstalls) invalidate the index.
+    mtime = _get_distribution_mtime(entry_point.dist)
+    if mtime is None:
+        return None
+    key = f"{entry_point.group}:{entry_point.name}={entry_point.value}"
+    filename = "extensions-" + hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+    return os.path.join(
+        cache_dir,
+        f"asdf-{asdf_package_version}",
+        f"{entry_point.dist.name}-{entry_point.dist.version}-{mtime}",
+        filename,
+    )
+
+
+def _read_extension_index(path, entry_point):
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get("entry_point") != entry_point.value:
+        return None
+
+    return index.get("extensions")
+
+
+def _write_extension_index(path, entry_point, extensions):
+    content = json.dumps({"entry_point": entry_point.value, "extensions": extensions})
+
+    # write to a temporary file and rename it so that other processes
+    # never read a partially written file
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
         try:
-            with warnings.catch_warnings():
-                elements = entry_point.load()()
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        # the index is only an optimization
+        pass
 
-        except Exception as e:
-            _handle_error(e)
+
+class _EntryPointLoader:
+    """
+    Load an entry point once (on first use) and provide the
+    elements to the deferred extensions created from its index.
+    """
+
+    def __init__(self, entry_point):
+        self._entry_point = entry_point
+        self._elements = None
+        self._lock = threading.Lock()
+
+    def get(self, position):
+        with self._lock:
+            if self._elements is None:
+                self._elements = _load_entry_point(EXTENSIONS_GROUP, self._entry_point) or []
+        if position < len(self._elements):
+            return self._elements[position]
+        return None
+
+
+def _list_indexed_extensions(cache_dir):
+    results = []
+
+    for entry_point in _sorted_entry_points(EXTENSIONS_GROUP):
+        path = _get_extension_index_path(cache_dir, entry_point)
+        index = None if path is None else _read_extension_index(path, entry_point)
+
+        if index is not None:
+            loader = _EntryPointLoader(entry_point)
+            results.extend(
+                _DeferredExtensionProxy(
+                    functools.partial(loader.get, item["position"]),
+                    item["extension"],
+                    package_name=entry_point.dist.name,
+                    package_version=entry_point.dist.version,
+                )
+                for item in index
+            )
             continue
 
-        # Process the elements returned by the entry point
-        if not isinstance(elements, list):
-            elements = [elements]
+        # Load the entry point and, if every extension can be described,
+        # write an index so that the next session can defer loading it.
+        elements = _load_entry_point(EXTENSIONS_GROUP, entry_point)
+        if elements is None:
+            continue
+        wrapped = _wrap_elements(EXTENSIONS_GROUP, entry_point, elements, ExtensionProxy)
+        results.extend(proxy for _, proxy in wrapped)
+
+        if path is None:
+            continue
 
-        for element in elements:
-            # Catch errors instantiating the proxy class and warn instead of raising
-            try:
-                results.append(proxy_class(element, package_name=package_name, package_version=package_version))
-            except Exception as e:
-                _handle_error(e)
+        index = []
+        for position, proxy in wrapped:
+            if (extension_index := _get_extension_index(proxy)) is None:
+                break
+            index.append({"position": position, "extension": extension_index})
+        else:
+            _write_extension_index(path, entry_point, index)
 
     return results
@@ -1,8 +1,10 @@
+import itertools
 import re
 from collections import namedtuple
+from functools import lru_cache
 
 from .schema import load_schema
-from .treeutil import get_children, is_container
+from .treeutil import _iter_children, is_container
 
 
 def _filter_tree(info, filters):
@@ -20,6 +22,9 @@ def _filter_tree(info, filters):
     return len(info.children) > 0 or all(f(info.node, info.identifier) for f in filters)
 
 
+_compile_pattern = lru_cache(1024)(re.compile)
+
+
 def _get_matching_schema_property(schema, property_name):
     """
     Extract a property subschema for a given property_name.
@@ -47,7 +52,7 @@ def _get_matching_schema_property(schema, property_name):
         if "patternProperties" in props:
             patterns = props["patternProperties"]
             for regex in patterns:
-                if re.search(regex, property_name):
+                if _compile_pattern(regex).search(property_name):
                     return patterns[regex]
     return None
 
@@ -138,7 +143,108 @@ def _get_schema_key(schema, key):
     return None
 
 
-def create_tree(key, node, identifier="root", filters=None, extension_manager=None):
+class _SchemaCache:
+    """
+    Memo of the schema lookups made while building a `NodeSchemaInfo`
+    tree, so that the cost of annotating the tree scales with the number
+    of distinct schemas (and property names) rather than the number of
+    nodes.
+
+    Results are keyed by the id of the schema. The schemas are held by
+    the cache so an id can not be reused while the cache is in use.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._tag_schemas = {}
+
+    def _lookup(self, function, schema, name):
+        key = (function, id(schema), name)
+        if key not in self._results:
+            self._results[key] = (schema, function(schema, name))
+        return self._results[key][1]
+
+    def get_subschema_for_property(self, schema, property_name):
+        return self._lookup(_get_subschema_for_property, schema, property_name)
+
+    def get_schema_key(self, schema, key):
+        return self._lookup(_get_schema_key, schema, key)
+
+    def get_tag_schema(self, tag, extension_manager):
+        """
+        Load the schema for a tag. Raises KeyError if the tag is unknown.
+        """
+        if tag not in self._tag_schemas:
+            try:
+                tag_def = extension_manager.get_tag_definition(tag)
+            except KeyError:
+                schema = None
+            else:
+                schema = load_schema(tag_def.schema_uris[0], resolve_references=True)
+            self._tag_schemas[tag] = schema
+
+        schema = self._tag_schemas[tag]
+        if schema is None:
+            raise KeyError(tag)
+        return schema
+
+
+class _RowBudget:
+    """
+    Number of rows available to display a tree (see ``max_rows``
+    for `asdf.AsdfFile.info`).  Nodes at lower depths are prioritized.
+
+    Parameters
+    ----------
+    max_rows : int, tuple or None
+        If int, the total number of displayed lines (including one
+        line for the root node and one for the "Some nodes not shown."
+        message).
+        If tuple, the number of lines per node at the depth corresponding
+        to the tuple index.
+        If None, display all lines.
+    """
+
+    def __init__(self, max_rows):
+        self._max_rows = (None, *max_rows) if isinstance(max_rows, tuple) else max_rows
+        if isinstance(max_rows, int):
+            # Reserve one row for the root node, and another for the
+            # "Some nodes not shown." message.
+            self._rows_left = max_rows - 2
+
+    @property
+    def root_visible(self):
+        return not isinstance(self._max_rows, int) or self._max_rows >= 2
+
+    def allot(self, depth, num_children):
+        """
+        Return the number of the ``num_children`` children of a visible
+        node at ``depth`` that are visible.  Called for visible nodes in
+        breadth-first order.  When only some children are visible, one
+        row is left for a message that the others are not shown.
+        """
+        if self._max_rows is None:
+            return num_children
+
+        if isinstance(self._max_rows, tuple):
+            if depth + 1 >= len(self._max_rows):
+                return 0
+            rows_left = self._max_rows[depth + 1]
+            if rows_left is None or rows_left >= num_children:
+                return num_children
+            return max(rows_left - 1, 0)
+
+        if self._rows_left >= num_children:
+            self._rows_left -= num_children
+            return num_children
+        if self._rows_left > 1:
+            visible = self._rows_left - 1
+            self._rows_left = 0
+            return visible
+        return 0
+
+
+def create_tree(key, node, identifier="root", filters=None, extension_manager=None, max_rows=None):
     """
     Create a `NodeSchemaInfo` tree which can be filtered from a base node.
 
@@ -150,16 +256,21 @@ def create_tree(key, node, identifier="root", filters=None, extension_manager=No
         The asdf tree to search.
     filters : list of functions
         A list of functions that take a node and identifier and return True if the node should be included in the tree.
-    preserve_list : bool
-        If True, then lists are preserved. Otherwise, they are turned into dicts.
+    max_rows : int, tuple or None
+        Only create the nodes that are visible with this row limit (see `_RowBudget`).
+        Can not be combined with ``filters``.
     """
     filters = [] if filters is None else filters
+    if filters and max_rows is not None:
+        msg = "max_rows can not be used with filters"
+        raise ValueError(msg)
 
     schema_info = NodeSchemaInfo.from_root_node(
         key,
         identifier,
         node,
         extension_manager=extension_manager,
+        max_rows=max_rows,
     )
 
     if len(filters) > 0 and not _filter_tree(schema_info, filters):
@@ -289,13 +400,33 @@ class NodeSchemaInfo:
         If this node will be made visible in the output. Default is True.
 
     children : list
-        List of the NodeSchemaInfo objects for the children of this node. This is a leaf node if this is empty.
+        List of the NodeSchemaInfo objects for the children of this node.
+
+    unexpanded_children : int
+        Number of children of this node that are not shown and for which
+        no NodeSchemaInfo was created. This is a leaf node if this is 0
+        and ``children`` is empty.
 
     schema : dict
         The portion of the underlying schema corresponding to the node.
+
+    schema_cache : _SchemaCache
+        Memo of schema lookups shared by the nodes of a tree. If None,
+        the cache of the parent (or a new cache) is used.
     """
 
-    def __init__(self, key, parent, identifier, node, depth, recursive=False, visible=True, extension_manager=None):
+    def __init__(
+        self,
+        key,
+        parent,
+        identifier,
+        node,
+        depth,
+        recursive=False,
+        visible=True,
+        extension_manager=None,
+        schema_cache=None,
+    ):
         self.key = key
         self.parent = parent
         self.identifier = identifier
@@ -304,13 +435,21 @@ class NodeSchemaInfo:
         self.recursive = recursive
         self.visible = visible
         self.children = []
+        self.unexpanded_children = 0
         self.schema = None
         self.extension_manager = extension_manager or _get_extension_manager()
+        if schema_cache is None:
+            schema_cache = _SchemaCache() if parent is None else parent._schema_cache
+        self._schema_cache = schema_cache
 
     @property
     def visible_children(self):
         return [c for c in self.children if c.visible]
 
+    @property
+    def num_children(self):
+        return len(self.children) + self.unexpanded_children
+
     @property
     def parent_node(self):
         if self.parent is not None:
@@ -322,10 +461,10 @@ class NodeSchemaInfo:
     def info(self):
         if self.schema is None:
             return None
-        return _get_schema_key(self.schema, self.key)
+        return self._schema_cache.get_schema_key(self.schema, self.key)
 
     def get_schema_for_property(self, identifier):
-        return _get_subschema_for_property(self.schema, identifier) or {}
+        return self._schema_cache.get_subschema_for_property(self.schema, identifier) or {}
 
     def set_schema_for_property(self, parent, identifier):
         """Extract a subschema from the parent for the identified property"""
@@ -335,20 +474,20 @@ class NodeSchemaInfo:
     def set_schema_from_node(self, node, extension_manager):
         """Pull a tagged schema for the node"""
 
-        tag_def = extension_manager.get_tag_definition(node._tag)
-        schema_uri = tag_def.schema_uris[0]
-        schema = load_schema(schema_uri, resolve_references=True)
-
-        self.schema = schema
+        self.schema = self._schema_cache.get_tag_schema(node._tag, extension_manager)
 
     @classmethod
-    def from_root_node(cls, key, root_identifier, root_node, schema=None, extension_manager=None):
+    def from_root_node(cls, key, root_identifier, root_node, schema=None, extension_manager=None, max_rows=None):
         """
         Build a NodeSchemaInfo tree from the given ASDF root node.
         Intentionally processes the tree in breadth-first order so that recursively
         referenced nodes are displayed at their shallowest reference point.
+
+        If ``max_rows`` is not None only the nodes that are visible with this
+        row limit are created (and only these nodes are read from the tree).
         """
         extension_manager = extension_manager or _get_extension_manager()
+        budget = _RowBudget(max_rows)
 
         current_nodes = [(None, root_identifier, root_node)]
         seen = set()
@@ -385,6 +524,7 @@ class NodeSchemaInfo:
 
                     if parent is None:
                         info.schema = schema
+                        info.visible = budget.root_visible
 
                     if parent is not None:
                         if parent.schema is not None:
@@ -412,8 +552,11 @@ class NodeSchemaInfo:
                                 # be using _tag for a non-ASDF purpose.
                                 pass
 
-                    # add children to queue
-                    for child_identifier, child_node in get_children(t_node):
+                    # add the visible children to queue
+                    num_children, children = _iter_children(t_node)
+                    num_visible = budget.allot(current_depth, num_children)
+                    info.unexpanded_children = num_children - num_visible
+                    for child_identifier, child_node in itertools.islice(children, num_visible):
                         next_nodes.append((info, child_identifier, child_node))
 
             if len(next_nodes) == 0:
@@ -17,6 +17,69 @@ def test_cache(tmp_path):
     assert cache.load(base_uri, "test.asdf") is data
     assert cache.load(base_uri, "#") is external.UseInternal
     assert cache.load(base_uri, "") is external.UseInternal
+    cache.clear()
+
+
+def _write_external_files(tmp_path, n):
+    arrs = [np.full(100, i, dtype="uint8") for i in range(n)]
+    for i, arr in enumerate(arrs):
+        asdf.AsdfFile({"data": arr}).write_to(tmp_path / f"test{i}.asdf")
+    return f"{tmp_path.as_uri()}/", arrs
+
+
+def test_cache_get_block(tmp_path):
+    base_uri, _ = _write_external_files(tmp_path, 1)
+
+    cache = external.ExternalBlockCache()
+    blk = cache.get_block(base_uri, "test0.asdf")
+    assert blk.data_size == 100
+    # the data isn't loaded
+    assert blk._cached_data is None
+    assert cache.get_block(base_uri, "test0.asdf") is blk
+    assert cache.get_block(base_uri, "#") is external.UseInternal
+    cache.clear()
+
+
+def test_cache_max_open_files(tmp_path):
+    base_uri, arrs = _write_external_files(tmp_path, 3)
+
+    cache = external.ExternalBlockCache(max_open_files=2)
+    data = [cache.load(base_uri, f"test{i}.asdf") for i in range(3)]
+    assert len(cache._files) == 2
+    # data loaded from a closed file is still valid
+    for d, arr in zip(data, arrs):
+        np.testing.assert_array_equal(d, arr)
+    assert cache.load(base_uri, "test0.asdf") is data[0]
+    cache.clear()
+
+
+def test_cache_memory_budget(tmp_path):
+    base_uri, arrs = _write_external_files(tmp_path, 3)
+
+    cache = external.ExternalBlockCache(memory_budget=250)
+    assert cache.evicting
+    data = [cache.load(base_uri, f"test{i}.asdf") for i in range(3)]
+    assert list(cache._cache) == ["test1.asdf", "test2.asdf"]
+    assert cache._cache_nbytes == 200
+
+    # evicted data is read again
+    reloaded = cache.load(base_uri, "test0.asdf")
+    assert reloaded is not data[0]
+    np.testing.assert_array_equal(reloaded, arrs[0])
+    assert list(cache._cache) == ["test2.asdf", "test0.asdf"]
+    cache.clear()
+
+
+def test_cache_prefetch(tmp_path):
+    base_uri, arrs = _write_external_files(tmp_path, 5)
+
+    cache = external.ExternalBlockCache()
+    uris = [f"test{i}.asdf" for i in range(5)]
+    cache.prefetch(base_uri, uris, workers=3)
+    assert list(sorted(cache._cache)) == uris
+    for uri, arr in zip(uris, arrs):
+        np.testing.assert_array_equal(cache._cache[uri], arr)
+    cache.clear()
 
 
 @pytest.mark.parametrize("uri", ["test.asdf", "foo/test.asdf"])
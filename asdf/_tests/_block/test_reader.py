@@ -87,6 +87,8 @@ def test_read(tmp_path, lazy_load, memmap, with_index, validate_checksums, paddi
             for blk in r:
                 base = util.get_array_base(blk.data)
                 assert isinstance(base.base, mmap.mmap)
+        for blk in r:
+            assert blk.data_size == size
         check(r)
         if lazy_load:
             # if lazy loaded, each call to data should re-read the data
@@ -97,6 +99,25 @@ def test_read(tmp_path, lazy_load, memmap, with_index, validate_checksums, paddi
         assert r[0].cached_data is r[0].cached_data
 
 
+@pytest.mark.parametrize("memmap", [True, False])
+def test_read_range(tmp_path, memmap):
+    fn = tmp_path / "test.bin"
+    with gen_blocks(fn=fn, n=3, size=10) as (_, check):
+        pass
+    with generic_io.get_file(fn, mode="r") as fd:
+        r = read_blocks(fd, memmap=memmap, lazy_load=True)
+        if memmap:
+            # memory mapped blocks are not partially read
+            assert r[1].read_range(2, 3) is None
+            return
+        data = r[1].read_range(2, 3)
+        assert data.tolist() == [1, 1, 1]
+        assert not data.flags.writeable
+        assert r[1]._cached_data is None
+        # the data for the other blocks is unchanged
+        check(r)
+
+
 @pytest.mark.parametrize("padding", (1, 4, 7))
 @pytest.mark.parametrize("padding_byte", (b"\1", b"\0", b" ", b"\xd3", b"B", b"L", b"K", b"\xd3BL"))
 def test_read_valid_padding(padding, padding_byte):
@@ -1,8 +1,11 @@
 import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
 
 import asdf
 from asdf import AsdfFile
-from asdf._commands import main
+from asdf._commands import exploded, main
+from asdf._commands.exploded import explode, implode
 from asdf._tests._helpers import assert_tree_match
 
 
@@ -55,3 +58,118 @@ def test_explode_then_implode(tmp_path):
 def test_file_not_found(tmp_path):
     path = tmp_path / "original.asdf"
     assert main.main_from_args(["explode", str(path)]) == 2
+
+
+def _block_bytes(path):
+    with asdf.open(path, lazy_load=False) as af:
+        af._blocks.blocks[0].header
+        offset = af._blocks.blocks[0].offset
+    return path.read_bytes()[offset:]
+
+
+@pytest.mark.parametrize("workers", [None, 1, 3])
+def test_explode_copies_blocks(tmp_path, workers):
+    tree = {
+        "compressed": np.arange(1000, dtype=float),
+        "a": np.arange(20, dtype=np.uint8),
+        "b": np.arange(30, dtype=np.int32),
+    }
+    tree["view"] = tree["a"][2:5]
+
+    path = tmp_path / "original.asdf"
+    ff = AsdfFile(tree)
+    ff.set_array_compression(tree["compressed"], "zlib")
+    ff.write_to(path, all_array_storage="internal")
+
+    output = tmp_path / "exploded.asdf"
+    explode(str(path), str(output), workers=workers)
+
+    with asdf.open(path) as af:
+        n_blocks = len(af._blocks.blocks)
+    with asdf.open(output) as af:
+        assert len(af._blocks.blocks) == 0
+        assert_tree_match(af.tree, tree)
+    assert n_blocks == 3
+    for index in range(n_blocks):
+        # the block header and data are copied unchanged
+        assert _block_bytes(tmp_path / f"exploded{index:04d}.asdf") in path.read_bytes()
+
+    imploded = tmp_path / "imploded.asdf"
+    implode(str(output), str(imploded), workers=workers)
+    with asdf.open(imploded) as af:
+        assert len(af._blocks.blocks) == n_blocks
+        assert af.get_array_compression(af["compressed"]) == "zlib"
+        assert_tree_match(af.tree, tree)
+
+
+def test_explode_implode_verbose(tmp_path, capsys):
+    path = tmp_path / "original.asdf"
+    AsdfFile({"a": np.arange(10), "b": np.arange(20)}).write_to(path, all_array_storage="internal")
+
+    assert main.main_from_args(["--verbose", "explode", "-j", "2", str(path)]) == 0
+    out = capsys.readouterr().out
+    assert "Wrote block 2/2" in out
+    assert "Wrote 2 blocks" in out
+    assert "MB/s" in out
+
+    assert main.main_from_args(["-v", "implode", str(tmp_path / "original_exploded.asdf")]) == 0
+    out = capsys.readouterr().out
+    assert "Copied block 2/2" in out
+    assert "Copied 2 blocks" in out
+
+
+def test_implode_mixed(tmp_path):
+    """
+    Files with both internal and external blocks keep the internal
+    blocks first followed by the external blocks.
+    """
+    tree = {"internal": np.arange(10), "external": np.arange(20), "shared": None}
+    tree["shared"] = tree["external"][::2]
+    path = tmp_path / "mixed.asdf"
+    ff = AsdfFile(tree)
+    ff.set_array_storage(tree["external"], "external")
+    ff.set_array_storage(tree["internal"], "internal")
+    ff.write_to(path)
+
+    output = tmp_path / "imploded.asdf"
+    implode(str(path), str(output))
+    with asdf.open(output) as af:
+        assert len(af._blocks.blocks) == 2
+        assert_tree_match(af.tree, tree)
+
+
+def test_explode_stream(tmp_path):
+    """
+    The streamed block is copied like the other blocks.
+    """
+    path = tmp_path / "stream.asdf"
+    with asdf.generic_io.get_file(path, mode="w") as fd:
+        AsdfFile({"a": np.arange(10), "stream": asdf.Stream([4], np.float64)}).write_to(fd)
+        fd.write(np.arange(12, dtype=np.float64).tobytes())
+
+    output = tmp_path / "exploded.asdf"
+    explode(str(path), str(output))
+    for index in range(2):
+        assert _block_bytes(tmp_path / f"exploded{index:04d}.asdf") in path.read_bytes()
+    with asdf.open(output) as af:
+        assert len(af._blocks.blocks) == 0
+        assert_array_equal(af["a"], np.arange(10))
+        assert_array_equal(af["stream"], np.arange(12, dtype=np.float64).reshape(3, 4))
+
+
+def test_implode_failure_keeps_output(tmp_path, monkeypatch):
+    path = tmp_path / "original.asdf"
+    AsdfFile({"a": np.arange(10)}).write_to(path, all_array_storage="external")
+
+    output = tmp_path / "imploded.asdf"
+    output.write_bytes(b"old")
+    files = set(tmp_path.iterdir())
+
+    def _copy_block(span, dst):
+        raise OSError("NOPE")
+
+    monkeypatch.setattr(exploded, "_copy_block", _copy_block)
+    with pytest.raises(OSError, match=r"NOPE"):
+        implode(str(path), str(output))
+    assert output.read_bytes() == b"old"
+    assert set(tmp_path.iterdir()) == files
@@ -1115,6 +1115,113 @@ def test_shape_does_not_load_array(tmp_path):
         assert af["arr"]._array is None
 
 
+def test_metadata_does_not_load_masked_array(tmp_path):
+    file_path = tmp_path / "test.asdf"
+    arr = ma.array(np.arange(100, dtype="int32").reshape(10, 10), mask=np.arange(100).reshape(10, 10) % 3 == 0)
+    asdf.AsdfFile({"arr": arr}).write_to(file_path)
+
+    with asdf.open(file_path, lazy_load=True) as af:
+        arr = af["arr"]
+        assert arr.shape == (10, 10)
+        assert len(arr) == 10
+        assert arr.ndim == 2
+        assert arr.size == 100
+        assert arr.dtype == np.dtype("int32")
+        assert arr.nbytes == 400
+        assert not list(ndarray.validate_ndim(None, 2, arr, {}))
+        assert not list(ndarray.validate_datatype(None, "int32", arr, {}))
+        af.info()
+        assert arr._array is None
+        assert arr._mask._array is None
+        for block in af._blocks.blocks:
+            assert callable(block._data)
+        assert arr.nbytes == np.asarray(arr).nbytes
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        0,
+        -1,
+        np.int64(2),
+        (1, 2),
+        (slice(None), 1),
+        (..., 0),
+        (slice(1, None, 2), ..., slice(None, None, -1)),
+        (2, slice(None), -2),
+        (0, 0, 0),
+        slice(5, 2),
+    ],
+)
+@pytest.mark.parametrize("name", ["base", "view", "fortran"])
+def test_partial_read(tmp_path, key, name):
+    file_path = tmp_path / "test.asdf"
+    base = np.arange(140, dtype=">f4").reshape(7, 5, 4)
+    arrs = {"base": base, "view": base[1:6:2, ::-1], "fortran": np.asfortranarray(base)}
+    asdf.AsdfFile(arrs).write_to(file_path)
+
+    with asdf.config_context() as config, asdf.open(file_path, lazy_load=True, memmap=False) as af:
+        config.partial_read_threshold = 0
+        arr = af[name]
+        item = arr[key]
+        assert arr._array is None
+        assert_array_equal(item, arrs[name][key])
+        assert np.shape(item) == np.shape(arrs[name][key])
+        if isinstance(item, np.ndarray):
+            assert not item.flags.writeable
+
+        # unsupported keys read the whole array
+        assert_array_equal(arr[[0, 1]], arrs[name][[0, 1]])
+        assert arr._array is not None
+
+    with asdf.config_context() as config, asdf.open(file_path, mode="rw", lazy_load=True, memmap=False) as af:
+        config.partial_read_threshold = 0
+        # the array data might be modified, don't read it partially
+        arr = af[name]
+        assert_array_equal(arr[key], arrs[name][key])
+        assert arr._array is not None or arrs[name][key].size == 0
+
+
+@pytest.mark.parametrize("threshold", [None, 1024])
+def test_partial_read_threshold(tmp_path, threshold, monkeypatch):
+    """
+    Arrays smaller than partial_read_threshold (or all arrays if it
+    isn't set) are loaded when indexed and indexing returns views.
+    """
+    file_path = tmp_path / "test.asdf"
+    asdf.AsdfFile({"small": np.arange(100, dtype="f8"), "large": np.arange(1000, dtype="f8")}).write_to(file_path)
+
+    read_ranges = []
+    read_range = asdf._block.reader.ReadBlock.read_range
+
+    def counting_read_range(self, offset, size):
+        read_ranges.append((offset, size))
+        return read_range(self, offset, size)
+
+    monkeypatch.setattr(asdf._block.reader.ReadBlock, "read_range", counting_read_range)
+
+    with asdf.config_context() as config, asdf.open(file_path, lazy_load=True, memmap=False) as af:
+        config.partial_read_threshold = threshold
+        names = ["small", "large"] if threshold is None else ["small"]
+        for name in names:
+            arr = af[name]
+            item = arr[0:3]
+            assert arr._array is not None
+            assert item.flags.writeable
+            assert np.shares_memory(item, arr._make_array())
+            for i in range(len(arr)):
+                assert arr[i] == i
+        assert not read_ranges
+
+        if threshold is not None:
+            arr = af["large"]
+            item = arr[0:3]
+            assert arr._array is None
+            assert not item.flags.writeable
+            assert len(read_ranges) == 1
+            assert_array_equal(item, [0, 1, 2])
+
+
 @pytest.mark.parametrize(
     "lazy_load, array_class",
     (
@@ -4,6 +4,7 @@ import getpass
 import io
 import os
 import pathlib
+import subprocess
 import sys
 
 import numpy as np
@@ -598,3 +599,23 @@ def test_write_to_no_version_modification(tmp_path, valid_filename):
         return
     with asdf.open(fn) as af:
         assert af.version_string == "1.1.0"
+
+
+def test_lazy_import():
+    """
+    Check that ``import asdf`` defers importing the modules
+    behind the public API until they are used.
+    """
+    code = (
+        "import sys, asdf\n"
+        "assert 'asdf._asdf' not in sys.modules\n"
+        "assert 'yaml' not in sys.modules\n"
+        "assert asdf.AsdfFile.__module__ == 'asdf._asdf'\n"
+        "assert 'asdf.search' not in sys.modules\n"
+        "assert asdf.schema.__name__ == 'asdf.schema'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    assert set(asdf.__all__) <= set(dir(asdf))
+    with pytest.raises(AttributeError, match=r"has no attribute 'missing'"):
+        asdf.missing
@@ -33,6 +33,48 @@ def test_external_block(tmp_path):
     assert "test0000.asdf" in os.listdir(tmp_path)
 
 
+@pytest.mark.parametrize("memmap", [True, False])
+def test_external_block_lazy(tmp_path, memmap):
+    fn = tmp_path / "test.asdf"
+    arrs = [np.arange(100, dtype="uint8") + i for i in range(3)]
+    asdf.AsdfFile({"arrs": arrs}).write_to(fn, all_array_storage="external")
+
+    with asdf.config_context() as config, asdf.open(fn, memmap=memmap) as af:
+        config.partial_read_threshold = 0
+        arr = af["arrs"][1]
+        # read the size and a slice without loading the data
+        assert arr.shape == (100,)
+        assert arr.nbytes == 100
+        np.testing.assert_array_equal(arr[10:20], arrs[1][10:20])
+        if not memmap:
+            # memory mapped arrays are not read partially
+            assert arr._array is None
+            assert af._blocks._external_block_cache._cache == {}
+
+        af.prefetch_external_blocks(workers=2)
+        assert len(af._blocks._external_block_cache._cache) == 3
+        for arr, expected in zip(af["arrs"], arrs):
+            np.testing.assert_array_equal(arr, expected)
+        files = list(af._blocks._external_block_cache._files.values())
+    assert all(f._closed for f in files)
+
+
+def test_external_block_memory_budget(tmp_path):
+    fn = tmp_path / "test.asdf"
+    arrs = [np.arange(100, dtype="uint8") + i for i in range(3)]
+    asdf.AsdfFile({"arrs": arrs}).write_to(fn, all_array_storage="external")
+
+    with asdf.config_context() as cfg:
+        cfg.external_block_memory_budget = 150
+        with asdf.open(fn) as af:
+            for arr, expected in zip(af["arrs"], arrs):
+                np.testing.assert_array_equal(arr, expected)
+                # the data is held by the cache, not the array
+                assert arr._array is None
+            assert len(af._blocks._external_block_cache._cache) == 1
+            np.testing.assert_array_equal(af["arrs"][0] + 1, arrs[1])
+
+
 def test_external_block_url():
     uri = "asdf://foo"
     my_array = RNG.normal(size=(8, 8))
@@ -377,6 +419,26 @@ def test_update_add_array(tmp_path, lazy_load, memmap):
         assert_array_equal(ff.tree["arrays"][3], np.arange(32))
 
 
+@pytest.mark.parametrize("memmap", [True, False])
+def test_update_add_array_pad_blocks(tmp_path, memmap):
+    """
+    The padding of moved blocks should not contain parts of the
+    old file (like the old block index).
+    """
+    path = tmp_path / "test.asdf"
+    asdf.AsdfFile({"x": np.arange(3.0), "y": np.arange(3)}).write_to(path, pad_blocks=True)
+
+    with asdf.open(path, memmap=memmap, mode="rw") as ff:
+        ff["z"] = np.arange(4)
+        ff.update(pad_blocks=True)
+
+    # a stale block index would fail to parse (and warn)
+    with asdf.open(path, validate_checksums=True) as ff:
+        assert_array_equal(ff["x"], np.arange(3.0))
+        assert_array_equal(ff["y"], np.arange(3))
+        assert_array_equal(ff["z"], np.arange(4))
+
+
 @pytest.mark.parametrize("lazy_load", [True, False])
 @pytest.mark.parametrize("memmap", [True, False])
 def test_update_add_array_at_end(tmp_path, lazy_load, memmap):
@@ -453,6 +515,191 @@ def test_update_array_in_place(tmp_path, lazy_load, memmap):
         assert_array_equal(ff.tree["my_array"], np.ones((64, 64)) * 2)
 
 
+@pytest.mark.parametrize("lazy_load", [True, False])
+@pytest.mark.parametrize("memmap", [True, False])
+def test_update_tree_only(tmp_path, lazy_load, memmap, monkeypatch):
+    """
+    If the new tree fits in the padding before the first block and
+    the blocks are unchanged, update should only rewrite the tree.
+    """
+    testpath = tmp_path / "test.asdf"
+    my_array = np.arange(64) * 1
+    my_array2 = np.arange(64) * 2
+    asdf.AsdfFile({"arrays": [my_array, my_array2], "meta": "a"}).write_to(testpath, pad_blocks=True)
+    file_size = os.path.getsize(testpath)
+
+    with asdf.open(testpath, lazy_load=lazy_load, memmap=memmap, mode="rw") as af:
+        block_offsets = [blk.offset for blk in af._blocks.blocks]
+
+        def no_block_writes(*args, **kwargs):
+            raise AssertionError("blocks should not be written")
+
+        monkeypatch.setattr(asdf._block.writer, "write_blocks", no_block_writes)
+        af["meta"] = "b" * 100
+        af.update()
+        monkeypatch.undo()
+
+        assert [blk.offset for blk in af._blocks.blocks] == block_offsets
+        assert_array_equal(af["arrays"][0], my_array)
+        assert_array_equal(af["arrays"][1], my_array2)
+
+    assert os.path.getsize(testpath) == file_size
+    with asdf.open(testpath, validate_checksums=True) as af:
+        assert af["meta"] == "b" * 100
+        assert_array_equal(af["arrays"][0], my_array)
+        assert_array_equal(af["arrays"][1], my_array2)
+
+
+@pytest.mark.parametrize("memmap", [True, False])
+def test_append_rows(tmp_path, memmap, monkeypatch):
+    """
+    Rows that fit in the space allocated for a block (or appended
+    to the last block) should be written without rewriting the file.
+    """
+    testpath = tmp_path / "test.asdf"
+    x = np.arange(30, dtype=np.float64).reshape(10, 3)
+    y = np.arange(10, dtype=np.int16)
+    asdf.AsdfFile({"x": x, "y": y}).write_to(testpath, pad_blocks=True)
+
+    with asdf.open(testpath, memmap=memmap, mode="rw") as af:
+        block_offsets = [blk.offset for blk in af._blocks.blocks]
+        allocated_size = af._blocks.blocks[0].header["allocated_size"]
+
+        def no_block_writes(*args, **kwargs):
+            raise AssertionError("blocks should not be written")
+
+        monkeypatch.setattr(asdf._block.writer, "write_blocks", no_block_writes)
+        af.append_rows("x", [1, 2, 3])
+        af.append_rows(["x"], np.zeros((2, 3), dtype=np.float32))
+        # the last block can grow past the space allocated for it
+        n = af._blocks.blocks[1].header["allocated_size"]
+        af.append_rows("y", np.arange(n, dtype=np.int16))
+        monkeypatch.undo()
+
+        assert [blk.offset for blk in af._blocks.blocks] == block_offsets
+        assert af._blocks.blocks[0].header["allocated_size"] == allocated_size
+        assert af["x"].shape == (13, 3)
+        assert_array_equal(af["x"][10:], [[1, 2, 3], [0, 0, 0], [0, 0, 0]])
+        assert af["y"].shape == (10 + n,)
+
+    with asdf.open(testpath, validate_checksums=True) as af:
+        assert_array_equal(af["x"], np.concatenate([x, [[1, 2, 3], [0, 0, 0], [0, 0, 0]]]))
+        assert_array_equal(af["y"], np.concatenate([y, np.arange(n, dtype=np.int16)]))
+        assert len(af._blocks.blocks) == 2
+
+
+def test_append_rows_reallocate(tmp_path):
+    """
+    The file is rewritten (with padding) when the space allocated
+    for a block runs out.
+    """
+    testpath = tmp_path / "test.asdf"
+    x = np.arange(10, dtype=np.uint8)
+    asdf.AsdfFile({"x": x, "y": np.arange(10)}).write_to(testpath)
+
+    rows = np.arange(100, dtype=np.uint8)
+    with asdf.open(testpath, mode="rw") as af:
+        af.append_rows("x", rows)
+        assert af._blocks.blocks[0].header["allocated_size"] > 110
+
+    with asdf.open(testpath) as af:
+        assert_array_equal(af["x"], np.concatenate([x, rows]))
+        assert_array_equal(af["y"], np.arange(10))
+
+
+def test_append_rows_tree_changes(tmp_path, monkeypatch):
+    """
+    Other changes to the tree are written with the appended rows.
+    """
+    testpath = tmp_path / "test.asdf"
+    x = np.arange(6, dtype=np.float64).reshape(2, 3)
+    asdf.AsdfFile({"x": x, "y": np.arange(3), "meta": 1}).write_to(testpath, pad_blocks=True)
+
+    with asdf.open(testpath, mode="rw") as af:
+
+        def no_block_writes(*args, **kwargs):
+            raise AssertionError("blocks should not be written")
+
+        monkeypatch.setattr(asdf._block.writer, "write_blocks", no_block_writes)
+        af["meta"] = 2
+        af["new"] = {"a": [1, 2]}
+        af.append_rows("x", [6, 7, 8])
+        monkeypatch.undo()
+
+    with asdf.open(testpath) as af:
+        assert af["meta"] == 2
+        assert af["new"] == {"a": [1, 2]}
+        assert_array_equal(af["x"], np.arange(9).reshape(3, 3))
+        assert_array_equal(af["y"], np.arange(3))
+
+
+@pytest.mark.parametrize("change", ["new", "loaded", "removed"])
+def test_append_rows_array_changes(tmp_path, change):
+    """
+    Changes to array data in the tree cause the file to be rewritten.
+    """
+    testpath = tmp_path / "test.asdf"
+    asdf.AsdfFile({"x": np.arange(3.0), "y": np.arange(3)}).write_to(testpath, pad_blocks=True)
+
+    with asdf.open(testpath, mode="rw", memmap=False) as af:
+        if change == "new":
+            af["z"] = np.arange(4)
+        elif change == "loaded":
+            af["y"][0] = 10
+        else:
+            del af["y"]
+        af.append_rows("x", 3)
+
+    with asdf.open(testpath) as af:
+        assert_array_equal(af["x"], np.arange(4.0))
+        if change == "new":
+            assert_array_equal(af["z"], np.arange(4))
+        elif change == "loaded":
+            assert_array_equal(af["y"], [10, 1, 2])
+        else:
+            assert "y" not in af
+            assert len(af._blocks.blocks) == 1
+
+
+def test_append_rows_unsigned(tmp_path):
+    """
+    Lists of (Python) ints can be appended to unsigned arrays.
+    """
+    testpath = tmp_path / "test.asdf"
+    asdf.AsdfFile({"a": np.arange(3, dtype=np.uint16)}).write_to(testpath, pad_blocks=True)
+
+    with asdf.open(testpath, mode="rw") as af:
+        af.append_rows("a", [1, 2, 3])
+        af.append_rows("a", 4)
+        with pytest.raises(TypeError, match=r"Cannot cast int64 values to uint16, the values are out of range"):
+            af.append_rows("a", [-1])
+
+    with asdf.open(testpath) as af:
+        assert af["a"].dtype == np.uint16
+        assert_array_equal(af["a"], [0, 1, 2, 1, 2, 3, 4])
+
+
+def test_append_rows_errors(tmp_path):
+    testpath = tmp_path / "test.asdf"
+    asdf.AsdfFile({"x": np.zeros((3, 2)), "i": np.zeros(3, np.int32), "s": 1, "a": np.array(1)}).write_to(testpath)
+
+    with asdf.open(testpath) as af:
+        with pytest.raises(OSError, match=r"Can not update, since associated file is read-only"):
+            af.append_rows("x", [1, 2])
+
+    with asdf.open(testpath, mode="rw") as af:
+        with pytest.raises(ValueError, match=r"Expected rows with shape \(2,\)"):
+            af.append_rows("x", [1, 2, 3])
+        with pytest.raises(TypeError, match=r"Cannot cast"):
+            af.append_rows("i", [1.9, 2.9])
+        with pytest.raises(TypeError, match=r"Cannot cast int64 values to int32, the values are out of range"):
+            af.append_rows("i", [2**40])
+        with pytest.raises(TypeError, match=r"Expected an array"):
+            af.append_rows("s", 1)
+        with pytest.raises(ValueError, match=r"Can not append rows to an array with shape \(\)"):
+            af.append_rows("a", 1)
+
+
 @pytest.mark.parametrize("lazy_load", [True, False])
 @pytest.mark.parametrize("memmap", [True, False])
 def test_update_compressed_blocks(tmp_path, lazy_load, memmap):
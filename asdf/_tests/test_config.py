@@ -109,6 +109,70 @@ def test_array_inline_threshold():
         assert get_config().array_inline_threshold is None
 
 
+def test_validation_cache_size():
+    with asdf.config_context() as config:
+        assert config.validation_cache_size == asdf.config.DEFAULT_VALIDATION_CACHE_SIZE
+        config.validation_cache_size = 100
+        assert get_config().validation_cache_size == 100
+        config.validation_cache_size = 0
+        assert get_config().validation_cache_size == 0
+        with pytest.raises(ValueError, match=r"Invalid value for validation_cache_size"):
+            config.validation_cache_size = -1
+
+
+def test_lazy_tree_memory_budget():
+    with asdf.config_context() as config:
+        assert config.lazy_tree_memory_budget == asdf.config.DEFAULT_LAZY_TREE_MEMORY_BUDGET
+        config.lazy_tree_memory_budget = 1024
+        assert get_config().lazy_tree_memory_budget == 1024
+        config.lazy_tree_memory_budget = None
+        assert get_config().lazy_tree_memory_budget is None
+        with pytest.raises(ValueError, match=r"Invalid value for lazy_tree_memory_budget"):
+            config.lazy_tree_memory_budget = -1
+
+
+def test_external_file_cache_size():
+    with asdf.config_context() as config:
+        assert config.external_file_cache_size == asdf.config.DEFAULT_EXTERNAL_FILE_CACHE_SIZE
+        config.external_file_cache_size = 8
+        assert get_config().external_file_cache_size == 8
+        config.external_file_cache_size = None
+        assert get_config().external_file_cache_size is None
+        with pytest.raises(ValueError, match=r"Invalid value for external_file_cache_size"):
+            config.external_file_cache_size = 0
+
+
+def test_external_block_memory_budget():
+    with asdf.config_context() as config:
+        assert config.external_block_memory_budget == asdf.config.DEFAULT_EXTERNAL_BLOCK_MEMORY_BUDGET
+        config.external_block_memory_budget = 1024
+        assert get_config().external_block_memory_budget == 1024
+        config.external_block_memory_budget = None
+        assert get_config().external_block_memory_budget is None
+        with pytest.raises(ValueError, match=r"Invalid value for external_block_memory_budget"):
+            config.external_block_memory_budget = -1
+
+
+def test_partial_read_threshold():
+    with asdf.config_context() as config:
+        assert config.partial_read_threshold == asdf.config.DEFAULT_PARTIAL_READ_THRESHOLD
+        config.partial_read_threshold = 1024
+        assert get_config().partial_read_threshold == 1024
+        config.partial_read_threshold = None
+        assert get_config().partial_read_threshold is None
+        with pytest.raises(ValueError, match=r"Invalid value for partial_read_threshold"):
+            config.partial_read_threshold = -1
+
+
+def test_schema_cache_dir(tmp_path):
+    with asdf.config_context() as config:
+        assert config.schema_cache_dir == asdf.config.DEFAULT_SCHEMA_CACHE_DIR
+        config.schema_cache_dir = tmp_path
+        assert get_config().schema_cache_dir == str(tmp_path)
+        config.schema_cache_dir = None
+        assert get_config().schema_cache_dir is None
+
+
 def test_all_array_storage():
     with asdf.config_context() as config:
         assert config.all_array_storage == asdf.config.DEFAULT_ALL_ARRAY_STORAGE
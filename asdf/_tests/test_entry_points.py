@@ -1,11 +1,13 @@
 import sys
+from unittest import mock
 
 import pytest
 
 from asdf import _entry_points
 from asdf._version import version as asdf_package_version
 from asdf.exceptions import AsdfWarning
-from asdf.extension import ExtensionProxy
+from asdf.extension import ExtensionManager, ExtensionProxy
+from asdf.extension._extension import _DeferredExtensionProxy, _get_extension_index
 from asdf.resource import ResourceMappingProxy
 
 # The standard library importlib.metadata returns duplicate entrypoints
@@ -172,3 +174,154 @@ def test_get_extensions(mock_entry_points):
     with pytest.warns(AsdfWarning, match=r"TypeError"):
         extensions = _entry_points.get_extensions()
     assert len(extensions) == 0
+
+
+class IndexedConverter:
+    tags = ["asdf://somewhere.org/tags/indexed-*"]
+    types = ["asdf._tests.test_entry_points.IndexedType"]
+
+    def to_yaml_tree(self, obj, tag, ctx):
+        return {}
+
+    def from_yaml_tree(self, node, tag, ctx):
+        return IndexedType()
+
+
+class IndexedType:
+    pass
+
+
+class IndexedExtension:
+    extension_uri = "asdf://somewhere.org/extensions/indexed-1.0"
+    tags = ["asdf://somewhere.org/tags/indexed-1.0"]
+    converters = [IndexedConverter()]
+
+
+_indexed_entry_point_calls = []
+
+
+def extensions_entry_point_indexed():
+    _indexed_entry_point_calls.append(None)
+    return [IndexedExtension()]
+
+
+def test_get_extensions_indexed(mock_entry_points, tmp_path):
+    mock_entry_points.append(
+        ("asdf.extensions", "indexed", "asdf._tests.test_entry_points:extensions_entry_point_indexed"),
+    )
+    _indexed_entry_point_calls.clear()
+
+    # the first call loads the entry point and writes the index
+    (extension,) = _entry_points.get_extensions(tmp_path)
+    assert not isinstance(extension, _DeferredExtensionProxy)
+    assert len(_indexed_entry_point_calls) == 1
+
+    # later calls use the index and do not load the entry point
+    (extension,) = _entry_points.get_extensions(tmp_path)
+    assert isinstance(extension, _DeferredExtensionProxy)
+    assert extension.extension_uri == IndexedExtension.extension_uri
+    assert extension.package_name == "asdf"
+    assert [t.tag_uri for t in extension.tags] == IndexedExtension.tags
+    assert extension.validators == []
+    assert extension.compressors == []
+
+    manager = ExtensionManager([extension])
+    assert manager.handles_tag("asdf://somewhere.org/tags/indexed-1.0")
+    assert manager.handles_type(IndexedType)
+    assert len(_indexed_entry_point_calls) == 1
+
+    # the entry point is loaded once a converter is needed
+    converter = manager.get_converter_for_tag("asdf://somewhere.org/tags/indexed-1.0")
+    assert len(_indexed_entry_point_calls) == 2
+    assert isinstance(converter.delegate, IndexedConverter)
+    assert converter.extension is extension
+    assert manager.get_converter_for_type(IndexedType) is converter
+    assert isinstance(extension.delegate, IndexedExtension)
+    assert len(_indexed_entry_point_calls) == 2
+
+
+def test_get_extensions_indexed_failing(mock_entry_points, tmp_path):
+    mock_entry_points.append(
+        ("asdf.extensions", "indexed", "asdf._tests.test_entry_points:extensions_entry_point_indexed"),
+    )
+    _entry_points.get_extensions(tmp_path)
+    (extension,) = _entry_points.get_extensions(tmp_path)
+
+    # an extension that fails to load provides no converters
+    manager = ExtensionManager([extension])
+    with mock.patch.object(metadata.EntryPoint, "load", side_effect=Exception("NOPE")):
+        with pytest.warns(AsdfWarning, match=r"Exception: NOPE"):
+            with pytest.raises(KeyError, match=r"No support available for YAML tag"):
+                manager.get_converter_for_tag("asdf://somewhere.org/tags/indexed-1.0")
+    assert not manager.handles_tag("asdf://somewhere.org/tags/indexed-1.0")
+
+
+def test_get_extensions_indexed_reinstalled(mock_entry_points, tmp_path, monkeypatch):
+    mock_entry_points.append(
+        ("asdf.extensions", "indexed", "asdf._tests.test_entry_points:extensions_entry_point_indexed"),
+    )
+    _entry_points.get_extensions(tmp_path)
+    (extension,) = _entry_points.get_extensions(tmp_path)
+    assert isinstance(extension, _DeferredExtensionProxy)
+
+    # reinstalling the package (changing the metadata) invalidates the index
+    monkeypatch.setattr(_entry_points, "_get_distribution_mtime", lambda dist: 1)
+    (extension,) = _entry_points.get_extensions(tmp_path)
+    assert not isinstance(extension, _DeferredExtensionProxy)
+    (extension,) = _entry_points.get_extensions(tmp_path)
+    assert isinstance(extension, _DeferredExtensionProxy)
+
+    # editable installs are not indexed
+    monkeypatch.setattr(_entry_points, "_get_distribution_mtime", lambda dist: None)
+    for _ in range(2):
+        (extension,) = _entry_points.get_extensions(tmp_path)
+        assert not isinstance(extension, _DeferredExtensionProxy)
+
+
+def test_get_distribution_mtime(tmp_path):
+    class Distribution:
+        def __init__(self, path, direct_url=None):
+            self._path = path
+            self._direct_url = direct_url
+
+        def read_text(self, filename):
+            return self._direct_url
+
+    path = tmp_path / "foo-1.0.dist-info"
+    path.mkdir()
+    assert _entry_points._get_distribution_mtime(Distribution(path)) == path.stat().st_mtime_ns
+    direct_url = '{"url": "file:///foo", "dir_info": {}}'
+    assert _entry_points._get_distribution_mtime(Distribution(path, direct_url)) == path.stat().st_mtime_ns
+
+    direct_url = '{"url": "file:///foo", "dir_info": {"editable": true}}'
+    assert _entry_points._get_distribution_mtime(Distribution(path, direct_url)) is None
+    assert _entry_points._get_distribution_mtime(Distribution(tmp_path / "missing")) is None
+
+
+class StaleExtension:
+    extension_uri = IndexedExtension.extension_uri
+    tags = IndexedExtension.tags
+    converters = []
+
+
+def test_stale_extension_index():
+    tag = "asdf://somewhere.org/tags/indexed-1.0"
+    index = _get_extension_index(ExtensionProxy(IndexedExtension()))
+    # the installed extension no longer supports the indexed tag
+    extension = _DeferredExtensionProxy(StaleExtension, index)
+    fallback = ExtensionProxy(IndexedExtension())
+
+    manager = ExtensionManager([extension, fallback])
+    other_manager = ExtensionManager([extension])
+    assert manager.handles_tag(tag)
+    assert other_manager.handles_tag(tag)
+    assert not extension._loaded
+
+    # the tag is handled by the next extension that supports it
+    assert manager.get_converter_for_tag(tag).extension is fallback
+    assert manager.handles_tag(tag)
+
+    # once loaded, the extension no longer handles the tag
+    assert not other_manager.handles_tag(tag)
+    with pytest.raises(KeyError, match=r"No support available for YAML tag"):
+        other_manager.get_converter_for_tag(tag)
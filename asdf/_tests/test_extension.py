@@ -1,7 +1,10 @@
 import collections
 import fractions
+import gc
 import sys
+import weakref
 
+import numpy as np
 import pytest
 from packaging.specifiers import SpecifierSet
 
@@ -1050,6 +1053,36 @@ def test_extension_converter_by_class_path():
         assert isinstance(converter.delegate, MailboxConverter)
 
 
+def test_converter_for_type_cached(monkeypatch):
+    extension_manager = AsdfFile().extension_manager
+
+    calls = []
+    index_converters = extension_manager._index_converters
+
+    def counting_index_converters():
+        calls.append(None)
+        index_converters()
+
+    monkeypatch.setattr(extension_manager, "_index_converters", counting_index_converters)
+
+    class Unsupported:
+        pass
+
+    for _ in range(3):
+        assert not extension_manager.handles_type(Unsupported)
+        assert extension_manager.get_converter_for_type(np.ndarray) is extension_manager.get_converter_for_type(
+            np.ndarray
+        )
+    # the miss is only indexed once
+    assert len(calls) == 1
+
+    # the cache doesn't keep classes alive
+    ref = weakref.ref(Unsupported)
+    del Unsupported
+    gc.collect()
+    assert ref() is None
+
+
 def test_named_tuple_extension():
     Point = collections.namedtuple("Point", ["x", "y"])
 
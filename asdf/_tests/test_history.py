@@ -59,6 +59,32 @@ def test_history_to_file(tmp_path):
         assert entries[0]["software"]["name"] == "my_tool"
 
 
+def test_write_does_not_modify_history(tmp_path):
+    file_path = tmp_path / "history.asdf"
+
+    af = asdf.AsdfFile(version="1.6.0")
+    af.add_history_entry("This happened")
+    history = af.tree["history"]
+    entries = history["entries"]
+    entry = entries[0]
+    af["history"]["extensions"] = []
+    extensions = history["extensions"]
+
+    af.write_to(file_path)
+
+    # the history should not be copied or modified in the written tree
+    assert af.tree["history"] is history
+    assert history["entries"] is entries
+    assert entries[0] is entry
+    assert history["extensions"] is extensions
+    assert extensions == []
+
+    with asdf.open(file_path) as af:
+        assert len(af["history"]["entries"]) == 1
+        assert af["history"]["entries"][0]["description"] == "This happened"
+        assert len(af["history"]["extensions"]) == 1
+
+
 def test_old_history():
     """Make sure that old versions of the history format are still accepted"""
 
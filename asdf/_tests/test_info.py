@@ -608,6 +608,40 @@ def test_schema_info_support(tmp_path):
         }
 
 
+def test_schema_info_cached(tmp_path, monkeypatch):
+    """
+    Schema lookups are made once per distinct schema and property
+    rather than once per node.
+    """
+    calls = {"load_schema": 0, "subschema": 0}
+
+    def counted(name, function):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(asdf._node_info, "load_schema", counted("load_schema", asdf._node_info.load_schema))
+    monkeypatch.setattr(
+        asdf._node_info,
+        "_get_subschema_for_property",
+        counted("subschema", asdf._node_info._get_subschema_for_property),
+    )
+
+    with manifest_extension(tmp_path):
+        af = asdf.AsdfFile()
+        af.tree = {"drinks": [ObjectWithInfoSupport3(f"a{i}", f"b{i}") for i in range(100)]}
+
+        info = af.schema_info("title")
+        assert len(info["drinks"]) == 100
+        assert info["drinks"][-1]["attributeTwo"] == {"title": ("AttributeTwo Title", "b99")}
+
+    assert calls["load_schema"] == 1
+    # 2 properties, each also looked up in the allOf of the drink schema
+    assert calls["subschema"] == 4
+
+
 def test_info_object_support(capsys, tmp_path):
     with manifest_extension(tmp_path):
         af = asdf.AsdfFile()
@@ -832,6 +866,56 @@ def test_info_no_infinite_loop(capsys):
     assert "recursive" in captured.out
 
 
+@pytest.mark.parametrize("max_rows", [None, 0, 1, 2, 3, 5, 8, 24, (), (2,), (1, 3), (3, None, 2), (None, 1)])
+def test_info_max_rows_matches_full_tree(max_rows):
+    """
+    Building only the visible part of the tree renders the same
+    lines as marking the visible nodes of the full tree.
+    """
+    shared = {"x": 1, "y": [1, 2, 3]}
+    tree = {
+        "a": {"b": list(range(10)), "c": shared, "d": {}},
+        "e": [shared, {"f": "g"}, []],
+        "h": "i",
+    }
+    tree["e"].append(tree["e"])
+    renderer = asdf._display._TreeRenderer(max_rows, None, True)
+    expected = renderer.render(asdf._node_info.create_tree("title", tree))
+    assert asdf._display.render_tree(tree, max_rows=max_rows, max_cols=None) == expected
+
+
+def test_info_max_rows_bounds_tree():
+    """
+    Only the visible nodes of a large tree are created.
+    """
+    tree = {"a": list(range(100_000)), "b": {"c": list(range(100_000))}}
+
+    def count(info):
+        return 1 + sum(count(child) for child in info.children)
+
+    for max_rows in (24, (3, 3)):
+        info = asdf._node_info.create_tree("title", tree, max_rows=max_rows)
+        assert count(info) <= 24
+
+    lines = asdf._display.render_tree(tree, max_rows=6)
+    assert len(lines) == 6
+    assert "99999 not shown" in lines[3]
+
+
+def test_info_max_rows_lazy_tree(tmp_path):
+    """
+    Hidden nodes of a lazy tree are not converted.
+    """
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile({"a": [1j * i for i in range(100)]}).write_to(fn)
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree = True
+        with asdf.open(fn) as af:
+            af.info(max_rows=(None, 3))
+            converted = [not isinstance(v, asdf.tagged.Tagged) for v in af["a"].data]
+            assert sum(converted) == 2
+
+
 def _get_block_output(capsys, af, *args, **kwargs) -> str:
     """Passes provided arguments to both `asdf.info` and `AsdfFile.info` and verifies the outputs match.
 
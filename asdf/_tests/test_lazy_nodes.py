@@ -5,6 +5,7 @@ import weakref
 
 import numpy as np
 import pytest
+from numpy.testing import assert_array_equal
 
 import asdf
 from asdf.lazy_nodes import AsdfDictNode, AsdfListNode, AsdfOrderedDictNode, _resolve_af_ref, _to_lazy_node
@@ -133,10 +134,8 @@ def test_node_empty_init(NodeClass, base):
 @pytest.mark.parametrize("copy_operation", [copy.copy, copy.deepcopy])
 def test_copy(node, base_type, copy_operation):
     copied_node = copy_operation(node)
-    if copy_operation is copy.copy:
-        assert type(copied_node) is type(node)
-    else:
-        assert type(copied_node) is base_type
+    assert type(copied_node) is type(node)
+    assert copied_node.data is not node.data
     assert copied_node == node
 
 
@@ -434,3 +433,195 @@ def test_lazy_copy(tmp_path):
     gc.collect(2)
     assert af2["a"]["b"] == obj
     assert af2["a"]["c"]["b"] is af2["a"]["b"]
+
+
+def _assert_materialized(node):
+    for _, value in node.raw_items():
+        if isinstance(value, (asdf.tagged.TaggedDict, asdf.tagged.TaggedList)) and isinstance(
+            value.data, asdf.lazy_nodes._AsdfNode
+        ):
+            value = value.data
+        assert not isinstance(value, asdf.tagged.Tagged)
+        assert type(value) not in (dict, list)
+        if isinstance(value, asdf.lazy_nodes._AsdfNode):
+            _assert_materialized(value)
+
+
+def test_materialize(tmp_path, lazy_test_class):
+    arr = np.arange(3)
+    shared = lazy_test_class({"x": 1})
+    tree = {
+        "objs": [lazy_test_class({"i": i}) for i in range(20)],
+        "nested": {"a": [shared, {"b": shared}]},
+        "arr": arr,
+        "same_arr": arr,
+    }
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True) as af:
+        af.materialize(workers=4)
+        _assert_materialized(af.tree.data)
+
+        assert [obj.data["i"] for obj in af["objs"]] == list(range(20))
+        assert af["nested"]["a"][0] is af["nested"]["a"][1]["b"]
+        assert af["arr"] is af["same_arr"]
+        np.testing.assert_array_equal(af["arr"], arr)
+
+
+def test_raw_items(tmp_path, lazy_test_class):
+    tree = {"a": [lazy_test_class({"i": 1}), {"b": 2}], "c": lazy_test_class({"i": 3}), "d": 4}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    tag = "asdf://somewhere.org/tags/foo-1.0.0"
+    with asdf.open(fn, lazy_tree=True) as af:
+        node = af.tree.data
+        items = dict(node.raw_items())
+        assert isinstance(items["c"], asdf.tagged.TaggedDict)
+        assert type(items["a"]) is list
+        assert items["d"] == 4
+        assert node.get_tag("c") == tag
+        assert node.get_tag("a") is None
+        assert node.get_tag("d") is None
+
+        # structural traversal doesn't convert anything
+        assert isinstance(node.data["c"], asdf.tagged.TaggedDict)
+        assert type(node.data["a"]) is list
+
+        # the tag is also available after conversion
+        assert isinstance(af["c"], lazy_test_class)
+        assert node.get_tag("c") == tag
+
+        list_node = af["a"]
+        assert list(list_node.raw_items())[1] == (1, {"b": 2})
+        assert list_node.get_tag(0) == tag
+        assert isinstance(list_node[0], lazy_test_class)
+        assert list_node.get_tag(0) == tag
+
+
+def test_lazy_deepcopy(tmp_path, lazy_test_class):
+    shared = lazy_test_class({"i": 1})
+    tree = {"a": {"b": shared, "c": [shared]}}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True) as af:
+        node = af["a"]
+        copied = copy.deepcopy(node)
+        assert type(copied) is type(node)
+        # nothing was converted by the copy
+        assert isinstance(node.data["b"], asdf.tagged.TaggedDict)
+        assert isinstance(copied.data["b"], asdf.tagged.TaggedDict)
+        assert copied.data["b"] is not node.data["b"]
+        # shared references are preserved in the copy
+        assert copied.data["b"] is copied.data["c"][0]
+        assert copied["b"] is copied["c"][0]
+        assert copied["b"] is not node["b"]
+        assert copied["b"].data == node["b"].data
+
+
+def test_memory_budget(tmp_path):
+    tree = {"arrs": [np.full(100, i, dtype="uint8") for i in range(10)]}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree_memory_budget = 250
+        with asdf.open(fn, lazy_tree=True, lazy_load=False) as af:
+            cache = af._tagged_object_cache
+            arrs = af["arrs"]
+            refs = []
+            for i in range(10):
+                arr = arrs[i]
+                assert arr[0] == i
+                refs.append(weakref.ref(arr))
+                del arr
+                # the tagged node is kept in the tree
+                assert isinstance(arrs.data[i], asdf.tagged.TaggedDict)
+                assert cache._held_nbytes <= 250
+            gc.collect(2)
+            # only the most recently used arrays are held
+            assert [ref() is None for ref in refs] == [True] * 8 + [False] * 2
+            # an evicted array is converted again
+            assert arrs[0][0] == 0
+            # a held array is returned from the cache
+            assert arrs[9] is refs[9]()
+
+
+def test_memory_budget_releases_block_data(tmp_path):
+    """
+    The (lazy loaded) block data of evicted arrays is released.
+    """
+    tree = {"arrs": [np.full(1000, i, dtype="uint8") for i in range(10)]}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree_memory_budget = 2500
+        with asdf.open(fn, lazy_tree=True, lazy_load=True, memmap=False) as af:
+            cache = af._tagged_object_cache
+            arrs = af["arrs"]
+            n_keys = len(cache._keys_by_object)
+            for i in range(10):
+                assert arrs[i][0] == i
+            gc.collect(2)
+            blocks = af._blocks.blocks
+            assert [blk._cached_data is None for blk in blocks] == [True] * 8 + [False] * 2
+            # only the held arrays are kept in the cache
+            assert len(cache._keys_by_object) <= n_keys + 2
+            # an evicted array reads the block again
+            assert_array_equal(arrs[0], tree["arrs"][0])
+            assert blocks[0]._cached_data is not None
+
+
+def test_materialize_paths(tmp_path, lazy_test_class):
+    tree = {"a": {"b": [lazy_test_class({"i": 1}), lazy_test_class({"i": 2})]}, "c": [lazy_test_class({"i": 3})]}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True) as af:
+        af.materialize(paths=["a.b.1", ("c",)])
+        b = af.tree.data.data["a"].data["b"].data
+        assert isinstance(b[1], lazy_test_class)
+        # other nodes are untouched
+        assert isinstance(b[0], asdf.tagged.Tagged)
+        _assert_materialized(af.tree.data.data["c"])
+
+
+def test_materialize_config(tmp_path):
+    class Failing:
+        pass
+
+    tag_uri = "asdf://somewhere.org/tags/failing-1.0.0"
+
+    class FailingConverter:
+        tags = [tag_uri]
+        types = [Failing]
+
+        def to_yaml_tree(self, obj, tag, ctx):
+            return {}
+
+        def from_yaml_tree(self, node, tag, ctx):
+            msg = "NOPE"
+            raise ValueError(msg)
+
+    class FailingExtension:
+        extension_uri = "asdf://somewhere.org/extensions/failing-1.0.0"
+        converters = [FailingConverter()]
+        tags = [tag_uri]
+
+    with asdf.config_context() as cfg:
+        cfg.add_extension(FailingExtension())
+        fn = tmp_path / "test.asdf"
+        asdf.AsdfFile({"objs": [Failing() for _ in range(4)]}).write_to(fn)
+
+        with asdf.open(fn, lazy_tree=True) as af:
+            with pytest.raises(ValueError, match="NOPE"):
+                af.materialize(workers=2)
+
+            # the config of the calling thread is used by the workers
+            with asdf.config_context() as cfg:
+                cfg.warn_on_failed_conversion = True
+                with pytest.warns(asdf.exceptions.AsdfConversionWarning, match="NOPE"):
+                    af.materialize(workers=2)
@@ -112,6 +112,83 @@ def test_external_reference(tmp_path):
         assert_array_equal(ff.tree["internal"], exttree["cool_stuff"]["a"])
 
 
+def test_resolve_references_workers(tmp_path):
+    for i in range(5):
+        asdf.AsdfFile({"a": [i, i + 1]}).write_to(tmp_path / f"external{i}.asdf")
+
+    shared = {"$ref": "external0.asdf#/a"}
+    tree = {
+        "refs": [{"$ref": f"external{i}.asdf#/a"} for i in range(5)],
+        "nested": {"b": {"c": {"$ref": "external1.asdf#/a/1"}}},
+        "tuple": ({"$ref": "external2.asdf#/a/0"}, 3),
+        "shared": [shared, shared],
+    }
+    with asdf.AsdfFile(tree, uri=(tmp_path / "main.asdf").as_uri()) as ff:
+        ff.resolve_references(workers=3)
+        assert ff.tree["refs"] == [[i, i + 1] for i in range(5)]
+        assert ff.tree["nested"]["b"]["c"] == 2
+        assert ff.tree["tuple"] == (2, 3)
+        assert ff.tree["shared"] == [[0, 1], [0, 1]]
+        assert ff.tree["shared"][0] is ff.tree["shared"][1]
+        assert len(ff._external_asdf_by_uri) == 5
+
+
+def test_resolve_references_same_target(tmp_path, monkeypatch):
+    """
+    References to the same target (from different "$ref" nodes)
+    should only be resolved once.
+    """
+    asdf.AsdfFile({"a": [0, 1]}).write_to(tmp_path / "external.asdf")
+
+    resolved = []
+    get_target = reference.Reference._get_target
+
+    def counting_get_target(self, **kwargs):
+        resolved.append(self._uri)
+        return get_target(self, **kwargs)
+
+    monkeypatch.setattr(reference.Reference, "_get_target", counting_get_target)
+
+    tree = {
+        "a": {"$ref": "external.asdf#/a"},
+        "b": [{"$ref": "external.asdf#/a"}, {"$ref": f"{(tmp_path / 'external.asdf').as_uri()}#/a"}],
+        "c": {"$ref": "external.asdf#/a/1"},
+    }
+    with asdf.AsdfFile(tree, uri=(tmp_path / "main.asdf").as_uri()) as ff:
+        ff.resolve_references()
+        assert ff.tree["a"] == [0, 1]
+        assert ff.tree["b"][0] is ff.tree["a"]
+        assert ff.tree["b"][1] is ff.tree["a"]
+        assert ff.tree["c"] == 1
+        assert sorted(resolved) == ["external.asdf#/a", "external.asdf#/a/1"]
+
+
+def test_external_file_cache_size(tmp_path):
+    for i in range(3):
+        asdf.AsdfFile({"a": i}).write_to(tmp_path / f"external{i}.asdf")
+
+    with asdf.config_context() as config:
+        config.external_file_cache_size = 2
+        ff = asdf.AsdfFile({}, uri=(tmp_path / "main.asdf").as_uri())
+
+    with ff:
+        external0 = ff.open_external("external0.asdf")
+        external1 = ff.open_external("external1.asdf")
+        assert ff.open_external("external0.asdf") is external0
+        external2 = ff.open_external("external2.asdf")
+
+        # external1 was the least recently used
+        assert list(ff._external_asdf_by_uri.values()) == [external0, external2]
+        assert external1._closed
+        assert not external0._closed
+
+        assert ff.open_external("external1.asdf")["a"] == 1
+        assert external0._closed
+
+        # the locks used while opening the files are not kept
+        assert len(ff._external_asdf_opening_locks) == 0
+
+
 def test_external_reference_invalid(tmp_path, httpserver):
     tree = {"foo": {"$ref": "fail.asdf"}}
 
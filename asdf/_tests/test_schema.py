@@ -1,9 +1,12 @@
 import contextlib
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import numpy as np
 import pytest
+import yaml
 from numpy.testing import assert_array_equal
 
 import asdf
@@ -1128,3 +1131,289 @@ properties:
             # deserialized (but is still validated)
             with asdf.open(bio, custom_schema=schema_id, lazy_tree=True):
                 pass
+
+
+def test_validation_cache():
+    tag_uri = "asdf://somewhere.org/tags/foo-1.0.0"
+    schema_uri = "asdf://somewhere.org/schemas/foo-1.0.0"
+    tag_schema = f"""%YAML 1.1
+---
+$schema: http://stsci.edu/schemas/asdf/asdf-schema-1.1.0
+id: {schema_uri}
+type: object
+properties:
+  value:
+    type: integer
+counted: true
+...
+"""
+    visited = []
+
+    class CountingValidator(asdf.extension.Validator):
+        schema_property = "counted"
+        tags = [tag_uri]
+
+        def validate(self, expected, node, schema):
+            visited.append(node)
+            yield from []
+
+    class FooExtension:
+        extension_uri = "asdf://somewhere.org/extensions/foo-1.0.0"
+        tags = [TagDefinition(tag_uri, schema_uris=[schema_uri])]
+        validators = [CountingValidator()]
+
+    content = f"""
+a: !<{tag_uri}>
+  value: 1
+b: !<{tag_uri}>
+  value: 1
+c: !<{tag_uri}>
+  value: 2
+"""
+    invalid_content = f"""
+a: !<{tag_uri}>
+  value: foo
+"""
+
+    def _open(yaml):
+        with asdf.open(yaml_to_asdf(yaml), _force_raw_types=True) as af:
+            return af["a"]
+
+    def _n_cached():
+        return sum(key[2] == schema_uri for key in schema._validation_cache._entries)
+
+    schema._validation_cache.clear()
+    with config_context() as cfg:
+        cfg.add_extension(FooExtension())
+        cfg.add_resource_mapping({schema_uri: tag_schema})
+
+        # disabled by default
+        _open(content)
+        _open(content)
+        assert len(visited) == 6
+        assert _n_cached() == 0
+
+        cfg.validation_cache_size = 10
+        visited.clear()
+        _open(content)
+        assert len(visited) == 2
+        assert _n_cached() == 2
+
+        # the cache persists across files
+        visited.clear()
+        _open(content)
+        assert len(visited) == 0
+
+        # invalid subtrees are not cached
+        for _ in range(2):
+            with pytest.raises(ValidationError, match=r".* is not of type .*"):
+                _open(invalid_content)
+        assert _n_cached() == 2
+
+        # the cache is not used when writing
+        visited.clear()
+        af = asdf.AsdfFile()
+        af["a"] = tagged.TaggedDict({"value": 1}, tag_uri)
+        af.validate()
+        assert len(visited) == 1
+
+        # least recently used entries are evicted
+        cfg.validation_cache_size = 1
+        _open(content.replace("value: 1", "value: 3"))
+        assert len(schema._validation_cache) == 1
+        visited.clear()
+        _open(content)
+        assert len(visited) == 2
+        assert len(schema._validation_cache) == 1
+
+    schema._validation_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        {"a": 1, "b": ["x", "y"], "c": {"d": None}},
+        {"a": 1, "b": ["x", "y"]},
+        {"a": True, "b": ["x"]},
+        {"a": 1.5, "b": []},
+        {"a": 1, "b": ["x", 2]},
+        {"a": 1, "b": ["x"], "c": {"d": 1}},
+        {"a": 1, "b": ["x"], "c": {"d": "y", "e": {"d": None}}},
+        {"a": 1, "b": ["x"], "c": {"d": "y", "e": {"d": 2}}},
+        {"b": ["x"]},
+        {"a": 1, "b": ["x"], "f": datetime(2000, 1, 1)},
+        {"a": 1, "b": ["x"], "f": 1},
+        {"a": 1, "b": ["x"], "g": tagged.TaggedDict({}, "tag:nowhere.org:custom/foo-1.0.0")},
+        {"a": 1, "b": ["x"], "g": {}},
+        {"a": 1, "b": ["x"], "h": 3},
+        {"a": 1, "b": ["x"], "h": 4},
+        [1, 2],
+    ],
+)
+def test_compiled_schema(instance):
+    schema_uri = "asdf://somewhere.org/schemas/compiled-1.0.0"
+    schema_tree = {
+        "id": schema_uri,
+        "type": "object",
+        "required": ["a", "b"],
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {
+                    "d": {"anyOf": [{"type": "null"}, {"type": "string"}]},
+                    "e": {"$ref": "#/definitions/node"},
+                },
+            },
+        },
+        "properties": {
+            "a": {"type": ["integer", "number"], "not": {"type": "boolean"}},
+            "b": {"type": "array", "items": {"type": "string"}},
+            "c": {"allOf": [{"$ref": "#/definitions/node"}, {"type": "object"}]},
+            "f": {"type": "string", "format": "date-time"},
+            "g": {"tag": "tag:nowhere.org:custom/foo-*"},
+            "h": {"oneOf": [{"type": "integer", "minimum": 4}, {"type": "integer", "maximum": 3}]},
+        },
+    }
+    with config_context() as cfg:
+        cfg.add_resource_mapping({schema_uri: yaml.dump(schema_tree)})
+        schema_tree = schema.load_schema(schema_uri)
+        validator = schema.get_validator(schema_tree)
+        check = schema._SchemaCompiler(validator.VALIDATORS, validator.resolver, {}).compile(schema_tree)
+        assert check is not None
+        assert check(validator, instance, set()) is validator.is_valid(instance)
+
+
+def test_schema_registry_compile_threads():
+    """
+    Schemas compiled concurrently should all remain in the cache.
+    """
+    registry = schema._get_schema_registry()
+    validator = schema.get_validator({})
+    validator_class = type(validator)
+    schemas = [{"type": "object", "properties": {"a": {"minimum": i}}} for i in range(50)]
+
+    def _compile(schema_tree):
+        return registry.compile(validator_class, validator.VALIDATORS, validator.resolver, schema_tree)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        checks = list(executor.map(_compile, schemas))
+
+    assert all(check is not None for check in checks)
+    compiled = registry._compiled_schemas[validator_class]
+    assert all(id(schema_tree) in compiled for schema_tree in schemas)
+    assert all(_compile(schema_tree) is check for schema_tree, check in zip(schemas, checks))
+
+
+def test_validation_context_threads():
+    """
+    Validators in different threads should not share the validation context.
+    """
+    barrier = threading.Barrier(4)
+
+    def _validate(i):
+        validator = schema.get_validator({})
+        context = validator._context
+        assert validator.evolve(schema={})._context is context
+        barrier.wait()
+        af = asdf.AsdfFile({"obj": asdf.tags.core.Software(name=f"foo{i}", version="1.0")})
+        for _ in range(20):
+            af.validate()
+        af.tree["obj"]["name"] = i
+        with pytest.raises(ValidationError, match=r"is not of type 'string'"):
+            af.validate()
+        return context
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        contexts = list(executor.map(_validate, range(4)))
+
+    assert len({id(context) for context in contexts}) == 4
+
+
+def test_schema_registry_reused():
+    registry = schema._get_schema_registry()
+    assert schema._get_schema_registry() is registry
+
+    af = asdf.AsdfFile({"obj": asdf.tags.core.Software(name="foo")})
+    validator = schema.get_validator(ctx=af)
+    assert validator.schema_registry is registry
+    assert schema.get_validator(ctx=af).resolver is not validator.resolver
+
+    # schema documents are only loaded once
+    uri = "http://stsci.edu/schemas/asdf/core/software-1.0.0"
+    assert registry.load_document(uri) is registry.load_document(uri)
+
+    with config_context() as cfg:
+        assert schema._get_schema_registry() is registry
+        cfg.add_resource_mapping({"asdf://somewhere.org/schemas/foo": "type: object"})
+        assert schema._get_schema_registry() is not registry
+
+    assert schema._get_schema_registry() is registry
+
+
+def test_schema_registry_config_changes():
+    tag_uri = "asdf://somewhere.org/tags/foo-1.0.0"
+    integer_uri = "asdf://somewhere.org/schemas/integer-1.0.0"
+    string_uri = "asdf://somewhere.org/schemas/string-1.0.0"
+    resources = {
+        integer_uri: f"id: {integer_uri}\ntype: integer",
+        string_uri: f"id: {string_uri}\ntype: string",
+    }
+
+    def _make_extension(schema_uri):
+        class FooExtension:
+            extension_uri = "asdf://somewhere.org/extensions/foo-1.0.0"
+            tags = [TagDefinition(tag_uri, schema_uris=[schema_uri])]
+
+        return FooExtension()
+
+    instance = tagged.TaggedString("foo")
+    instance._tag = tag_uri
+
+    with config_context() as cfg:
+        cfg.add_extension(_make_extension(integer_uri))
+        with pytest.warns(AsdfWarning, match=r"Unable to locate schema file"):
+            schema.validate(instance, asdf.AsdfFile())
+
+        cfg.add_resource_mapping(resources)
+        with pytest.raises(ValidationError, match=r"is not of type 'integer'"):
+            schema.validate(instance, asdf.AsdfFile())
+
+    with config_context() as cfg:
+        cfg.add_resource_mapping(resources)
+        cfg.add_extension(_make_extension(string_uri))
+        schema.validate(instance, asdf.AsdfFile())
+
+
+def test_schema_cache_dir(tmp_path, monkeypatch):
+    uri = "http://stsci.edu/schemas/asdf/core/software-1.0.0"
+    runtime_uri = "asdf://somewhere.org/schemas/foo-1.0.0"
+    with config_context() as cfg:
+        cfg.schema_cache_dir = tmp_path
+        cfg.add_resource_mapping({runtime_uri: f"id: {runtime_uri}\ntype: object"})
+
+        schema.warm_schema_cache([uri, runtime_uri])
+        expected = schema._get_schema_registry().load_document(uri)[0]
+
+        # only resources from installed packages are written to the cache
+        cached_files = list(tmp_path.glob("*/*/*.json"))
+        assert len(cached_files) == 1
+
+        # a new process (here a new registry) reads the cached schema
+        schema._schema_registries.clear()
+        monkeypatch.setattr(yaml, "load", None)
+        assert schema._get_schema_registry().load_document(uri)[0] == expected
+
+        # corrupt files are ignored
+        cached_files[0].write_text("{")
+        schema._schema_registries.clear()
+        monkeypatch.undo()
+        assert schema._get_schema_registry().load_document(uri)[0] == expected
+
+
+def test_warm_schema_cache():
+    with config_context() as cfg:
+        uri = "asdf://somewhere.org/schemas/foo-1.0.0"
+        cfg.add_resource_mapping({uri: f"id: {uri}\ntype: object"})
+        schema.warm_schema_cache()
+        registry = schema._get_schema_registry()
+        assert set(registry._documents) == set(cfg.resource_manager)
@@ -3,6 +3,7 @@ import re
 import numpy as np
 import pytest
 
+import asdf
 from asdf import AsdfFile
 
 
@@ -203,3 +204,112 @@ def test_search():
 
     result = af.search(value="hello")
     assert result.node == "hello"
+
+
+def test_iter_results(asdf_file):
+    result = asdf_file.search("foo")
+    assert list(result.iter_results()) == [("root['foo']", 42), ("root['nested']['foo']", 24)]
+    assert [path for path, _ in result.iter_results()] == result.paths
+
+
+def test_results_cached(asdf_file):
+    visited = []
+
+    def _filter(node, identifier):
+        visited.append(identifier)
+        return identifier == "foo"
+
+    result = asdf_file.search(filter_=_filter)
+    assert result.nodes == [42, 24]
+    assert len(visited) == 15
+    assert result.paths == ["root['foo']", "root['nested']['foo']"]
+    assert [node for _, node in result.iter_results()] == [42, 24]
+    with pytest.raises(RuntimeError, match=r"More than one result"):
+        result.node
+    assert result.format(max_rows=None).nodes == [42, 24]
+    # the tree was only searched once
+    assert len(visited) == 15
+
+
+def test_node_stops_early(asdf_file):
+    visited = []
+
+    def _filter(node, identifier):
+        visited.append(identifier)
+        return identifier == "foo"
+
+    with pytest.raises(RuntimeError, match=r"More than one result"):
+        asdf_file.search(filter_=_filter).node
+    # the search stopped at the second result
+    assert visited[-1] == "foo"
+    assert len(visited) < 15
+
+    visited.clear()
+    results = asdf_file.search(filter_=_filter).iter_results()
+    assert next(results) == ("root['foo']", 42)
+    assert visited[-1] == "foo"
+    assert len(visited) < 15
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {},
+        {"key": "foo"},
+        {"key": "^fo"},
+        {"key": 1},
+        {"type_": int},
+        {"type_": "str"},
+        {"key": "o", "type_": str},
+        {"key": "foo", "value": 24},
+        {"filter_": lambda n: n == "yup"},
+    ],
+)
+def test_search_index(asdf_file, query):
+    expected = asdf_file.search(**query)
+    result = asdf_file.search(**query, use_index=True)
+    assert result.paths == expected.paths
+    assert result.nodes == expected.nodes
+    assert repr(result) == repr(expected)
+    assert result.search("o").paths == expected.search("o").paths
+
+
+def test_search_index_reused(asdf_file):
+    asdf_file.search("foo", use_index=True)
+    index = asdf_file._search_index
+    assert index is not None
+    assert asdf_file.search(type_=int, use_index=True).nodes == [42, 24, 24, 0, 1, 2]
+    assert asdf_file._search_index is index
+
+    # the index doesn't walk the tree
+    asdf_file._search_index._by_key.clear()
+    asdf_file._search_index._by_type.clear()
+    assert asdf_file.search("foo", use_index=True).nodes == []
+
+
+def test_search_index_invalidation(asdf_file):
+    assert asdf_file.search("foo", use_index=True).nodes == [42, 24]
+
+    asdf_file["new"] = {"foo": 1}
+    assert asdf_file.search("foo", use_index=True).nodes == [42, 24, 1]
+
+    del asdf_file["new"]
+    assert asdf_file.search("foo", use_index=True).nodes == [42, 24]
+
+    asdf_file.search("foo", use_index=True).search(value=42).replace(0)
+    assert asdf_file.search("foo", use_index=True).nodes == [0, 24]
+
+    asdf_file.tree = {"foo": "bar"}
+    assert asdf_file.search("foo", use_index=True).nodes == ["bar"]
+
+
+def test_search_index_lazy_tree(tmp_path):
+    fn = tmp_path / "test.asdf"
+    AsdfFile({"a": {"foo": 1}, "b": [{"foo": 2}]}).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True) as af:
+        assert af.search("foo", use_index=True).nodes == [1, 2]
+        af["a"]["c"] = {"foo": 3}
+        assert af.search("foo", use_index=True).nodes == [1, 3, 2]
+        af["b"].append({"foo": 4})
+        assert af.search("foo", use_index=True).nodes == [1, 3, 2, 4]
@@ -184,3 +184,147 @@ def test_stream_repr_and_str():
     ff = asdf.AsdfFile(tree)
     repr(ff.tree["stream"])
     str(ff.tree["stream"])
+
+
+@pytest.mark.parametrize("memmap", [True, False])
+def test_stream_metadata_without_loading(tmp_path, memmap):
+    path = tmp_path / "test.asdf"
+
+    tree = {"stream": Stream([6, 2], np.float64)}
+
+    with open(path, "wb") as fd:
+        asdf.AsdfFile(tree).write_to(fd)
+        for i in range(100):
+            fd.write(np.array([i] * 12, np.float64).tobytes())
+
+    with asdf.open(path, lazy_load=True, memmap=memmap) as ff:
+        arr = ff.tree["stream"]
+        assert arr.shape == (100, 6, 2)
+        assert len(arr) == 100
+        assert arr.ndim == 3
+        assert arr.size == 1200
+        assert arr.nbytes == 9600
+        ff.info()
+        assert arr._array is None
+        assert ff._blocks.blocks[0]._cached_data is None
+        assert arr.shape == np.asarray(arr).shape
+
+
+@pytest.mark.parametrize("flush_size", [0, 100, None])
+@pytest.mark.parametrize("fsync", ["never", "flush", "close"])
+def test_stream_writer(tmp_path, flush_size, fsync):
+    path = tmp_path / "test.asdf"
+
+    tree = {"data": {"stream": Stream([6, 2], np.float64)}, "nonstream": np.arange(10)}
+
+    ff = asdf.AsdfFile(tree)
+    ff.set_array_storage(tree["nonstream"], "internal")
+    with ff.open_stream_writer(path, "data.stream", flush_size=flush_size, fsync=fsync) as writer:
+        assert writer.row_shape == (6, 2)
+        for i in range(10):
+            writer.write(np.full((6, 2), i))
+        writer.write(np.full((5, 6, 2), 10, dtype=np.float32))
+        assert writer.nrows == 15
+    assert writer.closed
+
+    with asdf.open(path) as ff:
+        assert ff.tree["data"]["stream"].shape == (15, 6, 2)
+        for i, row in enumerate(ff.tree["data"]["stream"]):
+            assert np.all(row == min(i, 10))
+        assert_array_equal(ff.tree["nonstream"], np.arange(10))
+
+
+def test_stream_writer_buffering():
+    buff = io.BytesIO()
+
+    ff = asdf.AsdfFile({"stream": Stream([4], np.uint8)})
+    writer = ff.open_stream_writer(buff, ["stream"], flush_size=10)
+    size = len(buff.getvalue())
+    writer.write([1, 2, 3, 4])
+    writer.write([1, 2, 3, 4])
+    # less than flush_size bytes are buffered
+    assert len(buff.getvalue()) == size
+    writer.write([1, 2, 3, 4])
+    assert len(buff.getvalue()) == size + 12
+    writer.write([5, 6, 7, 8])
+    writer.flush()
+    assert len(buff.getvalue()) == size + 16
+    writer.close()
+    # the caller closes file objects
+    assert not buff.closed
+
+    buff.seek(0)
+    with asdf.open(buff) as ff:
+        assert_array_equal(ff.tree["stream"], [[1, 2, 3, 4]] * 3 + [[5, 6, 7, 8]])
+
+
+def test_stream_writer_errors(tmp_path):
+    buff = io.BytesIO()
+    ff = asdf.AsdfFile({"stream": Stream([2], np.int32), "array": np.arange(3)})
+
+    with pytest.raises(TypeError, match=r"Expected a Stream"):
+        ff.open_stream_writer(buff, "array")
+    with pytest.raises(ValueError, match=r"Invalid value for fsync"):
+        ff.open_stream_writer(buff, "stream", fsync="sometimes")
+    with pytest.raises(ValueError, match=r"Invalid value for flush_size"):
+        ff.open_stream_writer(buff, "stream", flush_size=-1)
+
+    with ff.open_stream_writer(buff, "stream") as writer:
+        with pytest.raises(ValueError, match=r"Expected rows with shape \(2,\)"):
+            writer.write(np.zeros((2, 3), np.int32))
+        with pytest.raises(TypeError, match=r"Cannot cast"):
+            writer.write(np.zeros(2, np.float64))
+        with pytest.raises(TypeError, match=r"Cannot cast"):
+            writer.write([1.9, 2.9])
+        with pytest.raises(TypeError, match=r"Cannot cast int64 values to int32, the values are out of range"):
+            writer.write([2**40, 1])
+    with pytest.raises(ValueError, match=r"closed StreamWriter"):
+        writer.write([1, 2])
+
+
+@pytest.mark.parametrize("memmap", [True, False])
+def test_stream_refresh(tmp_path, memmap):
+    path = tmp_path / "test.asdf"
+
+    ff = asdf.AsdfFile({"stream": Stream([2], np.float64), "nonstream": np.arange(3)})
+    ff.set_array_storage(ff["nonstream"], "internal")
+    with ff.open_stream_writer(path, "stream", flush_size=0) as writer:
+        writer.write(np.zeros((2, 2)))
+
+        with asdf.open(path, memmap=memmap) as af:
+            arr = af["stream"]
+            assert_array_equal(arr, np.zeros((2, 2)))
+            assert not arr.refresh()
+            assert not af["nonstream"].refresh()
+
+            writer.write(np.ones((3, 2)))
+            assert arr.shape == (2, 2)
+            assert arr.refresh()
+            assert arr.shape == (5, 2)
+            assert_array_equal(arr[2:], np.ones((3, 2)))
+
+            # incomplete rows are not included
+            writer.write([2, 2])
+            writer._fd.write(b"\0" * 8)
+            writer._fd.flush()
+            assert arr.refresh()
+            assert arr.shape == (6, 2)
+            assert_array_equal(arr[-1], [2, 2])
+            assert_array_equal(af["nonstream"], np.arange(3))
+
+
+def test_stream_follow(tmp_path):
+    path = tmp_path / "test.asdf"
+
+    ff = asdf.AsdfFile({"stream": Stream([2], np.int32)})
+    with ff.open_stream_writer(path, "stream", flush_size=0) as writer:
+        writer.write(np.zeros((2, 2), np.int32))
+        with asdf.open(path) as af:
+            batches = []
+            for rows in af["stream"].follow(interval=0.01, timeout=0.1):
+                batches.append(rows.tolist())
+                if len(batches) < 3:
+                    writer.write(np.full((len(batches), 2), len(batches)))
+            assert batches == [[[0, 0]] * 2, [[1, 1]], [[2, 2]] * 2]
+
+            assert list(af["stream"].follow(timeout=0, start=5)) == []
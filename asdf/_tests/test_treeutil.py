@@ -48,3 +48,20 @@ def test_walk_and_modify_shared_references():
     assert result["target"]["foo"] == "baz"
     assert result["target"] is result["nested_in_dict"]["target"]
     assert result["target"] is result["nested_in_list"][0]
+
+
+def test_walk_and_modify_leaf_types():
+    tree = {"a": 1, "b": [1.0, "two", None, True], "c": {"d": b"bytes"}}
+    visited = []
+
+    def _callback(node):
+        visited.append(node)
+        return node
+
+    result = treeutil.walk_and_modify(tree, _callback, _leaf_types=treeutil._PLAIN_LEAF_TYPES)
+
+    assert result == tree
+    # only the containers and the (non-plain) bytes should be visited
+    assert len(visited) == 4
+    assert b"bytes" in visited
+    assert not any(type(node) in treeutil._PLAIN_LEAF_TYPES for node in visited)
@@ -282,3 +282,33 @@ def test_invalid_omap(payload):
     with pytest.raises(yaml.constructor.ConstructorError):
         with asdf.open(buff) as ff:
             ff["od"]
+
+
+def test_converter_for_plain_leaf_type():
+    """
+    Plain leaves (str, int, etc) skip conversion unless a converter
+    is registered for their type.
+    """
+
+    class StrConverter:
+        tags = ["asdf://somewhere.org/tags/upper-1.0.0"]
+        types = [str]
+
+        def to_yaml_tree(self, obj, tag, ctx):
+            return obj.upper()
+
+        def from_yaml_tree(self, node, tag, ctx):
+            return node.lower()
+
+    class StrExtension:
+        extension_uri = "asdf://somewhere.org/extensions/upper-1.0.0"
+        tags = StrConverter.tags
+        converters = [StrConverter()]
+
+    with asdf.config_context() as cfg:
+        cfg.add_extension(StrExtension())
+        af = asdf.AsdfFile()
+        tagged_tree = yamlutil.custom_tree_to_tagged_tree({"a": "foo", "b": 1}, af)
+        assert tagged_tree["a"].data == "FOO"
+        assert tagged_tree["a"]._tag == StrConverter.tags[0]
+        assert tagged_tree["b"] == 1
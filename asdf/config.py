@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import collections
 import copy
+import os
 import threading
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any
@@ -34,7 +35,13 @@ DEFAULT_ALL_ARRAY_COMPRESSION = "input"
 DEFAULT_ALL_ARRAY_COMPRESSION_KWARGS = None
 DEFAULT_DEFAULT_ARRAY_SAVE_BASE = True
 DEFAULT_LAZY_TREE = False
+DEFAULT_LAZY_TREE_MEMORY_BUDGET = None
 DEFAULT_WARN_ON_FAILED_CONVERSION = False
+DEFAULT_VALIDATION_CACHE_SIZE = 0
+DEFAULT_SCHEMA_CACHE_DIR = None
+DEFAULT_EXTERNAL_FILE_CACHE_SIZE = None
+DEFAULT_EXTERNAL_BLOCK_MEMORY_BUDGET = None
+DEFAULT_PARTIAL_READ_THRESHOLD = None
 
 
 class AsdfConfig:
@@ -58,7 +65,13 @@ class AsdfConfig:
         self._all_array_compression_kwargs: dict[str, Any] | None = DEFAULT_ALL_ARRAY_COMPRESSION_KWARGS
         self._default_array_save_base = DEFAULT_DEFAULT_ARRAY_SAVE_BASE
         self._lazy_tree = DEFAULT_LAZY_TREE
+        self._lazy_tree_memory_budget: int | None = DEFAULT_LAZY_TREE_MEMORY_BUDGET
         self._warn_on_failed_conversion = DEFAULT_WARN_ON_FAILED_CONVERSION
+        self._validation_cache_size = DEFAULT_VALIDATION_CACHE_SIZE
+        self._schema_cache_dir: str | None = DEFAULT_SCHEMA_CACHE_DIR
+        self._external_file_cache_size: int | None = DEFAULT_EXTERNAL_FILE_CACHE_SIZE
+        self._external_block_memory_budget: int | None = DEFAULT_EXTERNAL_BLOCK_MEMORY_BUDGET
+        self._partial_read_threshold: int | None = DEFAULT_PARTIAL_READ_THRESHOLD
 
         self._lock = threading.RLock()
 
@@ -170,7 +183,7 @@ class AsdfConfig:
         if self._extensions is None:
             with self._lock:
                 if self._extensions is None:
-                    self._extensions = _entry_points.get_extensions()
+                    self._extensions = _entry_points.get_extensions(self.schema_cache_dir)
         return self._extensions
 
     def add_extension(self, extension: ExtensionLike) -> None:
@@ -464,6 +477,44 @@ class AsdfConfig:
     def lazy_tree(self, value: bool) -> None:
         self._lazy_tree = value
 
+    @property
+    def lazy_tree_memory_budget(self) -> int | None:
+        """
+        Get the approximate number of bytes of converted custom
+        objects a lazy tree keeps in memory.
+
+        Returns
+        -------
+        int or None
+            Memory budget in bytes, or `None` if converted
+            objects are kept for the lifetime of the tree.
+        """
+        return self._lazy_tree_memory_budget
+
+    @lazy_tree_memory_budget.setter
+    def lazy_tree_memory_budget(self, value: int | None) -> None:
+        """
+        Set the approximate number of bytes of converted custom
+        objects a lazy tree keeps in memory.  When set, custom
+        objects converted from a lazy tree are held in a least
+        recently used cache instead of the tree and are converted
+        again (from the tagged tree) if they are accessed after
+        being evicted.  Changes to an evicted object are lost.
+        The block data of evicted arrays is released (unless the
+        file was opened with ``lazy_load=False``).  The budget is
+        read when a file is opened.
+
+        Parameters
+        ----------
+        value : int or None
+            Memory budget in bytes, or `None` to keep converted
+            objects for the lifetime of the tree.
+        """
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            msg = f"Invalid value for lazy_tree_memory_budget: '{value}'"
+            raise ValueError(msg)
+        self._lazy_tree_memory_budget = value
+
     @property
     def warn_on_failed_conversion(self) -> bool:
         """
@@ -483,6 +534,185 @@ class AsdfConfig:
     def warn_on_failed_conversion(self, value: bool) -> None:
         self._warn_on_failed_conversion = value
 
+    @property
+    def validation_cache_size(self) -> int:
+        """
+        Get the maximum number of entries in the process-wide
+        cache of tagged subtrees that have already passed
+        validation on read.
+
+        Returns
+        -------
+        int
+            Maximum number of cache entries, or 0 to disable
+            the cache.
+        """
+        return self._validation_cache_size
+
+    @validation_cache_size.setter
+    def validation_cache_size(self, value: int) -> None:
+        """
+        Set the maximum number of entries in the process-wide
+        cache of tagged subtrees that have already passed
+        validation on read.  When enabled, a tagged subtree
+        that is identical (in content and tags) to one that
+        previously validated against the same tag schemas
+        is not validated again.
+
+        Parameters
+        ----------
+        value : int
+            Maximum number of cache entries, or 0 to disable
+            the cache.
+        """
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            msg = f"Invalid value for validation_cache_size: '{value}'"
+            raise ValueError(msg)
+        self._validation_cache_size = value
+
+    @property
+    def schema_cache_dir(self) -> str | None:
+        """
+        Get the directory used to cache parsed schemas on disk.
+
+        Returns
+        -------
+        str or None
+            Path to the cache directory, or `None` if schemas
+            are not cached on disk.
+        """
+        return self._schema_cache_dir
+
+    @schema_cache_dir.setter
+    def schema_cache_dir(self, value: str | os.PathLike | None) -> None:
+        """
+        Set the directory used to cache parsed schemas on disk.
+        Schemas provided by installed packages are stored in
+        this directory (by package version) after they are first
+        parsed so that later processes can skip parsing them.
+
+        The directory also holds an index of the extensions provided
+        by each installed package, which allows later processes to
+        only load an extension when one of its tags or types is used.
+        The index is used the next time the extensions are loaded
+        from entry points (see `AsdfConfig.reset_extensions`).
+
+        Parameters
+        ----------
+        value : str, os.PathLike or None
+            Path to the cache directory, or `None` to disable
+            the on-disk cache.
+        """
+        self._schema_cache_dir = None if value is None else os.fspath(value)
+
+    @property
+    def external_file_cache_size(self) -> int | None:
+        """
+        Get the maximum number of external ASDF files (opened to
+        resolve references or read external blocks) each
+        `asdf.AsdfFile` keeps open.
+
+        Returns
+        -------
+        int or None
+            Maximum number of open external files, or `None` if
+            external files are kept open until the file is closed.
+        """
+        return self._external_file_cache_size
+
+    @external_file_cache_size.setter
+    def external_file_cache_size(self, value: int | None) -> None:
+        """
+        Set the maximum number of external ASDF files (opened to
+        resolve references or read external blocks) each
+        `asdf.AsdfFile` keeps open.  When
+        more files are opened the least recently used file is closed,
+        after which any of its data that was not yet loaded can no
+        longer be read.  The limit is read when an `asdf.AsdfFile`
+        is created.
+
+        Parameters
+        ----------
+        value : int or None
+            Maximum number of open external files, or `None` to keep
+            external files open until the file is closed.
+        """
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            msg = f"Invalid value for external_file_cache_size: '{value}'"
+            raise ValueError(msg)
+        self._external_file_cache_size = value
+
+    @property
+    def external_block_memory_budget(self) -> int | None:
+        """
+        Get the approximate number of bytes of external block
+        data each `asdf.AsdfFile` keeps in memory.
+
+        Returns
+        -------
+        int or None
+            Memory budget in bytes, or `None` if loaded external
+            block data is kept until the file is closed.
+        """
+        return self._external_block_memory_budget
+
+    @external_block_memory_budget.setter
+    def external_block_memory_budget(self, value: int | None) -> None:
+        """
+        Set the approximate number of bytes of external block
+        data each `asdf.AsdfFile` keeps in memory.  When set, data
+        loaded from external blocks is held in a least recently used
+        cache (instead of by the arrays in the tree) and is read
+        again from the external file if it is used after being
+        evicted.  Memory mapped data is not counted.  The budget
+        is read when an `asdf.AsdfFile` is created.
+
+        Parameters
+        ----------
+        value : int or None
+            Memory budget in bytes, or `None` to keep loaded external
+            block data until the file is closed.
+        """
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            msg = f"Invalid value for external_block_memory_budget: '{value}'"
+            raise ValueError(msg)
+        self._external_block_memory_budget = value
+
+    @property
+    def partial_read_threshold(self) -> int | None:
+        """
+        Get the minimum size (in bytes) of lazy loaded arrays
+        that are partially read when indexed.
+
+        Returns
+        -------
+        int or None
+            Minimum array size in bytes, or `None` if arrays
+            are never partially read.
+        """
+        return self._partial_read_threshold
+
+    @partial_read_threshold.setter
+    def partial_read_threshold(self, value: int | None) -> None:
+        """
+        Set the minimum size (in bytes) of lazy loaded arrays
+        that are partially read when indexed.  Indexing an unloaded
+        array at least this large (from an uncompressed block that
+        isn't memory mapped in a read-only file) reads only the
+        bytes spanned by the selection and returns a read-only copy
+        instead of loading the array and returning a view.
+
+        Parameters
+        ----------
+        value : int or None
+            Minimum array size in bytes, or `None` to never
+            partially read arrays.
+        """
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            msg = f"Invalid value for partial_read_threshold: '{value}'"
+            raise ValueError(msg)
+        self._partial_read_threshold = value
+
     def __repr__(self) -> str:
         return (
             "<AsdfConfig\n"
@@ -496,7 +726,13 @@ class AsdfConfig:
             f"  legacy_fill_schema_defaults: {self.legacy_fill_schema_defaults}\n"
             f"  validate_on_read: {self.validate_on_read}\n"
             f"  lazy_tree: {self.lazy_tree}\n"
+            f"  lazy_tree_memory_budget: {self.lazy_tree_memory_budget}\n"
             f"  warn_on_failed_conversion: {self.warn_on_failed_conversion}\n"
+            f"  validation_cache_size: {self.validation_cache_size}\n"
+            f"  schema_cache_dir: {self.schema_cache_dir}\n"
+            f"  external_file_cache_size: {self.external_file_cache_size}\n"
+            f"  external_block_memory_budget: {self.external_block_memory_budget}\n"
+            f"  partial_read_threshold: {self.partial_read_threshold}\n"
             ">"
         )
 
@@ -541,3 +777,18 @@ def config_context() -> Generator[AsdfConfig]:
         yield config
     finally:
         _local.config_stack.pop()
+
+
+@contextmanager
+def _use_config(config: AsdfConfig) -> Generator[AsdfConfig]:
+    """
+    Context manager that makes ``config`` the current config in this
+    thread.  Used to run work in other threads with the config that
+    is active in the calling thread.
+    """
+    _local.config_stack.append(config)
+
+    try:
+        yield config
+    finally:
+        _local.config_stack.pop()
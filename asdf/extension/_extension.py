@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import abc
+import threading
+import warnings
 
 from packaging.specifiers import SpecifierSet
 
+from asdf.exceptions import AsdfWarning
 from asdf.util import get_class_name
 
 from ._compressor import Compressor
@@ -403,6 +406,10 @@ class ExtensionProxy(Extension):
         return self._validators
 
     def __eq__(self, other):
+        if isinstance(other, _DeferredExtensionProxy):
+            # avoid loading the other extension, see _DeferredExtensionProxy.__eq__
+            return NotImplemented
+
         if isinstance(other, ExtensionProxy):
             return other.delegate is self.delegate
 
@@ -420,3 +427,193 @@ class ExtensionProxy(Extension):
             f"<ExtensionProxy URI: {uri_description} class: {self.class_name} "
             f"package: {package_description} legacy: {self.legacy}>"
         )
+
+
+def _get_extension_index(extension):
+    """
+    Describe a loaded extension with JSON-compatible values.
+
+    The result contains everything `ExtensionManager` needs to index
+    the extension's tags and types and can be used to create a
+    `_DeferredExtensionProxy` without importing the extension.
+
+    Parameters
+    ----------
+    extension : asdf.extension.ExtensionProxy
+
+    Returns
+    -------
+    dict or None
+        `None` if the extension can't be described.
+    """
+    converters = []
+    for converter in extension.converters:
+        types = []
+        for typ in converter.types:
+            if not isinstance(typ, str):
+                typ = get_class_name(typ, instance=False)
+            # classes defined in a function can't be found by name
+            if "<" in typ:
+                return None
+            types.append(typ)
+        converters.append({"tags": list(converter.tags), "types": types})
+
+    yaml_tag_handles = dict(extension.yaml_tag_handles)
+    if not all(isinstance(k, str) and isinstance(v, str) for k, v in yaml_tag_handles.items()):
+        return None
+
+    return {
+        "extension_uri": extension.extension_uri,
+        "class_name": extension.class_name,
+        "legacy_class_names": sorted(extension.legacy_class_names),
+        "asdf_standard_requirement": str(extension.asdf_standard_requirement),
+        "tags": [
+            {
+                "tag_uri": tag.tag_uri,
+                "schema_uris": list(tag.schema_uris),
+                "title": tag.title,
+                "description": tag.description,
+            }
+            for tag in extension.tags
+        ],
+        "converters": converters,
+        "yaml_tag_handles": yaml_tag_handles,
+        "has_compressors": bool(extension.compressors),
+        "has_validators": bool(extension.validators),
+    }
+
+
+class _DeferredExtensionProxy(ExtensionProxy):
+    """
+    ExtensionProxy for an extension that has not been imported yet.
+
+    The extension URI, tags, converter tags and types and other
+    metadata are read from an index (see `_get_extension_index`).
+    The extension is loaded (by calling ``load``) the first time
+    a property that is not part of the index is accessed, for
+    example when a converter is needed.
+
+    Parameters
+    ----------
+    load : callable
+        Function that returns the extension instance or `None`
+        if the extension failed to load.
+    index : dict
+        Description of the extension produced by `_get_extension_index`.
+    package_name : str, optional
+    package_version : str, optional
+    """
+
+    def __init__(self, load, index, package_name=None, package_version=None):
+        self._load_delegate = load
+        self._index = index
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        self._delegate = None
+        self._package_name = package_name
+        self._package_version = package_version
+        self._class_name = index["class_name"]
+        self._legacy = False
+        self._legacy_class_names = set(index["legacy_class_names"])
+        self._asdf_standard_requirement = SpecifierSet(index["asdf_standard_requirement"])
+        self._tags = [
+            TagDefinition(
+                tag["tag_uri"],
+                schema_uris=tag["schema_uris"],
+                title=tag["title"],
+                description=tag["description"],
+            )
+            for tag in index["tags"]
+        ]
+        self._yaml_tag_handles = index["yaml_tag_handles"]
+
+    def _load(self):
+        if self._loaded:
+            return
+
+        with self._load_lock:
+            if self._loaded:
+                return
+
+            delegate = self._load_delegate()
+            try:
+                if delegate is None:
+                    msg = "Extension failed to load"
+                    raise RuntimeError(msg)
+                ExtensionProxy.__init__(self, delegate, self._package_name, self._package_version)
+            except Exception as e:
+                # Match the behavior of extensions that fail to load from
+                # an entry point, the extension will provide no support.
+                if delegate is not None:
+                    warnings.warn(
+                        f"Extension {self._index['extension_uri']} from package "
+                        f"{self._package_name}=={self._package_version} failed to load:\n\n"
+                        f"{e.__class__.__name__}: {e}",
+                        AsdfWarning,
+                    )
+                self._converters = []
+                self._compressors = []
+                self._validators = []
+            self._loaded = True
+
+    @property
+    def _converter_index(self):
+        """
+        Tags and types (as class paths) of each converter,
+        used by `ExtensionManager` to avoid loading the extension.
+        """
+        return [(converter["tags"], converter["types"]) for converter in self._index["converters"]]
+
+    @property
+    def extension_uri(self):
+        if self._loaded and self._delegate is not None:
+            return super().extension_uri
+        return self._index["extension_uri"]
+
+    @property
+    def converters(self):
+        self._load()
+        return super().converters
+
+    @property
+    def compressors(self):
+        if not self._loaded and not self._index["has_compressors"]:
+            return []
+        self._load()
+        return super().compressors
+
+    @property
+    def validators(self):
+        if not self._loaded and not self._index["has_validators"]:
+            return []
+        self._load()
+        return super().validators
+
+    @property
+    def types(self):
+        self._load()
+        return super().types
+
+    @property
+    def tag_mapping(self):
+        self._load()
+        return super().tag_mapping
+
+    @property
+    def url_mapping(self):
+        self._load()
+        return super().url_mapping
+
+    @property
+    def delegate(self):
+        self._load()
+        return super().delegate
+
+    # The delegate is not available until the extension is loaded
+    # so deferred proxies are only equal to themselves.
+    def __eq__(self, other):
+        return other is self
+
+    def __hash__(self):
+        return object.__hash__(self)
@@ -1,10 +1,11 @@
 import sys
+import weakref
 from functools import lru_cache
 
 from asdf.tagged import Tagged
 from asdf.util import get_class_name, uri_match
 
-from ._extension import ExtensionProxy
+from ._extension import ExtensionProxy, _DeferredExtensionProxy
 
 
 def _resolve_type(path):
@@ -43,6 +44,9 @@ def _resolve_type(path):
     return getattr(module, type_name)
 
 
+_MISSING = object()
+
+
 class ExtensionManager:
     """
     Wraps a list of extensions and indexes their converters
@@ -97,6 +101,20 @@ class ExtensionManager:
             for tag_def in extension.tags:
                 if tag_def.tag_uri not in self._tag_defs_by_tag:
                     self._tag_defs_by_tag[tag_def.tag_uri] = tag_def
+            if isinstance(extension, _DeferredExtensionProxy) and not extension._loaded:
+                # Index the tags and types of extensions that haven't been
+                # imported yet to the extension itself.  The extension is only
+                # loaded (and replaced with the converter) when one of these
+                # tags or types is used (see _resolve_converter).
+                for tags, types in extension._converter_index:
+                    for tag in tags:
+                        if tag not in self._converters_by_tag:
+                            self._converters_by_tag[tag] = extension
+                    for typ in types:
+                        if typ not in converters_by_type:
+                            converters_by_type[typ] = extension
+                continue
+
             for converter in extension.converters:
                 for tag in converter.tags:
                     if tag not in self._converters_by_tag:
@@ -125,6 +143,15 @@ class ExtensionManager:
 
         self._validator_manager = _get_cached_validator_manager(tuple(validators))
 
+        # Result of converter lookups by type (None if the type is not
+        # supported).  This is kept for the lifetime of the manager and
+        # weakly keyed so that dynamically created classes can be freed.
+        # Class paths are resolved (by _index_converters) when a lookup
+        # misses, a cached miss is only rechecked if modules were imported
+        # since the last time the class paths were indexed.
+        self._converters_for_type = weakref.WeakKeyDictionary()
+        self._n_indexed_modules = len(sys.modules)
+
     @property
     def extensions(self):
         """
@@ -150,6 +177,11 @@ class ExtensionManager:
         -------
         bool
         """
+        # don't load the extension until the converter is needed but
+        # once loaded (possibly by another manager) use its converters
+        # as the index might list tags that it no longer supports
+        while isinstance(extension := self._converters_by_tag.get(tag), _DeferredExtensionProxy) and extension._loaded:
+            self._resolve_converters(extension)
         return tag in self._converters_by_tag
 
     def handles_type(self, typ):
@@ -165,10 +197,10 @@ class ExtensionManager:
         -------
         bool
         """
-        if typ in self._converters_by_type:
+        if isinstance(self._converters_by_type.get(typ), _DeferredExtensionProxy):
+            # don't load the extension until the converter is needed
             return True
-        self._index_converters()
-        return typ in self._converters_by_type
+        return self._get_converter_for_type(typ) is not None
 
     def handles_tag_definition(self, tag):
         """
@@ -227,6 +259,7 @@ class ExtensionManager:
         KeyError
             Unrecognized tag URI.
         """
+        self._resolve_tag(tag)
         try:
             return self._converters_by_tag[tag]
         except KeyError:
@@ -250,16 +283,34 @@ class ExtensionManager:
         KeyError
             Unrecognized type.
         """
-        if typ not in self._converters_by_type:
-            self._index_converters()
-        try:
-            return self._converters_by_type[typ]
-        except KeyError:
+        converter = self._get_converter_for_type(typ)
+        if converter is None:
             msg = (
                 f"No support available for Python type '{get_class_name(typ, instance=False)}'.  "
                 "You may need to install or enable an extension."
             )
-            raise KeyError(msg) from None
+            raise KeyError(msg)
+        return converter
+
+    def _get_converter_for_type(self, typ):
+        """
+        Get the converter for the specified Python type or `None`
+        if the type is not supported.
+        """
+        converter = self._converters_for_type.get(typ, _MISSING)
+        if converter is None and self._converters_by_class_path and len(sys.modules) != self._n_indexed_modules:
+            # new modules might provide one of the unresolved class paths
+            converter = _MISSING
+
+        if converter is _MISSING:
+            if typ not in self._converters_by_type:
+                self._index_converters()
+            if isinstance(self._converters_by_type.get(typ), _DeferredExtensionProxy):
+                self._resolve_converters(self._converters_by_type[typ])
+            converter = self._converters_by_type.get(typ)
+            self._converters_for_type[typ] = converter
+
+        return converter
 
     def _index_converters(self):
         """
@@ -268,6 +319,8 @@ class ExtensionManager:
         classes, add them to _converters_by_class (if the class
         doesn't already have a converter).
         """
+        self._n_indexed_modules = len(sys.modules)
+
         # search class paths to find ones that are imported
         for class_path in list(self._converters_by_class_path):
             typ = _resolve_type(class_path)
@@ -277,6 +330,66 @@ class ExtensionManager:
                 self._converters_by_type[typ] = self._converters_by_class_path[class_path]
             del self._converters_by_class_path[class_path]
 
+    def _resolve_tag(self, tag):
+        """
+        Load the deferred extensions registered for a tag until the
+        tag is handled by a converter or by none of the extensions.
+        """
+        while isinstance(extension := self._converters_by_tag.get(tag), _DeferredExtensionProxy):
+            self._resolve_converters(extension)
+
+    def _find_converter_for_tag(self, tag):
+        """
+        Find the first extension (if it is deferred) or converter that
+        handles the specified tag, or `None` if no extension handles it.
+        """
+        for extension in self._extensions:
+            if isinstance(extension, _DeferredExtensionProxy) and not extension._loaded:
+                if any(tag in tags for tags, _ in extension._converter_index):
+                    return extension
+                continue
+            for converter in extension.converters:
+                if tag in converter.tags:
+                    return converter
+        return None
+
+    def _resolve_converters(self, extension):
+        """
+        Load a deferred extension and replace every index entry
+        that refers to it with the matching converter.  Entries
+        that the loaded extension does not support are removed, or
+        for tags, replaced by the next extension that handles them.
+        """
+        converters_by_tag = {}
+        converters_by_class_path = {}
+        converters_by_type = {}
+        for converter in extension.converters:
+            for tag in converter.tags:
+                converters_by_tag.setdefault(tag, converter)
+            for typ in converter.types:
+                if isinstance(typ, str):
+                    converters_by_class_path.setdefault(typ, converter)
+                    typ = _resolve_type(typ)
+                    if typ is None:
+                        continue
+                else:
+                    converters_by_class_path.setdefault(get_class_name(typ, instance=False), converter)
+                converters_by_type.setdefault(typ, converter)
+
+        def _replace(index, get_converter):
+            for key, value in list(index.items()):
+                if value is not extension:
+                    continue
+                converter = get_converter(key)
+                if converter is None:
+                    del index[key]
+                else:
+                    index[key] = converter
+
+        _replace(self._converters_by_tag, lambda tag: converters_by_tag.get(tag) or self._find_converter_for_tag(tag))
+        _replace(self._converters_by_class_path, converters_by_class_path.get)
+        _replace(self._converters_by_type, converters_by_type.get)
+
     @property
     def validator_manager(self):
         return self._validator_manager
@@ -340,6 +453,9 @@ class ValidatorManager:
                 schema_property,
             )
 
+        # validators that match a (schema property, node tag) pair
+        self._matching_validators = {}
+
     def validate(self, schema_property, schema_property_value, node, schema):
         """
         Validate an ASDF tree node against custom validators for a schema property.
@@ -360,10 +476,18 @@ class ValidatorManager:
         ------
         asdf.exceptions.ValidationError
         """
-        if schema_property in self._validators_by_schema_property:
-            for validator in self._validators_by_schema_property[schema_property]:
-                if _validator_matches(validator, node):
-                    yield from validator.validate(schema_property_value, node, schema)
+        for validator in self._get_matching_validators(schema_property, node):
+            yield from validator.validate(schema_property_value, node, schema)
+
+    def _get_matching_validators(self, schema_property, node):
+        key = (schema_property, node._tag if isinstance(node, Tagged) else None)
+        if key not in self._matching_validators:
+            self._matching_validators[key] = [
+                validator
+                for validator in self._validators_by_schema_property.get(schema_property, ())
+                if _validator_matches(validator, node)
+            ]
+        return self._matching_validators[key]
 
     def get_jsonschema_validators(self):
         """
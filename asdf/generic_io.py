@@ -18,7 +18,6 @@ import sys
 import typing
 from os import SEEK_CUR, SEEK_END, SEEK_SET
 from typing import TYPE_CHECKING
-from urllib.request import url2pathname
 
 import numpy as np
 
@@ -1093,6 +1092,9 @@ def get_file(
             # such. Otherwise, the drive component of the path can get lost.
             # This is not an ideal solution, but we can't use pathlib here
             # because it doesn't handle URIs properly.
+            # urllib.request is slow to import so it's imported on use.
+            from urllib.request import url2pathname
+
             realpath = (
                 str(init)
                 if sys.platform.startswith("win") and parsed.scheme in string.ascii_letters
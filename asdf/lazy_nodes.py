@@ -4,14 +4,18 @@ lazy conversion of tagged ASDF tree nodes to custom objects.
 """
 
 import collections
+import copy
 import inspect
+import sys
 import warnings
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 
-from . import tagged, treeutil, yamlutil
-from .config import get_config
+from . import tagged, yamlutil
+from .config import _use_config, get_config
 from .exceptions import AsdfConversionWarning, AsdfLazyReferenceError
 from .extension._serialization_context import BlockAccess
+from .tags.core.ndarray import NDArrayType
 
 __all__ = ["AsdfDictNode", "AsdfListNode", "AsdfOrderedDictNode"]
 
@@ -25,9 +29,11 @@ class _TaggedObjectCacheItem:
         self.tagged_node = tagged_node
         try:
             self._custom_object_ref = weakref.ref(custom_object)
+            self.weak = True
         except TypeError:
             # if a weakref is not possible, store the object
             self._custom_object_ref = lambda obj=custom_object: obj
+            self.weak = False
 
     @property
     def custom_object(self):
@@ -45,14 +51,62 @@ class _TaggedObjectCache:
     deleted from the tree to be garbage collected. This means that an
     item added to the cache may later fail to retrieve (if the weakref-ed
     custom object was deleted).
+
+    If ``memory_budget`` is not `None` the cache also holds (strong)
+    references to the most recently used custom objects converted from
+    tagged nodes, up to a total estimated size of ``memory_budget``
+    bytes. In this mode the lazy nodes don't store the custom objects
+    (see `_AsdfNode._convert_and_cache`) so objects evicted from
+    the cache are freed (unless referenced elsewhere) and will be
+    converted again the next time they are accessed. The block data
+    of evicted arrays is also released (see
+    `asdf.tags.core.NDArrayType._release_block_data`).
     """
 
-    def __init__(self):
+    def __init__(self, memory_budget=None):
+        self.memory_budget = memory_budget
         # start with a clear cache
         self.clear()
 
     def clear(self):
         self._cache = {}
+        self._keys_by_object = {}
+        # recently used custom objects (newest last) and their estimated sizes,
+        # only used if memory_budget is not None
+        self._held = collections.OrderedDict()
+        self._held_nbytes = 0
+
+    @property
+    def evicting(self):
+        """
+        `True` if custom objects are only held up to the memory budget
+        """
+        return self.memory_budget is not None
+
+    def _hold(self, key, custom_object):
+        """
+        Keep a reference to ``custom_object`` and evict the least
+        recently used objects that don't fit in the memory budget.
+        """
+        if key in self._held:
+            self._held.move_to_end(key)
+            return
+        nbytes = _estimate_nbytes(custom_object)
+        self._held[key] = (custom_object, nbytes)
+        self._held_nbytes += nbytes
+        # always hold the newest object, even if it's over budget
+        while self._held_nbytes > self.memory_budget and len(self._held) > 1:
+            old_key, (old_object, old_nbytes) = self._held.popitem(last=False)
+            self._held_nbytes -= old_nbytes
+            item = self._cache.get(old_key)
+            if item is not None and not item.weak:
+                # the item holds the object, drop it to free the object
+                del self._cache[old_key]
+            if self._keys_by_object.get(id(old_object)) == old_key:
+                del self._keys_by_object[id(old_object)]
+            if isinstance(old_object, NDArrayType):
+                # the block data is cached by the block, not the array
+                old_object._release_block_data()
 
     def retrieve(self, tagged_node):
         """
@@ -77,6 +131,8 @@ class _TaggedObjectCache:
         custom_object = item.custom_object
         if custom_object is None:
             del self._cache[key]
+        elif self.evicting and isinstance(tagged_node, tagged.Tagged):
+            self._hold(key, custom_object)
         return custom_object
 
     def store(self, tagged_node, custom_object):
@@ -92,6 +148,47 @@ class _TaggedObjectCache:
             The custom object (a weakref to this object will be kept in the cache).
         """
         self._cache[id(tagged_node)] = _TaggedObjectCacheItem(tagged_node, custom_object)
+        self._keys_by_object[id(custom_object)] = id(tagged_node)
+        if self.evicting and isinstance(tagged_node, tagged.Tagged):
+            self._hold(id(tagged_node), custom_object)
+
+    def retrieve_tagged_node(self, custom_object):
+        """
+        Check the cache for the tagged node a custom object was converted from.
+
+        Parameters
+        ----------
+        custom_object : converted object
+            An object previously stored in the cache.
+
+        Returns
+        -------
+        tagged_node : None or Tagged
+            The tagged node or ``None`` if ``custom_object`` was not
+            converted from a tagged node (or was garbage collected).
+        """
+        key = self._keys_by_object.get(id(custom_object))
+        if key is None or key not in self._cache:
+            return None
+        item = self._cache[key]
+        # the id might have been reused by a different object
+        if item.custom_object is not custom_object:
+            return None
+        return item.tagged_node
+
+
+def _estimate_nbytes(obj):
+    """
+    Estimate the memory used by a custom object (without loading
+    any data). Objects that define ``nbytes`` (like `numpy.ndarray`)
+    report their size, for other objects the shallow size is used.
+    """
+    if getattr(type(obj), "nbytes", None) is not None:
+        try:
+            return int(obj.nbytes)
+        except (AttributeError, TypeError, ValueError):
+            pass
+    return sys.getsizeof(obj, 0)
 
 
 def _resolve_af_ref(af_ref):
@@ -142,8 +239,64 @@ class _AsdfNode:
         """
         return self.data
 
+    def _modified(self):
+        """
+        Called after this node is modified (but not after a value
+        is converted) to discard the search index of the `asdf.AsdfFile`.
+        """
+        af = None if self._af_ref is None else self._af_ref()
+        if af is not None:
+            af._discard_search_index()
+
+    def raw_items(self):
+        """
+        Iterate over the ``(key, value)`` pairs of this node without
+        converting the values.
+
+        Values that have not yet been accessed are returned as they
+        were read from the file (tagged nodes, ``dict`` and ``list``)
+        and values that were already accessed are returned as the
+        converted custom objects or lazy nodes. For list nodes the
+        keys are the indices.
+        """
+        if isinstance(self.data, list):
+            return enumerate(self.data)
+        return self.data.items()
+
+    def get_tag(self, key):
+        """
+        Return the tag of the value at ``key`` without converting it.
+
+        Parameters
+        ----------
+        key :
+            The key (or index for list nodes) of the value.
+
+        Returns
+        -------
+        tag : str or None
+            The tag of the value or ``None`` if the value is not tagged.
+        """
+        value = self.data[key]
+        if isinstance(value, tagged.Tagged):
+            return value._tag
+        if isinstance(value, _AsdfNode) or type(value) in _base_type_to_node_map:
+            return None
+        # the value was already converted, find the tagged node it
+        # was converted from
+        af = _resolve_af_ref(self._af_ref)
+        if (tagged_node := af._tagged_object_cache.retrieve_tagged_node(value)) is not None:
+            return tagged_node._tag
+        return None
+
     def __deepcopy__(self, memo):
-        return treeutil.walk_and_modify(self, lambda n: n)
+        # copy the tagged (and already converted) values without
+        # converting anything, the copy will convert values (and
+        # use the same AsdfFile) when they are accessed
+        result = self.__class__(af_ref=self._af_ref)
+        memo[id(self)] = result
+        result.data = copy.deepcopy(self.data, memo)
+        return result
 
     def _convert_and_cache(self, value, key):
         """
@@ -162,7 +315,10 @@ class _AsdfNode:
         `asdf.lazy_nodes._AsdfNode` using the provided key and cached
         in the corresponding `asdf.AsdfFile` instance (so other
         references to ``value`` in the tree will return the same
-        ``obj``).
+        ``obj``). If the cache has a memory budget (see
+        ``lazy_tree_memory_budget`` in `asdf.config.AsdfConfig`)
+        custom objects converted from tagged values are only held
+        by the cache and ``value`` is kept in this node.
 
         Parameters
         ----------
@@ -189,10 +345,15 @@ class _AsdfNode:
         if not isinstance(value, tagged.Tagged) and type(value) not in _base_type_to_node_map:
             return value
         af = _resolve_af_ref(self._af_ref)
+        cache = af._tagged_object_cache
+        # with a memory budget keep the tagged value in this node
+        # so the obj can be freed and converted again later
+        keep_value = cache.evicting and isinstance(value, tagged.Tagged)
         # if the obj that will be returned from this value
         # is already cached, use the cached obj
-        if (obj := af._tagged_object_cache.retrieve(value)) is not None:
-            self[key] = obj
+        if (obj := cache.retrieve(value)) is not None:
+            if not keep_value:
+                self.data[key] = obj
             return obj
         # for Tagged instances, convert them to their custom obj
         if isinstance(value, tagged.Tagged):
@@ -232,8 +393,9 @@ class _AsdfNode:
         # cache the converted/wrapped obj with the AsdfFile so other
         # references to the same Tagged value will result in the
         # same obj
-        af._tagged_object_cache.store(value, obj)
-        self[key] = obj
+        cache.store(value, obj)
+        if not keep_value:
+            self.data[key] = obj
         return obj
 
 
@@ -258,7 +420,7 @@ class AsdfListNode(_AsdfNode, collections.UserList):
         return AsdfListNode(self.data.copy(), self._af_ref)
 
     def __eq__(self, other):
-        if self is other:
+        if self is other or (isinstance(other, _AsdfNode) and self.data is other.data):
             return True
         return list(self) == list(other)
 
@@ -292,7 +454,7 @@ class AsdfDictNode(_AsdfNode, collections.UserDict):
         return AsdfDictNode(self.data.copy(), self._af_ref)
 
     def __eq__(self, other):
-        if self is other:
+        if self is other or (isinstance(other, _AsdfNode) and self.data is other.data):
             return True
         return dict(self) == dict(other)
 
@@ -321,8 +483,103 @@ class AsdfOrderedDictNode(AsdfDictNode, collections.OrderedDict):
         return AsdfOrderedDictNode(self.data.copy(), self._af_ref)
 
 
+def _make_modifier(cls, name):
+    method = getattr(cls, name)
+
+    def modifier(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._modified()
+        return result
+
+    modifier.__name__ = name
+    return modifier
+
+
+for _name in [
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "insert",
+    "extend",
+    "pop",
+    "remove",
+    "clear",
+    "reverse",
+    "sort",
+]:
+    setattr(AsdfListNode, _name, _make_modifier(collections.UserList, _name))
+
+for _name in ["__setitem__", "__delitem__", "__ior__"]:
+    setattr(AsdfDictNode, _name, _make_modifier(collections.UserDict, _name))
+
+
 _base_type_to_node_map = {
     dict: AsdfDictNode,
     list: AsdfListNode,
     collections.OrderedDict: AsdfOrderedDictNode,
 }
+
+
+def _materialize(nodes, workers=None):
+    """
+    Convert every tagged node below the lazy ``nodes``.
+
+    The tree is walked (without converting anything) to find the
+    outermost unconverted tagged nodes, which are then converted in
+    parallel using a pool of ``workers`` threads.  Each tagged node is
+    converted once (by `_AsdfNode._convert_and_cache`) even if it
+    appears at several places in the tree, the other places are filled
+    from the `_TaggedObjectCache` after the conversion.  Nodes produced
+    by the conversion (for unrecognized tags) are walked in a
+    following round.
+
+    Parameters
+    ----------
+    nodes : list of _AsdfNode
+        Lazy nodes to materialize.
+
+    workers : int, optional
+        Maximum number of threads used for conversion.  If `None`,
+        the default of `concurrent.futures.ThreadPoolExecutor` is used.
+    """
+    config = get_config()
+
+    def _convert(item):
+        node, key, value = item
+        # threads don't share config contexts, use the caller's config
+        with _use_config(config):
+            return node._convert_and_cache(value, key)
+
+    visited = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while nodes:
+            to_convert = {}
+            duplicates = []
+            while nodes:
+                node = nodes.pop()
+                if id(node) in visited:
+                    continue
+                visited.add(id(node))
+                for key, value in list(node.raw_items()):
+                    if isinstance(value, (tagged.TaggedDict, tagged.TaggedList)) and isinstance(value.data, _AsdfNode):
+                        nodes.append(value.data)
+                    elif isinstance(value, tagged.Tagged):
+                        if id(value) in to_convert:
+                            duplicates.append((node, key, value))
+                        else:
+                            to_convert[id(value)] = (node, key, value)
+                    elif isinstance(value, _AsdfNode) or type(value) in _base_type_to_node_map:
+                        # wrapping a container is cheap, do it here
+                        nodes.append(node._convert_and_cache(value, key))
+
+            for obj in executor.map(_convert, to_convert.values()):
+                if isinstance(obj, _AsdfNode):
+                    nodes.append(obj)
+                elif isinstance(obj, (tagged.TaggedDict, tagged.TaggedList)) and isinstance(obj.data, _AsdfNode):
+                    nodes.append(obj.data)
+
+            # these will be found in the cache
+            for node, key, value in duplicates:
+                node._convert_and_cache(value, key)
@@ -6,11 +6,13 @@ and `JSON Pointer standard <http://tools.ietf.org/html/rfc6901>`__.
 
 import weakref
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 
 import numpy as np
 
 from . import generic_io, treeutil, util
+from .config import _use_config, get_config
 from .util import _patched_urllib_parse
 
 __all__ = ["Reference", "find_references", "make_reference", "resolve_fragment", "resolve_references"]
@@ -49,12 +51,15 @@ class Reference:
         self._base_uri = base_uri
         self._target = target
 
+    def _resolve_uri(self):
+        base_uri = self._base_uri
+        if base_uri is None:
+            base_uri = self._asdffile().uri
+        return generic_io.resolve_uri(base_uri, self._uri)
+
     def _get_target(self, **kwargs):
         if self._target is None:
-            base_uri = self._base_uri
-            if base_uri is None:
-                base_uri = self._asdffile().uri
-            uri = generic_io.resolve_uri(base_uri, self._uri)
+            uri = self._resolve_uri()
             asdffile = self._asdffile().open_external(uri, **kwargs)
             parts = _patched_urllib_parse.urlparse(self._uri)
             fragment = parts.fragment
@@ -117,20 +122,72 @@ def find_references(tree, ctx):
     return treeutil.walk_and_modify(tree, do_find)
 
 
-def resolve_references(tree, ctx, **kwargs):
+def resolve_references(tree, ctx, workers=None, **kwargs):
     """
     Resolve all of the references in the tree, by loading the external
     data and inserting it directly into the tree.
-    """
-
-    def do_resolve(tree):
-        if isinstance(tree, Reference):
-            return tree(**kwargs)
-        return tree
-
-    tree = find_references(tree, ctx)
 
-    return treeutil.walk_and_modify(tree, do_resolve)
+    The tree is walked (and copied) once.  Each reference found is
+    resolved in a pool of ``workers`` threads while the walk continues
+    and the targets are inserted into the copied tree once all
+    references are resolved.  References to the same target are
+    resolved once.
+    """
+    config = get_config()
+
+    def resolve(reference):
+        # threads don't share config contexts, use the caller's config
+        with _use_config(config):
+            return reference(**kwargs)
+
+    # the futures of the targets by the resolved URI (including the
+    # fragment) so references to the same target are resolved once
+    resolving = {}
+    # the keys of the references by id (the references are kept so
+    # the ids aren't reused)
+    reference_keys = {}
+    # containers in the copied tree that hold references
+    holders = []
+
+    def is_reference(value):
+        return isinstance(value, Reference) and id(value) in reference_keys
+
+    def target(value):
+        return resolving[reference_keys[id(value)][1]].result() if is_reference(value) else value
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def do_resolve(node):
+            if isinstance(node, dict) and "$ref" in node:
+                node = Reference(node["$ref"], asdffile=ctx)
+
+            if isinstance(node, Reference):
+                if id(node) not in reference_keys:
+                    # references with a target don't need to be opened
+                    key = id(node) if node._target is not None else node._resolve_uri()
+                    reference_keys[id(node)] = (node, key)
+                    if key not in resolving:
+                        resolving[key] = executor.submit(resolve, node)
+            elif isinstance(node, dict):
+                if any(is_reference(value) for value in node.values()):
+                    holders.append(node)
+            elif isinstance(node, list):
+                if any(is_reference(value) for value in node):
+                    holders.append(node)
+            elif isinstance(node, tuple) and not hasattr(node, "_fields"):
+                # tuples can't be updated later, wait for the targets
+                if any(is_reference(value) for value in node):
+                    node = node.__class__([target(value) for value in node])
+            return node
+
+        tree = treeutil.walk_and_modify(tree, do_resolve)
+
+        for holder in holders:
+            keys = holder.keys() if isinstance(holder, dict) else range(len(holder))
+            for key in keys:
+                holder[key] = target(holder[key])
+
+    return target(tree)
 
 
 def make_reference(asdffile, path):
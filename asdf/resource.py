@@ -165,6 +165,12 @@ class ResourceManager(Mapping):
         # Implement __contains__ only for efficiency.
         return uri in self._mappings_by_uri
 
+    def _get_mapping(self, uri):
+        """
+        Get the resource mapping that provides the content for a URI.
+        """
+        return self._mappings_by_uri[uri]
+
     def __repr__(self):
         return f"<ResourceManager len: {self.__len__()}>"
 
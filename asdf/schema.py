@@ -1,12 +1,16 @@
 import copy
 import datetime
+import hashlib
 import json
+import os
+import tempfile
+import threading
 import warnings
 import weakref
 from collections import OrderedDict
 from collections.abc import Mapping
 from functools import lru_cache
-from numbers import Integral
+from numbers import Integral, Number
 from operator import methodcaller
 
 import numpy as np
@@ -16,13 +20,14 @@ from asdf._jsonschema import validators as mvalidators
 from asdf._jsonschema.exceptions import RefResolutionError, ValidationError
 
 from . import constants, generic_io, reference, tagged, treeutil, util, versioning, yamlutil
+from ._version import version as asdf_package_version
 from .config import get_config
 from .exceptions import AsdfWarning
 from .util import _patched_urllib_parse
 
 YAML_SCHEMA_METASCHEMA_ID = "http://stsci.edu/schemas/yaml-schema/draft-01"
 
-__all__ = ["check_schema", "fill_defaults", "load_schema", "remove_defaults", "validate"]
+__all__ = ["check_schema", "fill_defaults", "load_schema", "remove_defaults", "validate", "warm_schema_cache"]
 
 PYTHON_TYPE_TO_YAML_TAG = {
     None: "null",
@@ -194,11 +199,13 @@ class _ValidationContext:
     when exiting the outermost context.
     """
 
-    __slots__ = ["_depth", "_seen"]
+    __slots__ = ["_depth", "_digests", "_seen", "_warnings"]
 
     def __init__(self):
         self._depth = 0
         self._seen = set()
+        self._digests = {}
+        self._warnings = 0
 
     def add(self, instance, schema):
         """
@@ -226,10 +233,430 @@ class _ValidationContext:
 
         if self._depth == 0:
             self._seen = set()
+            self._digests = {}
+            self._warnings = 0
 
     def _make_seen_key(self, instance, schema):
         return (id(instance), id(schema))
 
+    def digest(self, instance):
+        """
+        Return the structural digest of a tagged subtree (see
+        `_structural_digest`), memoized for the duration of the
+        outermost context.
+        """
+        return _structural_digest(instance, self._digests, set())
+
+
+# Exact scalar types whose repr fully describes their content
+_DIGEST_SCALAR_TYPES = frozenset(
+    {str, int, float, complex, bool, type(None), bytes, datetime.datetime, datetime.date, tagged.TaggedString}
+)
+
+
+def _structural_digest(node, memo, active):
+    """
+    Compute a digest of a tagged subtree that includes the types,
+    tags and content of every node.  Two subtrees with equal
+    digests validate identically against the same schema.
+
+    Returns `None` for subtrees that cannot be digested (those
+    that contain reference cycles or unsupported node types).
+    """
+    node_type = type(node)
+    if node_type in _DIGEST_SCALAR_TYPES:
+        tag = node._tag if node_type is tagged.TaggedString else ""
+        return hashlib.blake2b(
+            f"{node_type.__name__}:{tag}:{node!r}".encode(),
+            digest_size=16,
+        ).digest()
+
+    node_id = id(node)
+    if node_id in memo:
+        return memo[node_id]
+
+    if node_type in (dict, tagged.TaggedDict):
+        children = node.items()
+    elif node_type in (list, tuple, tagged.TaggedList):
+        children = enumerate(node)
+    else:
+        return None
+
+    if node_id in active:
+        return None
+    active.add(node_id)
+
+    hasher = hashlib.blake2b(
+        f"{node_type.__name__}:{getattr(node, '_tag', '')}:{len(node)}".encode(),
+        digest_size=16,
+    )
+    digest = None
+    for key, value in children:
+        if (key_digest := _structural_digest(key, memo, active)) is None:
+            break
+        if (value_digest := _structural_digest(value, memo, active)) is None:
+            break
+        hasher.update(key_digest)
+        hasher.update(value_digest)
+    else:
+        digest = hasher.digest()
+
+    active.remove(node_id)
+    memo[node_id] = digest
+    return digest
+
+
+class _ValidationCache:
+    """
+    Process-wide, size limited, least recently used set of
+    (validator class, extension manager, schema URI, subtree digest)
+    keys for tagged subtrees that have passed validation on read.
+    The maximum size is read from `asdf.config.AsdfConfig.validation_cache_size`.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key, max_size):
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_validation_cache = _ValidationCache()
+
+
+# Type predicates used by compiled schemas, these must match the
+# type checker created in _create_validator
+_TYPE_PREDICATES = {
+    "array": lambda instance: isinstance(instance, (list, tuple)),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": lambda instance: not isinstance(instance, bool) and isinstance(instance, Integral),
+    "null": lambda instance: instance is None,
+    "number": lambda instance: not isinstance(instance, bool) and isinstance(instance, Number),
+    "object": lambda instance: isinstance(instance, dict),
+    "string": lambda instance: isinstance(instance, (str, np.str_)),
+}
+
+
+def _no_errors(errors):
+    for _ in errors:
+        return False
+    return True
+
+
+class _SchemaCompiler:
+    """
+    Compiles schemas into functions ``check(validator, instance, active)``
+    that return `True` if the instance is valid against the schema.
+
+    The ``$ref``, ``type``, ``properties``, ``items``, ``required``,
+    ``tag``, ``allOf``, ``anyOf``, ``oneOf`` and ``not`` keywords are
+    implemented by specialized closures.  Other keywords (for example
+    ``ndim`` and ``datatype``) call the validator functions directly,
+    skipping the jsonschema dispatch.  Tagged child nodes and subschemas
+    that cannot be compiled are passed on to ``validator.descend``.
+
+    A `False` result does not produce errors, callers are expected to
+    validate the instance again with the validator to find them.
+
+    Parameters
+    ----------
+    validators : dict
+        Validator functions by schema keyword.
+
+    resolver : RefResolver
+        Resolver used to resolve references at compile time.
+
+    compiled : dict
+        Compiled functions (and the schemas they were compiled from)
+        by schema id.
+    """
+
+    def __init__(self, validators, resolver, compiled):
+        self._validators = validators
+        self._resolver = resolver
+        self._compiled = compiled
+
+    def compile(self, schema):
+        """
+        Compile a schema, returning `None` if the schema cannot be compiled.
+        """
+        schema_id = id(schema)
+        if schema_id in self._compiled:
+            return self._compiled[schema_id][1]
+
+        # An empty schema would need to visit all children to validate
+        # tagged descendants, leave it to the validator.
+        if not isinstance(schema, dict) or not schema:
+            self._compiled[schema_id] = (schema, None)
+            return None
+
+        # register a placeholder before compiling subschemas in case the
+        # schema (indirectly) contains itself
+        def recursive_check(validator, instance, active):
+            return self._compiled[schema_id][1](validator, instance, active)
+
+        self._compiled[schema_id] = (schema, recursive_check)
+
+        scope = mvalidators.Draft4Validator.ID_OF(schema)
+        if scope:
+            self._resolver.push_scope(scope)
+        try:
+            if "$ref" in schema:
+                # draft 4 ignores all other keywords next to a $ref
+                checks, needs_validator = self._compile_keywords({"$ref": schema["$ref"]})
+            else:
+                checks, needs_validator = self._compile_keywords(schema)
+        finally:
+            if scope:
+                self._resolver.pop_scope()
+
+        def check(validator, instance, active):
+            if needs_validator:
+                # keyword functions expect a validator for this schema
+                validator = validator.evolve(schema=schema)
+            if scope:
+                validator.resolver.push_scope(scope)
+            try:
+                for keyword_check in checks:
+                    if not keyword_check(validator, instance, active):
+                        return False
+                return True
+            finally:
+                if scope:
+                    validator.resolver.pop_scope()
+
+        self._compiled[schema_id] = (schema, check)
+        return check
+
+    def _compile_keywords(self, schema):
+        draft4_validators = mvalidators.Draft4Validator.VALIDATORS
+        builders = {
+            "$ref": (draft4_validators["$ref"], self._compile_ref),
+            "type": (validate_type, self._compile_type),
+            "properties": (draft4_validators["properties"], self._compile_properties),
+            "items": (draft4_validators["items"], self._compile_items),
+            "required": (draft4_validators["required"], self._compile_required),
+            "tag": (validate_tag, self._compile_tag),
+            "allOf": (draft4_validators["allOf"], self._compile_all_of),
+            "anyOf": (draft4_validators["anyOf"], self._compile_any_of),
+            "oneOf": (draft4_validators["oneOf"], self._compile_one_of),
+            "not": (draft4_validators["not"], self._compile_not),
+        }
+
+        checks = []
+        needs_validator = False
+        for keyword, value in schema.items():
+            validator_function = self._validators.get(keyword)
+            if validator_function is None:
+                continue
+
+            keyword_check = None
+            if keyword in builders and builders[keyword][0] is validator_function:
+                keyword_check = builders[keyword][1](value, schema)
+
+            if keyword_check is None:
+                needs_validator = True
+                keyword_check = self._compile_keyword(validator_function, value, schema)
+
+            checks.append(keyword_check)
+
+        return checks, needs_validator
+
+    def _compile_subschema(self, subschema):
+        """
+        Compile a subschema, returning a function that validates the
+        instance with the validator if the subschema cannot be compiled.
+        """
+        subcheck = self.compile(subschema)
+        if subcheck is not None:
+            return subcheck
+
+        def descend(validator, instance, active):
+            return _no_errors(validator.descend(instance, subschema))
+
+        return descend
+
+    def _compile_child(self, subschema):
+        """
+        Compile a subschema for the child nodes of an instance.
+        """
+        subcheck = self.compile(subschema)
+        subschema_id = id(subschema)
+
+        def check_child(validator, value, active):
+            if subcheck is None or isinstance(value, tagged.Tagged):
+                # leave tag schemas (and uncompiled subschemas) to the validator
+                return _no_errors(validator.descend(value, subschema))
+
+            if (isinstance(value, dict) and "$ref" in value) or isinstance(value, reference.Reference):
+                # see iter_errors, references are not validated
+                return True
+
+            if isinstance(value, (dict, list)):
+                key = (id(value), subschema_id)
+                if key in active:
+                    # this is a reference cycle which is already being validated
+                    return True
+                active.add(key)
+                try:
+                    return subcheck(validator, value, active)
+                finally:
+                    active.remove(key)
+
+            return subcheck(validator, value, active)
+
+        return check_child
+
+    def _compile_ref(self, ref, schema):
+        try:
+            url, resolved = self._resolver.resolve(ref)
+        except RefResolutionError:
+            return None
+
+        self._resolver.push_scope(url)
+        try:
+            subcheck = self._compile_subschema(resolved)
+        finally:
+            self._resolver.pop_scope()
+
+        def check_ref(validator, instance, active):
+            validator.resolver.push_scope(url)
+            try:
+                return subcheck(validator, instance, active)
+            finally:
+                validator.resolver.pop_scope()
+
+        return check_ref
+
+    def _compile_type(self, types, schema):
+        if isinstance(types, str):
+            types = [types]
+
+        if not all(isinstance(t, str) and t in _TYPE_PREDICATES for t in types):
+            return None
+
+        predicates = [_TYPE_PREDICATES[t] for t in types]
+        if schema.get("format") == "date-time" and "string" in types:
+            # see validate_type
+            predicates.append(lambda instance: isinstance(instance, datetime.datetime))
+
+        def check_type(validator, instance, active):
+            return any(predicate(instance) for predicate in predicates)
+
+        return check_type
+
+    def _compile_properties(self, properties, schema):
+        if not isinstance(properties, dict):
+            return None
+
+        subchecks = [(name, self._compile_child(subschema)) for name, subschema in properties.items()]
+
+        def check_properties(validator, instance, active):
+            if not isinstance(instance, dict):
+                return True
+
+            for name, check_child in subchecks:
+                if name in instance and not check_child(validator, instance[name], active):
+                    return False
+
+            return True
+
+        return check_properties
+
+    def _compile_items(self, items, schema):
+        if isinstance(items, dict):
+            check_item = self._compile_child(items)
+
+            def check_items(validator, instance, active):
+                if not isinstance(instance, (list, tuple)):
+                    return True
+
+                return all(check_item(validator, item, active) for item in instance)
+
+        elif isinstance(items, list):
+            item_checks = [self._compile_child(subschema) for subschema in items]
+
+            def check_items(validator, instance, active):
+                if not isinstance(instance, (list, tuple)):
+                    return True
+
+                return all(check_item(validator, item, active) for check_item, item in zip(item_checks, instance))
+
+        else:
+            return None
+
+        return check_items
+
+    def _compile_required(self, required, schema):
+        def check_required(validator, instance, active):
+            return not isinstance(instance, dict) or all(name in instance for name in required)
+
+        return check_required
+
+    def _compile_tag(self, tag_pattern, schema):
+        def check_tag(validator, instance, active):
+            instance_tag = instance._tag if hasattr(instance, "_tag") else _type_to_tag(type(instance))
+            return instance_tag is not None and util.uri_match(tag_pattern, instance_tag)
+
+        return check_tag
+
+    def _compile_all_of(self, subschemas, schema):
+        subchecks = [self._compile_subschema(subschema) for subschema in subschemas]
+
+        def check_all_of(validator, instance, active):
+            return all(subcheck(validator, instance, active) for subcheck in subchecks)
+
+        return check_all_of
+
+    def _compile_any_of(self, subschemas, schema):
+        subchecks = [self._compile_subschema(subschema) for subschema in subschemas]
+
+        def check_any_of(validator, instance, active):
+            return any(subcheck(validator, instance, active) for subcheck in subchecks)
+
+        return check_any_of
+
+    def _compile_one_of(self, subschemas, schema):
+        subchecks = [self._compile_subschema(subschema) for subschema in subschemas]
+
+        def check_one_of(validator, instance, active):
+            return sum(1 for subcheck in subchecks if subcheck(validator, instance, active)) == 1
+
+        return check_one_of
+
+    def _compile_not(self, subschema, schema):
+        subcheck = self._compile_subschema(subschema)
+
+        def check_not(validator, instance, active):
+            return not subcheck(validator, instance, active)
+
+        return check_not
+
+    def _compile_keyword(self, validator_function, value, schema):
+        def check_keyword(validator, instance, active):
+            return _no_errors(validator_function(validator, value, instance, schema) or ())
+
+        return check_keyword
+
 
 @lru_cache
 def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
@@ -259,6 +686,11 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
             # validator for the same schema
             self.evolved_validators = kwargs.pop("evolved_validators", {})
             self.serialization_context = kwargs.pop("serialization_context", None)
+            # maximum size of the validation cache, 0 when the cache
+            # should not be used for this validation
+            self.validation_cache_size = 0
+            # shared store of schemas (and compiled schemas)
+            self.schema_registry = kwargs.pop("schema_registry", None)
 
             original_init(self, *args, **kwargs)
 
@@ -290,6 +722,8 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
             validator.ctx = self.ctx
             validator.parent = weakref.ref(parent)
             validator.serialization_context = self.serialization_context
+            validator.validation_cache_size = self.validation_cache_size
+            validator.schema_registry = self.schema_registry
             parent.evolved_validators[schema_key] = validator
             return validator
 
@@ -298,21 +732,31 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
     def _patch_iter_errors(cls):
         original_iter_errors = cls.iter_errors
 
-        cls._context = _ValidationContext()
+        # the context is shared by the validators (including the evolved
+        # ones) validating in a thread but not across threads
+        local = threading.local()
+
+        def _context(self):
+            context = getattr(local, "context", None)
+            if context is None:
+                context = local.context = _ValidationContext()
+            return context
+
+        cls._context = property(_context)
 
         def iter_errors(self, instance, *args, **kwargs):
             # We can't validate anything that looks like an external reference,
             # since we don't have the actual content, so we just have to defer
             # it for now.  If the user cares about complete validation, they
             # can call `AsdfFile.resolve_references`.
-            with self._context:
-                if self._context.seen(instance, self.schema):
+            with self._context as context:
+                if context.seen(instance, self.schema):
                     # We've already validated this instance against this schema,
                     # no need to do it again.
                     return
 
                 if not visit_repeat_nodes:
-                    self._context.add(instance, self.schema)
+                    context.add(instance, self.schema)
 
                 if (isinstance(instance, dict) and "$ref" in instance) or isinstance(instance, reference.Reference):
                     return
@@ -320,17 +764,34 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
                 tag = tagged.get_tag(instance)
 
                 if tag is not None and self.serialization_context.extension_manager.handles_tag_definition(tag):
-                    tag_def = self.serialization_context.extension_manager.get_tag_definition(tag)
-                    schema_uris = tag_def.schema_uris
+                    extension_manager = self.serialization_context.extension_manager
+                    tag_schemas = self.schema_registry.get_tag_schemas(extension_manager, tag)
+
+                    digest = context.digest(instance) if self.validation_cache_size else None
 
                     # Must validate against all schema_uris
-                    for schema_uri in schema_uris:
-                        try:
-                            with self.resolver.resolving(schema_uri) as resolved:
-                                if resolved != self.schema:
-                                    yield from self.descend(instance, resolved)
-                        except RefResolutionError:
+                    for schema_uri, url, resolved in tag_schemas:
+                        cache_key = None if digest is None else (cls, extension_manager, schema_uri, digest)
+                        if cache_key is not None and cache_key in _validation_cache:
+                            continue
+                        n_warnings = context._warnings
+                        valid = False
+                        if resolved is None:
+                            context._warnings += 1
                             warnings.warn(f"Unable to locate schema file for '{tag}': '{schema_uri}'", AsdfWarning)
+                        elif resolved is not self.schema and resolved != self.schema:
+                            valid = True
+                            self.resolver.push_scope(url)
+                            try:
+                                for error in self._iter_tag_schema_errors(instance, resolved):
+                                    valid = False
+                                    yield error
+                            finally:
+                                self.resolver.pop_scope()
+                        # only cache subtrees that were validated against the tag
+                        # schema without errors or warnings
+                        if cache_key is not None and valid and n_warnings == context._warnings:
+                            _validation_cache.add(cache_key, self.validation_cache_size)
 
                 if self.schema:
                     for error in original_iter_errors(self, instance):
@@ -338,8 +799,8 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
                         # since it's ok for validation to fail under some schema combiners
                         # but we want to re-evaluate (and fail) when not under one
                         # of those combiners
-                        if self._context.seen(instance, self.schema):
-                            self._context.remove(instance, self.schema)
+                        if context.seen(instance, self.schema):
+                            context.remove(instance, self.schema)
                         yield error
                 else:
                     if isinstance(instance, dict):
@@ -350,7 +811,22 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
                         for val in instance:
                             yield from self.iter_errors(val)
 
+        def iter_tag_schema_errors(self, instance, schema):
+            context = self._context
+            if not visit_repeat_nodes and not context.seen(instance, schema):
+                # Check the instance with the compiled schema and only
+                # use the (much slower) jsonschema validation to find errors.
+                check = self.schema_registry.compile(cls, validators, self.resolver, schema)
+                if check is not None:
+                    context.add(instance, schema)
+                    if check(self, instance, set()):
+                        return
+                    context.remove(instance, schema)
+
+            yield from self.descend(instance, schema)
+
         cls.iter_errors = iter_errors
+        cls._iter_tag_schema_errors = iter_tag_schema_errors
 
     _patch_init(ASDFvalidator)
     _patch_iter_errors(ASDFvalidator)
@@ -379,53 +855,268 @@ def _load_schema(url):
     return result, fd.uri
 
 
-def _make_schema_loader():
-    def load_schema(url):
-        # Check if this is a URI provided by the new
-        # Mapping API:
-        resource_manager = get_config().resource_manager
-
-        if url in resource_manager:
-            content = resource_manager[url]
-            # The jsonschema metaschemas are JSON, but pyyaml
-            # doesn't mind.
-            # The following call to yaml.load is safe because we're
-            # using a loader that inherits from pyyaml's SafeLoader.
-            result = yaml.load(content, Loader=yamlutil.AsdfLoader)  # noqa: S506
+def _get_schema_cache_path(resource_manager, url):
+    """
+    Get the path of the on-disk cache file for a resource,
+    or `None` if the resource should not be cached.
+    """
+    cache_dir = get_config().schema_cache_dir
+    if cache_dir is None:
+        return None
+
+    # Only resources from installed packages are cached, the package
+    # version is part of the path so that upgrades invalidate the cache.
+    mapping = resource_manager._get_mapping(url)
+    package_name = getattr(mapping, "package_name", None)
+    package_version = getattr(mapping, "package_version", None)
+    if package_name is None or package_version is None:
+        return None
+
+    filename = hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+    return os.path.join(cache_dir, f"asdf-{asdf_package_version}", f"{package_name}-{package_version}", filename)
+
+
+def _read_schema_cache(path, url):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("uri") != url:
+        return None
+
+    return cached.get("schema")
+
+
+def _write_schema_cache(path, url, schema):
+    try:
+        content = json.dumps({"uri": url, "schema": schema})
+    except (TypeError, ValueError):
+        return
+
+    # Some YAML content (non-string keys, dates) does not survive
+    # conversion to JSON, don't cache those schemas.
+    if json.loads(content)["schema"] != schema:
+        return
+
+    # write to a temporary file and rename it so that other processes
+    # never read a partially written file
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        # the cache is only an optimization
+        pass
+
+
+def _load_schema_document(resource_manager, url):
+    # Check if this is a URI provided by the new
+    # Mapping API:
+    if url in resource_manager:
+        cache_path = _get_schema_cache_path(resource_manager, url)
+        if cache_path is not None and (result := _read_schema_cache(cache_path, url)) is not None:
             return result, url
 
-        # If not, this must be a URL (or missing).  Fall back to fetching
-        # the schema the old way:
-        return _load_schema(url)
+        content = resource_manager[url]
+        # The jsonschema metaschemas are JSON, but pyyaml
+        # doesn't mind.
+        # The following call to yaml.load is safe because we're
+        # using a loader that inherits from pyyaml's SafeLoader.
+        result = yaml.load(content, Loader=yamlutil.AsdfLoader)  # noqa: S506
+
+        if cache_path is not None:
+            _write_schema_cache(cache_path, url, result)
+        return result, url
+
+    # If not, this must be a URL (or missing).  Fall back to fetching
+    # the schema the old way:
+    return _load_schema(url)
+
+
+def _make_schema_loader():
+    def load_schema(url):
+        return _get_schema_registry().load_document(url)
 
     return load_schema
 
 
+# Supplying our own implementation of urljoin_cache
+# allows asdf:// URIs to be resolved correctly.
+_urljoin_cache = lru_cache(1024)(_patched_urllib_parse.urljoin)
+
+
+class _SchemaRegistry:
+    """
+    Process-wide store of the schemas provided by one
+    `asdf.resource.ResourceManager`, and of the objects derived
+    from them:
+
+    - the parsed schema documents
+    - the targets of resolved references
+    - the schemas for each tag (for each extension manager)
+    - the compiled schemas (for each validator class)
+
+    A new ResourceManager is created whenever the resource mappings
+    change (including changes made within `asdf.config_context`), so
+    nothing here needs to be invalidated.  Changes to the extensions
+    produce a new extension manager and validator class, which are
+    used as keys for the tag and compiled schemas.
+    """
+
+    def __init__(self, resource_manager):
+        self._resource_manager = weakref.ref(resource_manager)
+        self._documents = {}
+        self._tag_schemas = weakref.WeakKeyDictionary()
+        self._compiled_schemas = weakref.WeakKeyDictionary()
+        self._compile_lock = threading.RLock()
+
+        self.handlers = {x: self._get_document for x in ["http", "https", "file", "tag", "asdf"]}
+
+        # This resolver is only used to resolve (absolute) URLs for the
+        # shared remote_cache, its scope is never changed.
+        resolver = mvalidators.RefResolver(
+            "",
+            {},
+            cache_remote=False,
+            handlers=self.handlers,
+            urljoin_cache=_urljoin_cache,
+        )
+        self.remote_cache = lru_cache(1024)(resolver.resolve_from_url)
+
+    def load_document(self, url):
+        """
+        Load (and cache) a schema document returning the
+        document and its URL.
+        """
+        if url not in self._documents:
+            self._documents[url] = _load_schema_document(self._resource_manager(), url)
+        return self._documents[url]
+
+    def _get_document(self, url):
+        return self.load_document(url)[0]
+
+    def make_resolver(self):
+        """
+        Make a new resolver that shares the caches of this registry.
+        """
+        # We set cache_remote=False here because we do the caching of
+        # remote schemas here in the registry, so we don't need
+        # jsonschema to do it on our behalf.  Setting it to `True`
+        # counterintuitively makes things slower.
+        return mvalidators.RefResolver(
+            "",
+            {},
+            cache_remote=False,
+            handlers=self.handlers,
+            urljoin_cache=_urljoin_cache,
+            remote_cache=self.remote_cache,
+        )
+
+    def get_tag_schemas(self, extension_manager, tag):
+        """
+        Get the schemas for a tag as a list of (schema URI, URL, schema)
+        tuples.  The schema is `None` if it could not be resolved.
+        """
+        schemas_by_tag = self._tag_schemas.get(extension_manager)
+        if schemas_by_tag is None:
+            schemas_by_tag = self._tag_schemas.setdefault(extension_manager, {})
+
+        if tag in schemas_by_tag:
+            return schemas_by_tag[tag]
+
+        schemas = []
+        for schema_uri in extension_manager.get_tag_definition(tag).schema_uris:
+            url = _urljoin_cache("", schema_uri).rstrip("/")
+            try:
+                resolved = self.remote_cache(url)
+            except RefResolutionError:
+                resolved = None
+            schemas.append((schema_uri, url, resolved))
+
+        # don't remember failures, the schema might become available later
+        if all(resolved is not None for _, _, resolved in schemas):
+            schemas_by_tag[tag] = schemas
+
+        return schemas
+
+    def compile(self, validator_class, validators, resolver, schema):
+        """
+        Compile (and cache) a schema for a validator class, see `_SchemaCompiler`.
+        """
+        compiled = self._compiled_schemas.get(validator_class)
+        if compiled is None:
+            compiled = self._compiled_schemas.setdefault(validator_class, {})
+
+        schema_id = id(schema)
+        if schema_id in compiled:
+            return compiled[schema_id][1]
+
+        with self._compile_lock:
+            if schema_id in compiled:
+                # compiled by another thread
+                return compiled[schema_id][1]
+            # compile into a copy so other threads never see the placeholders
+            # used for recursive schemas, then add the new entries in place
+            working = dict(compiled)
+            check = _SchemaCompiler(validators, resolver, working).compile(schema)
+            for key, value in working.items():
+                compiled.setdefault(key, value)
+        return check
+
+
+# Registries by resource manager id.  ResourceManager is a Mapping
+# (and so not hashable) so entries are removed by a finalizer instead
+# of using a WeakKeyDictionary.
+_schema_registries = {}
+
+
+def _get_schema_registry():
+    """
+    Get the `_SchemaRegistry` for the current resource manager.
+    """
+    resource_manager = get_config().resource_manager
+    key = id(resource_manager)
+    registry = _schema_registries.get(key)
+    if registry is None:
+        registry = _schema_registries.setdefault(key, _SchemaRegistry(resource_manager))
+        weakref.finalize(resource_manager, _schema_registries.pop, key, None)
+    return registry
+
+
 def _make_jsonschema_refresolver():
-    handlers = {}
-    schema_loader = _make_schema_loader()
-
-    def get_schema(url):
-        return schema_loader(url)[0]
-
-    for x in ["http", "https", "file", "tag", "asdf"]:
-        handlers[x] = get_schema
-
-    # Supplying our own implementation of urljoin_cache
-    # allows asdf:// URIs to be resolved correctly.
-    urljoin_cache = lru_cache(1024)(_patched_urllib_parse.urljoin)
-
-    # We set cache_remote=False here because we do the caching of
-    # remote schemas here in `load_schema`, so we don't need
-    # jsonschema to do it on our behalf.  Setting it to `True`
-    # counterintuitively makes things slower.
-    return mvalidators.RefResolver(
-        "",
-        {},
-        cache_remote=False,
-        handlers=handlers,
-        urljoin_cache=urljoin_cache,
-    )
+    return _get_schema_registry().make_resolver()
+
+
+def warm_schema_cache(uris=None):
+    """
+    Load schemas ahead of time so that later validation does not
+    need to load them.
+
+    Schemas are kept in memory for the current configuration
+    (see `asdf.config_context`) and, if
+    `asdf.config.AsdfConfig.schema_cache_dir` is set, written
+    to the on-disk cache for use by other processes.
+
+    Parameters
+    ----------
+    uris : iterable of str, optional
+        URIs of the schemas to load.  Defaults to all resources
+        of the current `asdf.resource.ResourceManager`.
+    """
+    registry = _get_schema_registry()
+    if uris is None:
+        uris = list(get_config().resource_manager)
+
+    for uri in uris:
+        registry.load_document(uri)
 
 
 def load_schema(url, resolve_references=False):
@@ -554,7 +1245,8 @@ def get_validator(
         validators = util.HashableDict(YAML_VALIDATORS.copy())
         validators.update(ctx._extension_manager.validator_manager.get_jsonschema_validators())
 
-    kwargs["resolver"] = _make_jsonschema_refresolver()
+    schema_registry = _get_schema_registry()
+    kwargs["resolver"] = schema_registry.make_resolver()
 
     # We don't just call validators.validate() directly here, because
     # that validates the schema itself, wasting a lot of time (at the
@@ -562,7 +1254,14 @@ def get_validator(
     # test suite!!!).  Instead, we assume that the schemas are valid
     # through the running of the unit tests, not at run time.
     cls = _create_validator(validators=validators, visit_repeat_nodes=_visit_repeat_nodes)
-    return cls({} if schema is None else schema, *args, ctx=ctx, serialization_context=_serialization_context, **kwargs)
+    return cls(
+        {} if schema is None else schema,
+        *args,
+        ctx=ctx,
+        serialization_context=_serialization_context,
+        schema_registry=schema_registry,
+        **kwargs,
+    )
 
 
 def _validate_large_literals(instance, reading):
@@ -654,6 +1353,11 @@ def validate(instance, ctx=None, schema=None, validators=None, reading=False, *a
     if schema is None and ctx._custom_schema:
         schema = ctx._custom_schema
     validator = get_validator({} if schema is None else schema, ctx, validators, *args, **kwargs)
+    # Validators that modify the tree (filling or removing defaults) and
+    # validation on write (which assigns styles to the tagged tree) must
+    # visit every node so the validation cache is only used for reading.
+    if reading and validators is None:
+        validator.validation_cache_size = get_config().validation_cache_size
     validator.validate(instance)
 
     additional_validators = [_validate_large_literals]
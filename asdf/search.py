@@ -3,6 +3,7 @@ Utilities for searching ASDF trees.
 """
 
 import builtins
+import collections
 import inspect
 import re
 import typing
@@ -37,6 +38,58 @@ class AsdfSearchResult:
         self._max_rows = max_rows
         self._max_cols = max_cols
         self._show_values = show_values
+        self._matches = _MatchCache(self._walk_matches())
+        # called (if set) when the tree is modified by replace
+        self._on_replace = None
+        # a _SearchIndex of the tree under self._node (if one is used)
+        self._index = None
+
+    def _derive(self, *args, **kwargs):
+        """
+        Create a new search result that shares the ``replace`` hook
+        and (if the result is for the same node) the search index.
+        """
+        result = AsdfSearchResult(*args, **kwargs)
+        result._on_replace = self._on_replace
+        if self._index is not None and result._node is self._node:
+            result._use_index(self._index)
+        return result
+
+    def _use_index(self, index):
+        """
+        Find the results with a `_SearchIndex` instead of walking the tree.
+        """
+        self._index = index
+        self._matches = _MatchCache(index.find(self._filters))
+
+    def _walk_matches(self):
+        """
+        Walk the tree and yield ``(identifiers, parent, node)`` for
+        every node that passes the filters.
+        """
+        for link, parent, node in _iter_tree_breadth_first(self._identifiers, self._node):
+            identifier = link[1]
+            if all(f(node, identifier) for f in self._filters):
+                yield _link_to_identifiers(link), parent, node
+
+    def iter_results(self):
+        """
+        Iterate over the search results without searching the whole tree.
+
+        The tree is searched as the results are consumed (and results
+        are cached so the tree is searched at most once for this search
+        result).
+
+        Yields
+        ------
+        path : str
+            the path to the node (see `AsdfSearchResult.path`)
+
+        node : object
+            the node (see `AsdfSearchResult.node`)
+        """
+        for identifiers, _, node in self._matches:
+            yield _build_path(identifiers), node
 
     def format(self, max_rows=NOT_SET, max_cols=NOT_SET, show_values=NOT_SET):
         """
@@ -79,7 +132,7 @@ class AsdfSearchResult:
         if show_values is NOT_SET:
             show_values = self._show_values
 
-        return AsdfSearchResult(
+        result = self._derive(
             self._identifiers,
             self._node,
             filters=self._filters,
@@ -88,6 +141,9 @@ class AsdfSearchResult:
             max_cols=max_cols,
             show_values=show_values,
         )
+        # formatting doesn't change the results
+        result._matches = self._matches
+        return result
 
     def _maybe_compile_pattern(self, query):
         if isinstance(query, str):
@@ -95,25 +151,6 @@ class AsdfSearchResult:
 
         return query
 
-    def _safe_equals(self, a, b):
-        try:
-            result = a == b
-
-        except Exception:
-            return False
-
-        if isinstance(result, bool):
-            return result
-
-        return False
-
-    def _get_fully_qualified_type(self, value):
-        value_type = type(value)
-        if value_type.__module__ == "builtins":
-            return value_type.__name__
-
-        return ".".join([value_type.__module__, value_type.__name__])
-
     def search(self, key=NOT_SET, type_=NOT_SET, value=NOT_SET, filter_=None):
         """
         Further narrow the search.
@@ -168,41 +205,9 @@ class AsdfSearchResult:
 
         filter_ = _wrap_filter(filter_)
 
-        def _filter(node, identifier):
-            if isinstance(key, typing.Pattern):
-                if key.search(str(identifier)) is None:
-                    return False
-
-            elif key is not NOT_SET and not self._safe_equals(identifier, key):
-                return False
-
-            if isinstance(type_, typing.Pattern):
-                fully_qualified_node_type = self._get_fully_qualified_type(node)
-                if type_.search(fully_qualified_node_type) is None:
-                    return False
+        _filter = _Filter(key, type_, value, filter_)
 
-            elif isinstance(type_, builtins.type) and not isinstance(node, type_):
-                return False
-
-            if isinstance(value, typing.Pattern):
-                if is_container(node):
-                    # The string representation of a container object tends to
-                    # include the child object values, but that's probably not
-                    # what searchers want.
-                    return False
-
-                if value.search(str(node)) is None:
-                    return False
-
-            elif value is not NOT_SET and not self._safe_equals(node, value):
-                return False
-
-            if filter_ is not None and not filter_(node, identifier):
-                return False
-
-            return True
-
-        return AsdfSearchResult(
+        return self._derive(
             self._identifiers,
             self._node,
             filters=[*self._filters, _filter],
@@ -221,17 +226,17 @@ class AsdfSearchResult:
         ----------
         value : object
         """
-        results = []
-
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append((identifiers[-1], parent))
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
+        results = [(identifiers[-1], parent) for identifiers, parent, _ in self._matches]
 
         for identifier, parent in results:
             parent[identifier] = value
 
+        # the tree changed, search it again if needed
+        self._index = None
+        self._matches = _MatchCache(self._walk_matches())
+        if self._on_replace is not None:
+            self._on_replace()
+
     @property
     def node(self):
         """
@@ -243,12 +248,20 @@ class AsdfSearchResult:
             the single node of the search result
         """
 
-        results = self.nodes
-        if len(results) == 0:
-            return None
+        return self._single_match()[2]
 
-        if len(results) == 1:
-            return results[0]
+    def _single_match(self):
+        """
+        Return the ``(identifiers, parent, node)`` of the only match,
+        searching only until a second match is found.
+        """
+        matches = iter(self._matches)
+        result = next(matches, None)
+        if result is None:
+            return None, None, None
+
+        if next(matches, None) is None:
+            return result
 
         msg = "More than one result"
         raise RuntimeError(msg)
@@ -263,15 +276,11 @@ class AsdfSearchResult:
         str
             the path to the searched node
         """
-        results = self.paths
-        if len(results) == 0:
+        identifiers = self._single_match()[0]
+        if identifiers is None:
             return None
 
-        if len(results) == 1:
-            return results[0]
-
-        msg = "More than one result"
-        raise RuntimeError(msg)
+        return _build_path(identifiers)
 
     @property
     def nodes(self):
@@ -283,14 +292,7 @@ class AsdfSearchResult:
         list of object
             every node in the search results (breadth-first order)
         """
-        results = []
-
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append(node)
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
-        return results
+        return [node for _, _, node in self._matches]
 
     @property
     def paths(self):
@@ -302,14 +304,7 @@ class AsdfSearchResult:
         list of str
             the path to every node in the search results
         """
-        results = []
-
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append(_build_path(identifiers))
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
-        return results
+        return [_build_path(identifiers) for identifiers, _, _ in self._matches]
 
     def __repr__(self):
         lines = render_tree(
@@ -353,7 +348,7 @@ class AsdfSearchResult:
             msg = "This node cannot be indexed"
             raise TypeError(msg)
 
-        return AsdfSearchResult(
+        return self._derive(
             [*self._identifiers, key],
             child,
             filters=self._filters,
@@ -364,29 +359,200 @@ class AsdfSearchResult:
         )
 
 
-def _walk_tree_breadth_first(root_identifiers, root_node, callback):
+class _Filter:
+    """
+    Filter for the nodes selected by `AsdfSearchResult.search`.
+
+    The key and type queries are also available separately (as
+    `match_key` and `match_type`) so that they can be answered by
+    a `_SearchIndex`.
+    """
+
+    def __init__(self, key, type_, value, filter_):
+        self.key = key
+        self.type_ = type_
+        self.value = value
+        self.filter_ = filter_
+
+    def match_key(self, identifier):
+        key = self.key
+        if isinstance(key, typing.Pattern):
+            return key.search(str(identifier)) is not None
+
+        return key is NOT_SET or _safe_equals(identifier, key)
+
+    def match_type(self, node_type):
+        type_ = self.type_
+        if isinstance(type_, typing.Pattern):
+            return type_.search(_get_fully_qualified_type(node_type)) is not None
+
+        return not isinstance(type_, builtins.type) or issubclass(node_type, type_)
+
+    def __call__(self, node, identifier):
+        if not self.match_key(identifier):
+            return False
+
+        if isinstance(self.type_, builtins.type):
+            if not isinstance(node, self.type_):
+                return False
+
+        elif not self.match_type(type(node)):
+            return False
+
+        value = self.value
+        if isinstance(value, typing.Pattern):
+            if is_container(node):
+                # The string representation of a container object tends to
+                # include the child object values, but that's probably not
+                # what searchers want.
+                return False
+
+            if value.search(str(node)) is None:
+                return False
+
+        elif value is not NOT_SET and not _safe_equals(node, value):
+            return False
+
+        if self.filter_ is not None and not self.filter_(node, identifier):
+            return False
+
+        return True
+
+
+class _SearchIndex:
+    """
+    Index of the nodes of a tree by key (or index) and type.
+
+    Used by `asdf.AsdfFile.search` to find the nodes selected by key
+    and type queries without walking the tree. The index is not updated
+    when the tree changes, instead `asdf.AsdfFile` discards it.
+    """
+
+    def __init__(self, identifiers, node):
+        self.identifiers = identifiers
+        self.node = node
+        self._by_key = collections.defaultdict(list)
+        self._by_type = collections.defaultdict(list)
+        for order, (link, parent, child) in enumerate(_iter_tree_breadth_first(identifiers, node)):
+            entry = (order, link, parent, child)
+            identifier = link[1]
+            # include the type so that keys like 1 and True are not merged
+            self._by_key[(type(identifier), identifier)].append(entry)
+            self._by_type[type(child)].append(entry)
+
+    def _candidates(self, filters):
+        """
+        Return the entries that might pass the filters (in breadth-first
+        order) or `None` if the filters don't query by key or type.
+        """
+        key_filters = [f for f in filters if isinstance(f, _Filter) and f.key is not NOT_SET]
+        type_filters = [f for f in filters if isinstance(f, _Filter) and f.type_ is not NOT_SET]
+        if key_filters:
+            index = self._by_key
+            select = lambda k: all(f.match_key(k[1]) for f in key_filters)  # noqa: E731
+        elif type_filters:
+            index = self._by_type
+            select = lambda t: all(f.match_type(t) for f in type_filters)  # noqa: E731
+        else:
+            return None
+        entries = [entry for k, bucket in index.items() if select(k) for entry in bucket]
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def find(self, filters):
+        """
+        Yield ``(identifiers, parent, node)`` for every indexed
+        node that passes the filters.
+        """
+        entries = self._candidates(filters)
+        if entries is None:
+            # nothing to look up, check every node
+            entries = sorted(
+                (entry for bucket in self._by_type.values() for entry in bucket), key=lambda entry: entry[0]
+            )
+        for _, link, parent, node in entries:
+            if all(f(node, link[1]) for f in filters):
+                yield _link_to_identifiers(link), parent, node
+
+
+class _MatchCache:
+    """
+    Cache of the results of a search that are produced (by walking
+    the tree) only as they are needed.
+    """
+
+    def __init__(self, matches):
+        self._matches = matches
+        self._results = []
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index < len(self._results):
+                yield self._results[index]
+                index += 1
+                continue
+            if self._matches is None:
+                return
+            try:
+                self._results.append(next(self._matches))
+            except StopIteration:
+                self._matches = None
+
+
+def _iter_tree_breadth_first(root_identifiers, root_node):
     """
     Walk the tree in breadth-first order (useful for prioritizing
-    lower-depth nodes).
+    lower-depth nodes) yielding ``(link, parent, node)`` for every
+    node.
+
+    To avoid building the identifiers of every node the path to a
+    node is described by a ``link`` of ``(parent_link, identifier)``,
+    see `_link_to_identifiers`.
     """
-    current_nodes = [(root_identifiers, None, root_node)]
+    queue = collections.deque([((root_identifiers[:-1], root_identifiers[-1]), None, root_node)])
     seen = set()
-    while True:
-        next_nodes = []
-
-        for identifiers, parent, node in current_nodes:
-            if (isinstance(node, (dict, list, tuple)) or hasattr(node, "__asdf_traverse__")) and id(node) in seen:
+    while queue:
+        link, parent, node = queue.popleft()
+        if isinstance(node, (dict, list, tuple)) or hasattr(node, "__asdf_traverse__"):
+            if id(node) in seen:
                 continue
-            tnode = node.__asdf_traverse__() if hasattr(node, "__asdf_traverse__") else node
-            children = get_children(tnode)
-            callback(identifiers, parent, node, [c for _, c in children])
-            next_nodes.extend([([*identifiers, i], node, c) for i, c in children])
             seen.add(id(node))
+        yield link, parent, node
+        tnode = node.__asdf_traverse__() if hasattr(node, "__asdf_traverse__") else node
+        for identifier, child in get_children(tnode):
+            queue.append(((link, identifier), node, child))
+
+
+def _link_to_identifiers(link):
+    """
+    Convert a link (see `_iter_tree_breadth_first`) to a list of identifiers.
+    """
+    identifiers = []
+    while not isinstance(link[0], list):
+        identifiers.append(link[1])
+        link = link[0]
+    return [*link[0], link[1], *reversed(identifiers)]
+
+
+def _safe_equals(a, b):
+    try:
+        result = a == b
+
+    except Exception:
+        return False
+
+    if isinstance(result, bool):
+        return result
+
+    return False
+
 
-        if len(next_nodes) == 0:
-            break
+def _get_fully_qualified_type(value_type):
+    if value_type.__module__ == "builtins":
+        return value_type.__name__
 
-        current_nodes = next_nodes
+    return ".".join([value_type.__module__, value_type.__name__])
 
 
 def _build_path(identifiers):
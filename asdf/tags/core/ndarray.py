@@ -1,11 +1,13 @@
+import math
 import mmap
 import sys
+import time
 
 import numpy as np
-from numpy import ma
 
 from asdf import util
 from asdf._jsonschema import ValidationError
+from asdf.config import get_config
 
 _STRUCTURED_DATATYPE_KEYS = {"name", "datatype", "byteorder", "shape"}
 
@@ -199,7 +201,7 @@ def inline_data_asarray(inline, dtype=None):
     inline = handle_mask(inline)
 
     inline = np.ma.asarray(inline, dtype=dtype)
-    if not ma.is_masked(inline):
+    if not np.ma.is_masked(inline):
         return inline.data
 
     return inline
@@ -229,6 +231,35 @@ def numpy_array_to_list(array):
     return ascii_to_unicode(tolist(array))
 
 
+def _asarray_same_kind(obj, dtype):
+    """
+    Convert ``obj`` to an array with data type ``dtype``.  Arrays are
+    converted if the conversion is of the same kind.  Other objects (like
+    lists) are converted if their values are of the same kind, except that
+    integers (like Python ints) are converted to any integer data type if
+    the values are unchanged by the conversion.
+
+    Raises
+    ------
+    TypeError
+        If ``obj`` can't be converted to ``dtype``.
+    """
+    dtype = np.dtype(dtype)
+    if isinstance(obj, np.ndarray):
+        return obj if obj.dtype == dtype else obj.astype(dtype, casting="same_kind")
+
+    values = np.asarray(obj)
+    if values.dtype == dtype:
+        return values
+    if values.dtype.kind in "iu" and dtype.kind in "iu":
+        array = values.astype(dtype)
+        if not np.array_equal(array, values):
+            msg = f"Cannot cast {values.dtype} values to {dtype}, the values are out of range"
+            raise TypeError(msg)
+        return array
+    return values.astype(dtype, casting="same_kind")
+
+
 class NDArrayType:
     def __init__(self, source, shape, dtype, offset, strides, order, mask, data_callback=None):
         self._source = source
@@ -295,23 +326,52 @@ class NDArrayType:
                 self._dtype,
                 data.size,
             )
-            self._array = np.ndarray(shape, self._dtype, data, self._offset, self._strides, self._order)
-            self._array = self._apply_mask(self._array, self._mask)
+            array = np.ndarray(shape, self._dtype, data, self._offset, self._strides, self._order)
+            array = self._apply_mask(array, self._mask)
+            if self._external_data_evicting():
+                # the data is held by the (memory limited) external block
+                # cache, don't keep it here
+                return array
+            self._array = array
         return self._array
 
+    def _release_block_data(self):
+        """
+        Release the data cached by the internal block of this array so
+        it can be freed once the array (and other arrays that use the
+        data) are freed. The block is read again the next time its
+        data is used. Data of blocks that were not lazy loaded stays
+        in memory.
+        """
+        if self._data_callback is None or isinstance(self._source, str):
+            return
+        self._data_callback(_attr="close")()
+
+    def _external_data_evicting(self):
+        """
+        Check if the data of an external block can be evicted from
+        the external block cache (see ``external_block_memory_budget``).
+        """
+        if not isinstance(self._source, str) or self._data_callback is None:
+            return False
+        try:
+            return self._data_callback(_attr="evicting")
+        except AttributeError:
+            return False
+
     def _apply_mask(self, array, mask):
         if isinstance(mask, (np.ndarray, NDArrayType)):
             # Use "mask.view()" here so the underlying possibly
             # memmapped mask array is freed properly when the masked
             # array goes away.
-            array = ma.array(array, mask=mask.view())
+            array = np.ma.array(array, mask=mask.view())
             return array
 
         if np.isscalar(mask):
             if np.isnan(mask):
-                return ma.array(array, mask=np.isnan(array))
+                return np.ma.array(array, mask=np.isnan(array))
 
-            return ma.masked_values(array, mask)
+            return np.ma.masked_values(array, mask)
 
         return array
 
@@ -358,12 +418,98 @@ class NDArrayType:
         msg = f"Invalid shape '{shape}'"
         raise ValueError(msg)
 
+    def _get_data_size(self):
+        """
+        Get the size (in bytes) of the block data backing this
+        array without reading the data, or `None` if the size
+        isn't available without reading the data.
+        """
+        if self._data_callback is None:
+            return None
+        try:
+            return self._data_callback(_attr="data_size")
+        except AttributeError:
+            return None
+
+    def refresh(self):
+        """
+        Include rows appended to the file since the data of a streamed
+        array was read.
+
+        The file is checked for new data and the memory map (or the
+        read data) of the streamed block is extended to the new size of
+        the file, so that the rows written since the file was opened can
+        be read without opening the file again.  Only complete rows are
+        included.  Arrays that aren't streamed are not changed.  The
+        shape of a streamed array whose data hasn't been read always
+        follows the size of the file.
+
+        Returns
+        -------
+        refreshed : bool
+            `True` if rows were added to the (read) array.
+        """
+        if self._shape is None or "*" not in self._shape or self._data_callback is None:
+            return False
+        try:
+            refresh = self._data_callback(_attr="refresh")
+        except AttributeError:
+            return False
+        nrows = len(self)
+        if refresh():
+            self._array = None
+        return len(self) > nrows
+
+    def follow(self, interval=1.0, timeout=None, start=0):
+        """
+        Iterate over the rows of a streamed array as they are appended
+        to the file.
+
+        `refresh` is called every ``interval`` seconds and each batch of
+        new rows is yielded as an array.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Number of seconds to wait before checking for new rows.
+
+        timeout : float, optional
+            Stop after ``timeout`` seconds without new rows.  If `None`
+            (the default) follow the array until the iteration is stopped.
+
+        start : int, optional
+            Index of the first row to yield.
+
+        Yields
+        ------
+        rows : ndarray
+            The rows appended since the previous batch.
+        """
+        last = time.monotonic()
+        while True:
+            nrows = len(self)
+            if nrows > start:
+                rows = self[start:nrows]
+                yield rows
+                start += len(rows)
+                last = time.monotonic()
+            elif timeout is not None and time.monotonic() - last >= timeout:
+                return
+            else:
+                time.sleep(interval)
+            self.refresh()
+
     @property
     def shape(self):
-        if self._shape is None or self._array is not None or "*" in self._shape:
-            # streamed blocks have a '0' data_size in the header so we
-            # need to make the array to get the shape
+        if self._shape is None or self._array is not None:
             return self.__array__().shape
+        if "*" in self._shape:
+            # streamed blocks have a '0' data_size in the header so
+            # the shape is computed from the size of the block
+            data_size = self._get_data_size()
+            if data_size is None:
+                return self.__array__().shape
+            return tuple(self.get_actual_shape(self._shape, self._strides, self._dtype, data_size))
         return tuple(self._shape)
 
     @property
@@ -373,12 +519,124 @@ class NDArrayType:
 
         return self._make_array().dtype
 
+    @property
+    def ndim(self):
+        if self._array is None and self._shape is not None:
+            return len(self._shape)
+
+        return self._make_array().ndim
+
+    @property
+    def size(self):
+        if self._array is None:
+            return math.prod(self.shape)
+
+        return self._make_array().size
+
+    @property
+    def nbytes(self):
+        if self._array is None:
+            return self.size * self.dtype.itemsize
+
+        return self._make_array().nbytes
+
     def __len__(self):
         if self._array is None:
-            return self._shape[0]
+            return self.shape[0]
 
         return len(self._make_array())
 
+    def _read_item(self, key):
+        """
+        Read ``self[key]`` from the block without reading the whole
+        array. Only basic indexing (integers, slices and ``...``) of
+        unmasked arrays is supported.
+
+        The bytes spanned by the selection are read and returned as a
+        read-only array (which does not share memory with the array data).
+
+        Returns `None` if the item can't be read this way.
+        """
+        if self._mask is not None or self._data_callback is None:
+            return None
+        keys = key if isinstance(key, tuple) else (key,)
+        for k in keys:
+            if k is Ellipsis or isinstance(k, slice):
+                continue
+            if isinstance(k, (bool, np.bool_)) or not isinstance(k, (int, np.integer)):
+                return None
+
+        shape = self.shape
+        dtype = self._dtype
+        if self._strides is None:
+            strides = []
+            stride = dtype.itemsize
+            for n in reversed(shape):
+                strides.insert(0, stride)
+                stride *= n
+        else:
+            strides = self._strides
+
+        # let numpy check the key (and raise the usual errors)
+        np.broadcast_to(np.empty((), dtype="u1"), shape)[key]
+
+        if Ellipsis in keys:
+            i = keys.index(Ellipsis)
+            keys = keys[:i] + (slice(None),) * (len(shape) - len(keys) + 1) + keys[i + 1 :]
+        keys = keys + (slice(None),) * (len(shape) - len(keys))
+
+        # compute the offset of the first item and the
+        # span (in bytes) of the selected items
+        first = low = high = self._offset
+        item_shape = []
+        item_strides = []
+        for k, n, stride in zip(keys, shape, strides):
+            if isinstance(k, slice):
+                indices = range(*k.indices(n))
+                item_shape.append(len(indices))
+                item_strides.append(indices.step * stride)
+                if not indices:
+                    continue
+                start, stop = indices[0] * stride, indices[-1] * stride
+                first += start
+                low += min(start, stop)
+                high += max(start, stop)
+            else:
+                offset = (k + n if k < 0 else k) * stride
+                first += offset
+                low += offset
+                high += offset
+
+        if 0 in item_shape:
+            item = np.empty(item_shape, dtype)
+            item.flags.writeable = False
+            return item
+
+        try:
+            data = self._data_callback(_attr="read_range")(low, high - low + dtype.itemsize)
+        except AttributeError:
+            return None
+        if data is None:
+            return None
+        item = np.ndarray(item_shape, dtype, data, first - low, item_strides)
+        if not item_shape:
+            # a single item, return a scalar like numpy
+            return item[()]
+        return item
+
+    def __getitem__(self, key):
+        if self._array is None:
+            threshold = get_config().partial_read_threshold
+            if threshold is not None and self.nbytes >= threshold:
+                item = self._read_item(key)
+                if item is not None:
+                    return item
+
+        return self._make_array()[key]
+
+    def __iter__(self):
+        return iter(self._make_array())
+
     def __getattr__(self, attr):
         # We need to ignore __array_struct__, or unicode arrays end up
         # getting "double casted" and upsized.  This also reduces the
@@ -473,7 +731,6 @@ for op in [
     "__iand__",
     "__ixor__",
     "__ior__",
-    "__getitem__",
     "__delitem__",
     "__contains__",
 ]:
@@ -494,7 +751,7 @@ def _get_ndim(instance):
             return array.ndim
 
     if isinstance(instance, (np.ndarray, NDArrayType)):
-        return len(instance.shape)
+        return instance.ndim
 
     return None
 
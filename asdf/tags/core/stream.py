@@ -1,4 +1,14 @@
-from .ndarray import numpy_dtype_to_asdf_datatype
+import os
+
+import numpy as np
+
+from .ndarray import _asarray_same_kind, asdf_datatype_to_numpy_dtype, numpy_dtype_to_asdf_datatype
+
+# Default number of bytes of rows buffered by a StreamWriter
+# before they are written to the file
+DEFAULT_FLUSH_SIZE = 8 * 1024 * 1024
+
+_FSYNC_POLICIES = ("never", "flush", "close")
 
 
 class Stream:
@@ -19,6 +29,9 @@ class Stream:
          ...     for i in range(200):
          ...         nbytes = fd.write(
          ...                      np.array([i] * 1024, np.float64).tobytes())
+
+    See `asdf.AsdfFile.open_stream_writer` to write the rows with a
+    `StreamWriter`.
     """
 
     def __init__(self, shape, dtype, strides=None):
@@ -35,3 +48,173 @@ class Stream:
 
     def __str__(self):
         return str(self.__repr__())
+
+
+class StreamWriter:
+    """
+    Append rows to the streamed block of a file.
+
+    Rows are buffered and written to the file in writes of at least
+    ``flush_size`` bytes.  Only complete rows are ever written so the
+    number of rows in the file (the ``'*'`` in the shape of the
+    streamed array) always follows from the size of the block.
+
+    Use `asdf.AsdfFile.open_stream_writer` to create a `StreamWriter`.
+
+    Parameters
+    ----------
+    fd : asdf.generic_io.GenericFile
+        File, positioned at the start of the streamed block data.
+
+    stream : Stream
+        The `Stream` describing the rows.
+
+    flush_size : int, optional
+        Number of bytes of rows to buffer before writing them to
+        the file.
+
+    fsync : str, optional
+        When to call ``os.fsync`` for the file (if it has a file
+        descriptor). Must be one of:
+
+        - ``never``: The default.  Leave it to the operating system.
+
+        - ``flush``: After each write of the buffered rows.
+
+        - ``close``: When the writer is closed.
+
+    close : bool, optional
+        If `True`, close ``fd`` when the writer is closed.
+    """
+
+    def __init__(self, fd, stream, flush_size=DEFAULT_FLUSH_SIZE, fsync="never", close=False):
+        if not isinstance(stream, Stream):
+            msg = f"Expected a Stream, got {type(stream).__name__}"
+            raise TypeError(msg)
+        if stream._strides is not None:
+            msg = "Can not write rows of a Stream with strides"
+            raise ValueError(msg)
+        if not isinstance(flush_size, int) or flush_size < 0:
+            msg = f"Invalid value for flush_size: '{flush_size}'"
+            raise ValueError(msg)
+        if fsync not in _FSYNC_POLICIES:
+            msg = f"Invalid value for fsync: '{fsync}'"
+            raise ValueError(msg)
+        self._fd = fd
+        self._row_shape = tuple(stream._shape)
+        self._dtype = asdf_datatype_to_numpy_dtype(stream._datatype, stream._byteorder)
+        self._flush_size = flush_size
+        self._fsync = fsync
+        self._close = close
+        self._buffer = bytearray()
+        self._nrows = 0
+        self._closed = False
+
+    @property
+    def row_shape(self):
+        """
+        Shape of each row.
+        """
+        return self._row_shape
+
+    @property
+    def dtype(self):
+        """
+        Data type of the rows.
+        """
+        return self._dtype
+
+    @property
+    def nrows(self):
+        """
+        Number of rows written (including the buffered rows).
+        """
+        return self._nrows
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def write(self, rows):
+        """
+        Append one row, or a batch of rows, to the stream.
+
+        Parameters
+        ----------
+        rows : array-like
+            A single row (with shape `row_shape`) or a batch of rows
+            (with shape ``(n, *row_shape)``).  Rows are converted to
+            `dtype` if the conversion is of the same kind.  Integers
+            (like Python ints) are written to any integer `dtype` if
+            the values fit.
+        """
+        if self._closed:
+            msg = "I/O operation on closed StreamWriter"
+            raise ValueError(msg)
+
+        rows = _asarray_same_kind(rows, self._dtype)
+        if rows.shape == self._row_shape:
+            rows = rows[np.newaxis]
+        if rows.shape[1:] != self._row_shape:
+            msg = f"Expected rows with shape {self._row_shape}, got {rows.shape}"
+            raise ValueError(msg)
+
+        data = np.ascontiguousarray(rows).reshape(-1).view(np.uint8).data
+        if not self._buffer and len(data) >= self._flush_size:
+            # large batches are written without copying them to the buffer
+            self._fd.write(data)
+            self._flushed()
+        else:
+            self._buffer += data
+            if len(self._buffer) >= self._flush_size:
+                self._write_buffer()
+        self._nrows += len(rows)
+
+    def _write_buffer(self):
+        if self._buffer:
+            self._fd.write(self._buffer)
+            self._buffer = bytearray()
+            self._flushed()
+
+    def _flushed(self):
+        self._fd.flush()
+        if self._fsync == "flush":
+            self._sync()
+
+    def _sync(self):
+        try:
+            fileno = self._fd._fd.fileno()
+        except (AttributeError, OSError, ValueError):
+            # not backed by a file descriptor (for example io.BytesIO)
+            return
+        os.fsync(fileno)
+
+    def flush(self):
+        """
+        Write the buffered rows to the file.
+        """
+        if self._closed:
+            msg = "I/O operation on closed StreamWriter"
+            raise ValueError(msg)
+        self._write_buffer()
+        self._fd.flush()
+
+    def close(self):
+        """
+        Write the buffered rows and close the writer (and the file if
+        the writer opened it).
+        """
+        if self._closed:
+            return
+        self.flush()
+        if self._fsync != "never":
+            self._sync()
+        self._closed = True
+        if self._close:
+            self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
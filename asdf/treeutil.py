@@ -219,7 +219,13 @@ class _RemoveNode:
 RemoveNode = _RemoveNode()
 
 
-def walk_and_modify(top, callback, postorder=True, _context=None):
+# Exact types of immutable "plain" leaf nodes. Instances of these types
+# never contain other nodes and identity is irrelevant so they can be
+# passed through walk_and_modify without tracking (see ``_leaf_types``).
+_PLAIN_LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def walk_and_modify(top, callback, postorder=True, _context=None, _leaf_types=None):
     """Modify a tree by walking it with a callback function.  It also has
     the effect of doing a deep copy.
 
@@ -369,6 +375,12 @@ def walk_and_modify(top, callback, postorder=True, _context=None):
         return _handle_generator(result)
 
     def _recurse(node, json_id=None):
+        if type(node) in _leaf_types:
+            # The node is a plain leaf that the caller guarantees the
+            # callback would return unmodified. Skip the callback and
+            # the context bookkeeping entirely.
+            return node
+
         if node in _context:
             # The node's modified result has already been
             # created, all we need to do is return it.  This
@@ -408,6 +420,12 @@ def walk_and_modify(top, callback, postorder=True, _context=None):
     if _context is None:
         _context = _TreeModificationContext()
 
+    # _leaf_types is a private option used by the yamlutil conversion
+    # functions to skip nodes of exact types (not subclasses) that are
+    # known to be returned unmodified by the callback.
+    if _leaf_types is None:
+        _leaf_types = frozenset()
+
     with _context:
         return _recurse(top)
         # Generators will be drained here, if this is the outermost
@@ -431,13 +449,23 @@ def get_children(node):
         node has no children (either it is an empty container, or is
         a non-container type)
     """
+    return list(_iter_children(node)[1])
+
+
+def _iter_children(node):
+    """
+    Return the number of children of a node and an iterator of
+    ``(identifier, child)`` for the children.  Unlike `get_children`
+    the children are only retrieved (and for lazy nodes converted)
+    as the iterator is consumed.
+    """
     if isinstance(node, (dict, lazy_nodes.AsdfDictNode)):
-        return list(node.items())
+        return len(node), iter(node.items())
 
     if isinstance(node, (list, tuple, lazy_nodes.AsdfListNode)):
-        return list(enumerate(node))
+        return len(node), enumerate(node)
 
-    return []
+    return 0, iter(())
 
 
 def is_container(node):
@@ -296,8 +296,7 @@ def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None):
         typ = type(obj)
         if typ in converters_cache:
             return converters_cache[typ](obj)
-        if extension_manager.handles_type(typ):
-            converter = extension_manager.get_converter_for_type(typ)
+        if (converter := extension_manager._get_converter_for_type(typ)) is not None:
             converters_cache[typ] = lambda obj, _converter=converter: _convert_obj(obj, _converter)
             return _convert_obj(obj, converter)
 
@@ -311,6 +310,8 @@ def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None):
         # container nodes with unserialized children.
         postorder=False,
         _context=ctx._tree_modification_context,
+        # Plain leaves are only skipped if no converter claims their type
+        _leaf_types=frozenset(typ for typ in treeutil._PLAIN_LEAF_TYPES if not extension_manager.handles_type(typ)),
     )
 
 
@@ -373,6 +374,8 @@ def tagged_tree_to_custom_tree(tree, ctx, force_raw_types=False, _serialization_
         # container nodes with children already deserialized.
         postorder=True,
         _context=ctx._tree_modification_context,
+        # Plain leaves can't have a tag so will never be converted
+        _leaf_types=treeutil._PLAIN_LEAF_TYPES,
     )
 
 
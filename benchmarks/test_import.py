@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import asdf",
+        "import asdf; asdf.AsdfFile",
+        "import asdf; asdf.AsdfFile().schema_info()",
+    ],
+    ids=["import", "asdf_file", "schema_info"],
+)
+def test_import(code, benchmark):
+    # run in a new interpreter since modules are only imported once per process
+    benchmark(subprocess.run, [sys.executable, "-c", code], check=True)
@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 
 import asdf
+from asdf import schema, yamlutil
 
 
 @pytest.fixture
@@ -14,7 +15,17 @@ def ndarray_asdf_file():
     return asdf.AsdfFile({"obj": np.ndarray([1])})
 
 
-@pytest.fixture(params=["software_asdf_file", "ndarray_asdf_file"])
+@pytest.fixture
+def many_tagged_asdf_file():
+    return asdf.AsdfFile(
+        {
+            "software": [asdf.tags.core.Software(name=f"foo{i}", version="0.0.0") for i in range(100)],
+            "ndarrays": [np.full((3, 3), i) for i in range(100)],
+        }
+    )
+
+
+@pytest.fixture(params=["software_asdf_file", "ndarray_asdf_file", "many_tagged_asdf_file"])
 def asdf_file(request):
     return request.getfixturevalue(request.param)
 
@@ -24,3 +35,11 @@ def test_validate(asdf_file, benchmark):
     # extension loading, schema caching and other one-time costs
     asdf_file.validate()
     benchmark(asdf_file.validate)
+
+
+def test_validate_tagged_tree(asdf_file, benchmark):
+    # validate an already tagged tree (as is done when reading a file)
+    # to measure only the cost of schema validation
+    tagged_tree = yamlutil.custom_tree_to_tagged_tree(asdf_file.tree, asdf_file)
+    schema.validate(tagged_tree, asdf_file, reading=True)
+    benchmark(schema.validate, tagged_tree, asdf_file, reading=True)